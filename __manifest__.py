@@ -21,7 +21,7 @@
 ################################################################################
 {
     "name": "Hospital Management Odoo 18",
-    "version": "18.0.1.0.0",
+    "version": "18.0.1.1.0",
     "category": "Services",
     "summary": """This Module Helps to Manage Patients Records, Doctors Details,
      Lab Management , Employee Management etc.""",
@@ -35,7 +35,8 @@
     "company": "Cybrosys Techno Solutions",
     "maintainer": "Cybrosys Techno Solutions",
     "website": "https://www.cybrosys.com",
-    "depends": ["website", "hr", "stock", "sale_management", "purchase", "portal", "iap"],
+    "depends": ["website", "hr", "stock", "sale_management", "purchase", "portal", "iap",
+                "bus"],
     "data": [
         "security/base_hospital_management_groups.xml",
         "security/doctor_allocation_security.xml",
@@ -69,6 +70,9 @@
         "views/hospital_vaccination_views.xml",
         "views/product_template_views.xml",
         "views/room_facility_views.xml",
+        "views/hospital_perf_sample_views.xml",
+        "views/hospital_patient_duplicate_views.xml",
+        "views/hospital_patient_import_views.xml",
         "views/patient_card_templates.xml",
         "views/booking_success_templates.xml",
         "views/doctor_specialization_views.xml",
@@ -94,11 +98,16 @@
             "base_hospital_management/static/src/css/lab_dashboard.css",
             "base_hospital_management/static/src/css/pharmacy_dashboard.css",
             "base_hospital_management/static/src/css/pharmacy_dashboard_modern.css",
+            "base_hospital_management/static/src/css/patient_timeline.css",
             "base_hospital_management/static/src/xml/lab_dashboard_templates.xml",
             "base_hospital_management/static/src/xml/doctor_dashboard_templates.xml",
             "base_hospital_management/static/src/xml/pharmacy_orderlines.xml",
             "base_hospital_management/static/src/xml/pharmacy_dashboard_templates.xml",
             "base_hospital_management/static/src/xml/reception_dashboard_templates.xml",
+            "base_hospital_management/static/src/xml/patient_timeline_templates.xml",
+            "base_hospital_management/static/src/js/dashboard_bus.js",
+            "base_hospital_management/static/src/js/patient_picker.js",
+            "base_hospital_management/static/src/js/patient_timeline.js",
             "base_hospital_management/static/src/js/lab_dashboard.js",
             "base_hospital_management/static/src/js/doctor_dashboard.js",
             "base_hospital_management/static/src/js/pharmacy_orderlines.js",
@@ -199,6 +199,19 @@ class HospitalPortalController(CustomerPortal):
         
         return request.render('base_hospital_management.portal_my_op_improved', values)
 
+    @http.route('/my/op/<int:op_id>/prescription', type='json', auth='user',
+                website=True)
+    def portal_my_op_prescription(self, op_id, queue=True, **kw):
+        """Queue the prescription PDF of a consultation and return its
+        state, the page polls it until the file is ready"""
+        outpatient = request.env['hospital.outpatient'].sudo().search([
+            ('id', '=', op_id),
+            ('patient_id', '=', request.env.user.partner_id.id),
+        ])
+        if not outpatient:
+            return {'state': 'failed'}
+        return outpatient._create_file(queue=queue)
+
     # =========================================
     # HOME PAGE DASHBOARD
     # =========================================
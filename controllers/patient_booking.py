@@ -21,12 +21,15 @@
 ################################################################################
 from odoo import fields, http
 from odoo.http import request
+from odoo.addons.base_hospital_management.models.hospital_perf_sample import \
+    profiled
 
 
 class PatientBooking(http.Controller):
     """Class for patient booking"""
 
     @http.route('/patient_booking', type='http', auth="public", website=True)
+    @profiled('/patient_booking')
     def patient_booking(self):
         """Function for patient booking from website."""
         if request.env.user._is_public():
@@ -40,6 +43,7 @@ class PatientBooking(http.Controller):
 
     @http.route('/patient_booking/success', type='http',
                 website=True, csrf=False)
+    @profiled('/patient_booking/success')
     def patient_booking_submit(self, **kw):
         """Function for submitting the patient booking"""
         if request.env.user.partner_id.patient_seq in ['New', 'User',
@@ -47,17 +51,15 @@ class PatientBooking(http.Controller):
             request.env.user.partner_id.sudo().write(
                 {'patient_seq': request.env['ir.sequence'].sudo().next_by_code(
                     'patient.sequence')}) or 'New'
-        op = request.env['hospital.outpatient'].sudo().create({
-            'patient_id': request.env.user.partner_id.id,
-            'doctor_id': int(kw.get("doctor-name")),
-            'op_date': kw.get("date"),
-            'reason': kw.get("reason")
-        })
-        op.sudo().action_confirm()
-        return request.redirect('/my/home')
+        booking = request.env['hospital.outpatient'].sudo().book_slot(
+            request.env.user.partner_id.id, int(kw.get("doctor-name")),
+            op_date=kw.get("date"), reason=kw.get("reason"))
+        return request.render("base_hospital_management.form_submit",
+                              {'booking': booking})
 
     @http.route('/patient_booking/get_doctors', type='json', auth="public",
                 website=True)
+    @profiled('/patient_booking/get_doctors')
     def update_doctors(self, **kw):
         """Method for fetching doctor allocation for the selected date"""
         domain = [('date', '=', kw.get('selected_date'))]
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Profile Migration
+#    Moves the profile columns of res.partner to hospital.patient.profile
+#    and schedules the first build of the dashboard counters
+#
+################################################################################
+import logging
+
+from odoo import api, SUPERUSER_ID
+from odoo.tools import SQL
+from odoo.tools.sql import column_exists
+from odoo.addons.base_hospital_management.models.hospital_patient_profile \
+    import PROFILE_FIELDS
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Creates the profiles of the partners holding a profile value with
+    one query, then drops the columns from res_partner"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    # The counters are built by their scheduled actions, outside the upgrade
+    for cron in ('ir_cron_hospital_kpi_snapshot_rebuild',
+                 'ir_cron_hospital_revenue_ledger_drift'):
+        env.ref(f'base_hospital_management.{cron}')._trigger()
+    profile_fields = env['hospital.patient.profile']._fields
+    columns = [fname for fname in PROFILE_FIELDS
+               if column_exists(cr, 'res_partner', fname)]
+    if not columns:
+        return
+    # Only the partners with a value which is not the default get a profile
+    conditions = []
+    for fname in columns:
+        if profile_fields[fname].type == 'boolean':
+            conditions.append(SQL("%s", SQL.identifier(fname)))
+        elif profile_fields[fname].type in ('integer', 'monetary'):
+            conditions.append(SQL("COALESCE(%s, 0) != 0",
+                                  SQL.identifier(fname)))
+        else:
+            conditions.append(SQL("%s IS NOT NULL", SQL.identifier(fname)))
+    currency = SQL("%s", env.company.currency_id.id)
+    if column_exists(cr, 'res_partner', 'currency_id'):
+        currency = SQL("COALESCE(currency_id, %s)", env.company.currency_id.id)
+    identifiers = SQL(", ").join(SQL.identifier(fname) for fname in columns)
+    cr.execute(SQL("""
+        INSERT INTO hospital_patient_profile
+            (partner_id, currency_id, %(identifiers)s, create_uid,
+             create_date, write_uid, write_date)
+        SELECT id, %(currency)s, %(identifiers)s, %(uid)s,
+               NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+        FROM res_partner
+        WHERE %(conditions)s
+        ON CONFLICT (partner_id) DO NOTHING
+    """, identifiers=identifiers, currency=currency, uid=SUPERUSER_ID,
+        conditions=SQL(" OR ").join(conditions)))
+    _logger.info("Created %s patient profiles", cr.rowcount)
+    cr.execute(SQL("ALTER TABLE res_partner %s", SQL(", ").join(
+        SQL("DROP COLUMN IF EXISTS %s", SQL.identifier(fname))
+        for fname in columns + ['currency_id'])))
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Profile Migration
+#    Releases the required currency of the partners moved to the profiles
+#
+################################################################################
+from odoo.tools.sql import column_exists
+
+
+def migrate(cr, version):
+    """The partners created while updating must not need a currency, the
+    column is dropped once copied to the profiles"""
+    if column_exists(cr, 'res_partner', 'currency_id'):
+        cr.execute(
+            "ALTER TABLE res_partner ALTER COLUMN currency_id DROP NOT NULL")
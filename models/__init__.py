@@ -23,17 +23,23 @@ from . import account_payment_register
 from . import blood_bank
 from . import blood_donation
 from . import contra_indication
+from . import doctor_allocation
 from . import doctor_round
 from . import doctor_slot
 from . import doctor_specialization
 from . import hospital_bed
+from . import hospital_benchmark
 from . import hospital_building
+from . import hospital_data_generator
 from . import hospital_degree
 from . import hospital_family
 from . import hospital_inpatient
 from . import hospital_insurance
 from . import hospital_laboratory
 from . import hospital_outpatient
+from . import hospital_patient_import
+from . import hospital_patient_profile
+from . import hospital_perf_sample
 from . import hospital_pharmacy
 from . import hospital_vaccination
 from . import hospital_ward
@@ -47,17 +53,25 @@ from . import lab_test_line
 from . import lab_test_result
 from . import medicine_brand
 from . import nursing_plan
+from . import patient_card_report
+from . import patient_dedup
 from . import patient_lab_test
 from . import patient_room
+from . import patient_timeline
 from . import pharmacy_medicine
 from . import prescription_line
 from . import product_template
 from . import res_partner
 from . import res_users
 # Extensions (importées APRÈS les modèles de base)
+from . import dashboard_aggregate
+from . import dashboard_cache
 from . import dashboard_methods
+from . import hospital_daily_counter
+from . import hospital_kpi_snapshot
+from . import hospital_revenue_ledger
+from . import dashboard_bus
 from . import lab_dashboard_methods
-from . import doctor_allocation
 from . import reception_dashboard_methods
 from . import pharmacy_dashboard_methods
 from . import room_facility
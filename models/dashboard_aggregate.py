@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Dashboard Aggregate Queries
+#    Compiles many search_count calls into one SQL round-trip
+#
+################################################################################
+
+from odoo import models, api
+from odoo.tools import SQL
+
+
+class HospitalDashboardAggregate(models.AbstractModel):
+    """Count several domains over several models in a single query"""
+    _name = 'hospital.dashboard.aggregate'
+    _description = 'Hospital Dashboard Aggregate'
+
+    @api.model
+    def count(self, counters):
+        """
+        Count a declarative list of counters in one SQL round-trip
+        Args:
+            counters: list of (key, model, domain, group) tuples. Counters
+                with a group are returned in a sub dict named after the group
+        Returns: dict {key: count} or {group: {key: count}}
+
+        The domains are compiled with _search, so access rights, record
+        rules and active_test behave exactly like search_count. Counters of
+        the same model share one scan through COUNT(*) FILTER (WHERE ...).
+        """
+        scans = {}
+        subqueries = []
+        aliases = []
+        for index, (key, model_name, domain, group) in enumerate(counters):
+            model = self.env[model_name]
+            model.flush_model()
+            query = model._search(domain)
+            alias = f'counter_{index}'
+            aliases.append((alias, key, group))
+            where = query.where_clause or SQL("TRUE")
+            if query._joins:
+                # Joined queries cannot share the scan of their model
+                subqueries.append(query.select(
+                    SQL("COUNT(*) AS %s", SQL.identifier(alias))))
+                continue
+            scans.setdefault(model_name, []).append(SQL(
+                "COUNT(*) FILTER (WHERE %s) AS %s",
+                where, SQL.identifier(alias)))
+        for model_name, filters in scans.items():
+            subqueries.append(SQL(
+                "SELECT %s FROM %s", SQL(", ").join(filters),
+                SQL.identifier(self.env[model_name]._table)))
+        result = {}
+        if not subqueries:
+            return result
+        self.env.cr.execute(SQL("SELECT * FROM %s", SQL(", ").join(
+            SQL("(%s) AS %s", subquery, SQL.identifier(f'scan_{index}'))
+            for index, subquery in enumerate(subqueries))))
+        row = self.env.cr.dictfetchone()
+        for alias, key, group in aliases:
+            if group:
+                result.setdefault(group, {})[key] = row[alias]
+            else:
+                result[key] = row[alias]
+        return result
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Dashboard Bus Notifications
+#    Pushes compact counter deltas to the open dashboards
+#
+################################################################################
+
+from collections import defaultdict
+
+from odoo import models, fields, api
+from .res_partner import NON_PATIENT_SEQ
+
+# Group allowed to listen to the channel of each dashboard
+DASHBOARD_GROUPS = {
+    'doctor': 'base_hospital_management.base_hospital_management_group_doctor',
+    'reception': 'base_hospital_management.'
+                 'base_hospital_management_group_receptionist',
+    'lab': 'base_hospital_management.base_hospital_management_group_lab_assistant',
+    'pharmacy': 'base_hospital_management.'
+                'base_hospital_management_group_pharmacist',
+}
+
+
+def dashboard_channel(dashboard):
+    """Name of the bus channel of a dashboard"""
+    return f'base_hospital_management.{dashboard}_dashboard'
+
+
+class HospitalDashboardBus(models.AbstractModel):
+    """Send the dashboard updates on the bus"""
+    _name = 'hospital.dashboard.bus'
+    _description = 'Hospital Dashboard Bus'
+
+    @api.model
+    def _send(self, records, after, before=None):
+        """
+        Send the difference between two contribution maps, as returned by
+        _dashboard_bus_contributions, to the channels of the dashboards
+        Args:
+            records: records whose change caused the update
+            after: contributions after the change
+            before: contributions before the change
+        One notification is sent per dashboard and company, holding the
+        counter deltas and the new state of the records. The bus delivers
+        it once the transaction is committed.
+        """
+        before = before or {}
+        states = []
+        if 'state' in records._fields:
+            states = [{'id': record.id, 'state': record.state}
+                      for record in records.exists().sudo()]
+        for dashboard, company_id in sorted(set(after) | set(before)):
+            new = after.get((dashboard, company_id), {})
+            old = before.get((dashboard, company_id), {})
+            deltas = {
+                stat: new.get(stat, 0) - old.get(stat, 0)
+                for stat in sorted(set(new) | set(old))
+                if new.get(stat, 0) != old.get(stat, 0)
+            }
+            if not deltas and not states:
+                continue
+            self.env['bus.bus']._sendone(
+                dashboard_channel(dashboard), 'hospital_dashboard/update', {
+                    'dashboard': dashboard,
+                    'model': records._name,
+                    'company_id': company_id,
+                    'deltas': deltas,
+                    'records': states,
+                })
+
+
+class HospitalDashboardBusMixin(models.AbstractModel):
+    """Mixin notifying the dashboards of the create, write and unlink of
+    the model"""
+    _name = 'hospital.dashboard.bus.mixin'
+    _description = 'Hospital Dashboard Bus Mixin'
+
+    # Fields whose change can alter what the dashboards display
+    _dashboard_bus_fields = ()
+
+    def _dashboard_bus_contributions(self):
+        """Returns the counters the records add to the dashboards, as a
+        dict {(dashboard, company_id): {counter: value}}"""
+        return defaultdict(lambda: defaultdict(int))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Notifies the dashboards of the new records"""
+        records = super().create(vals_list)
+        self.env['hospital.dashboard.bus']._send(
+            records, records._dashboard_bus_contributions())
+        return records
+
+    def write(self, vals):
+        """Notifies the dashboards of the changes caused by the write"""
+        if not set(vals) & set(self._dashboard_bus_fields):
+            return super().write(vals)
+        before = self._dashboard_bus_contributions()
+        res = super().write(vals)
+        self.env['hospital.dashboard.bus']._send(
+            self, self._dashboard_bus_contributions(), before)
+        return res
+
+    def unlink(self):
+        """Notifies the dashboards of the deleted records"""
+        before = self._dashboard_bus_contributions()
+        records = self.browse(self.ids)
+        res = super().unlink()
+        self.env['hospital.dashboard.bus']._send(records, {}, before)
+        return res
+
+
+class IrWebsocket(models.AbstractModel):
+    """Inherited to restrict the dashboard channels to their users"""
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """Drops the dashboard channels the user is not allowed to
+        listen to"""
+        forbidden = {
+            dashboard_channel(dashboard)
+            for dashboard, group in DASHBOARD_GROUPS.items()
+            if not self.env.user.has_group(group)
+        }
+        channels = [channel for channel in channels
+                    if channel not in forbidden]
+        return super()._build_bus_channel_list(channels)
+
+
+class HospitalOutpatient(models.Model):
+    """Inherited to notify the doctor and reception dashboards"""
+    _name = 'hospital.outpatient'
+    _inherit = ['hospital.outpatient', 'hospital.dashboard.bus.mixin']
+
+    _dashboard_bus_fields = ('op_date', 'state', 'active', 'doctor_id')
+
+    def _dashboard_bus_contributions(self):
+        """Consultations and appointments of the day"""
+        contributions = super()._dashboard_bus_contributions()
+        today = fields.Date.today()
+        for op in self.sudo():
+            company_id = op.doctor_id.company_id.id or self.env.company.id
+            scheduled = op.active and op.op_date == today
+            contributions['doctor', company_id]['consultations_today'] += int(
+                scheduled and op.state != 'cancel')
+            contributions['reception', company_id][
+                'appointments_today'] += int(scheduled)
+        return contributions
+
+
+class HospitalInpatient(models.Model):
+    """Inherited to notify the doctor and reception dashboards"""
+    _name = 'hospital.inpatient'
+    _inherit = ['hospital.inpatient', 'hospital.dashboard.bus.mixin']
+
+    _dashboard_bus_fields = ('state', 'active', 'company_id')
+
+    def _dashboard_bus_contributions(self):
+        """Admitted inpatients"""
+        contributions = super()._dashboard_bus_contributions()
+        for inpatient in self.sudo():
+            company_id = inpatient.company_id.id or self.env.company.id
+            contributions['doctor', company_id]['active_inpatients'] += int(
+                inpatient.active and inpatient.state == 'admit')
+            contributions['reception', company_id]['active_inpatients'] += int(
+                inpatient.active and inpatient.state in ('admit', 'reserve'))
+        return contributions
+
+
+class PatientRoom(models.Model):
+    """Inherited to notify the reception dashboard"""
+    _name = 'patient.room'
+    _inherit = ['patient.room', 'hospital.dashboard.bus.mixin']
+
+    _dashboard_bus_fields = ('state',)
+
+    def _dashboard_bus_contributions(self):
+        """Available rooms"""
+        contributions = super()._dashboard_bus_contributions()
+        for room in self.sudo():
+            company_id = room.company_id.id or self.env.company.id
+            contributions['reception', company_id]['rooms_available'] += int(
+                room.state == 'avail')
+        return contributions
+
+
+class PatientLabTest(models.Model):
+    """Inherited to notify the lab dashboard"""
+    _name = 'patient.lab.test'
+    _inherit = ['patient.lab.test', 'hospital.dashboard.bus.mixin']
+
+    _dashboard_bus_fields = ('state', 'date')
+
+    def _dashboard_bus_contributions(self):
+        """Tests in progress, completed and completed today"""
+        contributions = super()._dashboard_bus_contributions()
+        today = fields.Date.today()
+        for test in self.sudo():
+            key = ('lab', test.company_id.id or self.env.company.id)
+            contributions[key]['tests_in_progress'] += int(
+                test.state == 'test')
+            contributions[key]['tests_completed'] += int(
+                test.state == 'completed')
+            contributions[key]['completed_today'] += int(
+                test.state == 'completed' and test.date == today)
+        return contributions
+
+
+class SaleOrder(models.Model):
+    """Inherited to notify the pharmacy dashboard"""
+    _name = 'sale.order'
+    _inherit = ['sale.order', 'hospital.dashboard.bus.mixin']
+
+    _dashboard_bus_fields = ('state', 'date_order', 'partner_id',
+                             'order_line')
+
+    def _dashboard_bus_contributions(self):
+        """Orders and revenue of the day and pending orders of patients"""
+        contributions = super()._dashboard_bus_contributions()
+        today = fields.Date.today()
+        for order in self.sudo():
+            if order.partner_id.patient_seq in NON_PATIENT_SEQ:
+                continue
+            key = ('pharmacy', order.company_id.id or self.env.company.id)
+            ordered_today = bool(order.date_order and
+                                 order.date_order.date() == today)
+            contributions[key]['orders_today'] += int(ordered_today)
+            contributions[key]['pending_orders'] += int(
+                order.state == 'draft')
+            if ordered_today and order.state in ('sale', 'done'):
+                contributions[key]['revenue_today'] += order.amount_total
+        return contributions
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Dashboard Result Cache
+#    Caches the dashboard RPC results and invalidates them on writes
+#
+################################################################################
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+# Results cached by the workers of this process, most recently used last
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_STATS = {}
+_CACHE_MAX_ENTRIES = 1000
+_CACHE_TTL_PARAM = 'base_hospital_management.dashboard_cache_ttl'
+_CACHE_TTL_DEFAULT = 300
+
+
+def dashboard_cache(*dependencies, per_user=False):
+    """
+    Cache the result of a dashboard RPC method
+    The result is keyed by (method, company, user groups, day) and is
+    dropped when its TTL expires or when one of the dependency models is
+    written
+    Args:
+        dependencies: names of the models the result is computed from. They
+            must inherit hospital.dashboard.cache.mixin
+        per_user: also key the result by user, for methods whose result
+            depends on user specific record rules
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.env['hospital.dashboard.cache']._cached_call(
+                self, method, dependencies, per_user, args, kwargs)
+        return wrapper
+    return decorator
+
+
+class HospitalDashboardCache(models.Model):
+    """Generation of every model the dashboard results depend on. A cached
+    result is valid as long as the generations read before computing it
+    did not change."""
+    _name = 'hospital.dashboard.cache'
+    _description = 'Hospital Dashboard Cache'
+    _rec_name = 'model_name'
+
+    model_name = fields.Char(string='Model', required=True, readonly=True,
+                             help='Model the dashboard results depend on')
+    generation = fields.Integer(string='Generation', readonly=True,
+                                help='Incremented after every committed '
+                                     'change of the model')
+
+    _sql_constraints = [('model_name_uniq', 'unique (model_name)',
+                         'Only one generation is allowed per model.')]
+
+    @api.model
+    def _get_generations(self, model_names):
+        """Returns the current generation of the models"""
+        self.env.cr.execute("""
+            SELECT model_name, generation FROM hospital_dashboard_cache
+            WHERE model_name IN %s
+        """, [tuple(model_names)])
+        generations = dict(self.env.cr.fetchall())
+        return tuple(generations.get(name, 0) for name in model_names)
+
+    @api.model
+    def _invalidate(self, model_name):
+        """Increments the generation of the model once the current
+        transaction is committed. The increment runs in its own short
+        transaction so concurrent writers never wait on the generation row,
+        and other workers cannot cache data older than the commit."""
+        pending = self.env.cr.postcommit.data.setdefault(
+            'hospital.dashboard.cache', set())
+        if not pending:
+            self.env.cr.postcommit.add(functools.partial(
+                self._bump_generations, self.env.registry, pending))
+        pending.add(model_name)
+
+    @api.model
+    def _bump_generations(self, registry, model_names):
+        """Increments the generations of the models"""
+        with registry.cursor() as cr:
+            for model_name in sorted(model_names):
+                cr.execute("""
+                    INSERT INTO hospital_dashboard_cache
+                        (model_name, generation, create_date, write_date)
+                    VALUES (%s, 1, now() at time zone 'UTC',
+                            now() at time zone 'UTC')
+                    ON CONFLICT (model_name) DO UPDATE
+                    SET generation = hospital_dashboard_cache.generation + 1,
+                        write_date = EXCLUDED.write_date
+                """, [model_name])
+
+    @api.model
+    def _cached_call(self, record, method, dependencies, per_user, args,
+                     kwargs):
+        """Returns the cached result of the method, computing it on a
+        miss. The cache is bypassed when the context holds
+        hospital_dashboard_cache=False."""
+        ttl = int(self.env['ir.config_parameter'].sudo().get_param(
+            _CACHE_TTL_PARAM, _CACHE_TTL_DEFAULT))
+        if ttl <= 0 or not record.env.context.get(
+                'hospital_dashboard_cache', True):
+            return method(record, *args, **kwargs)
+        name = f'{record._name}.{method.__name__}'
+        key = (self.env.cr.dbname, name, record.env.company.id,
+               tuple(sorted(record.env.user.groups_id.ids)),
+               record.env.uid if per_user else None,
+               fields.Date.today(), repr(args), repr(sorted(kwargs.items())))
+        generations = self._get_generations(dependencies)
+        stats = _CACHE_STATS.setdefault(name, {'hits': 0, 'misses': 0})
+        with _CACHE_LOCK:
+            entry = _CACHE.get(key)
+            if (entry and entry[0] > time.monotonic() and
+                    entry[1] == generations):
+                _CACHE.move_to_end(key)
+                stats['hits'] += 1
+                return copy.deepcopy(entry[2])
+            stats['misses'] += 1
+        result = method(record, *args, **kwargs)
+        with _CACHE_LOCK:
+            _CACHE[key] = (time.monotonic() + ttl, generations,
+                           copy.deepcopy(result))
+            _CACHE.move_to_end(key)
+            while len(_CACHE) > _CACHE_MAX_ENTRIES:
+                _CACHE.popitem(last=False)
+        return result
+
+    @api.model
+    def get_cache_stats(self):
+        """
+        Get the hit and miss counters of the dashboard cache
+        The counters are kept in memory, per server process
+        Returns: Dict with totals, counters per method, entries and TTL
+        """
+        self._check_cache_admin()
+        with _CACHE_LOCK:
+            methods = copy.deepcopy(_CACHE_STATS)
+            entries = len(_CACHE)
+        return {
+            'hits': sum(stats['hits'] for stats in methods.values()),
+            'misses': sum(stats['misses'] for stats in methods.values()),
+            'methods': methods,
+            'entries': entries,
+            'ttl': int(self.env['ir.config_parameter'].sudo().get_param(
+                _CACHE_TTL_PARAM, _CACHE_TTL_DEFAULT)),
+        }
+
+    @api.model
+    def clear_cache_stats(self):
+        """Reset the hit and miss counters"""
+        self._check_cache_admin()
+        with _CACHE_LOCK:
+            _CACHE_STATS.clear()
+        return True
+
+    @api.model
+    def _check_cache_admin(self):
+        """Restricts the cache statistics to the administrators"""
+        if not self.env.is_superuser() and not self.env.user.has_group(
+                'base.group_system'):
+            raise UserError(_("Only administrators can access the dashboard "
+                              "cache statistics."))
+
+
+class HospitalDashboardCacheMixin(models.AbstractModel):
+    """Mixin invalidating the cached dashboard results depending on the
+    model when its records are created, written or deleted"""
+    _name = 'hospital.dashboard.cache.mixin'
+    _description = 'Hospital Dashboard Cache Mixin'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidates the results depending on the model"""
+        self.env['hospital.dashboard.cache']._invalidate(self._name)
+        return super().create(vals_list)
+
+    def write(self, vals):
+        """Invalidates the results depending on the model"""
+        self.env['hospital.dashboard.cache']._invalidate(self._name)
+        return super().write(vals)
+
+    def unlink(self):
+        """Invalidates the results depending on the model"""
+        self.env['hospital.dashboard.cache']._invalidate(self._name)
+        return super().unlink()
+
+
+class ResPartner(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'res.partner'
+    _inherit = ['res.partner', 'hospital.dashboard.cache.mixin']
+
+
+class HospitalOutpatient(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'hospital.outpatient'
+    _inherit = ['hospital.outpatient', 'hospital.dashboard.cache.mixin']
+
+
+class HospitalInpatient(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'hospital.inpatient'
+    _inherit = ['hospital.inpatient', 'hospital.dashboard.cache.mixin']
+
+
+class DoctorAllocation(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'doctor.allocation'
+    _inherit = ['doctor.allocation', 'hospital.dashboard.cache.mixin']
+
+
+class SaleOrder(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'sale.order'
+    _inherit = ['sale.order', 'hospital.dashboard.cache.mixin']
+
+
+class PatientLabTest(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'patient.lab.test'
+    _inherit = ['patient.lab.test', 'hospital.dashboard.cache.mixin']
+
+
+class LabTestLine(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'lab.test.line'
+    _inherit = ['lab.test.line', 'hospital.dashboard.cache.mixin']
+
+
+class LabTestResult(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'lab.test.result'
+    _inherit = ['lab.test.result', 'hospital.dashboard.cache.mixin']
+
+
+class PatientRoom(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'patient.room'
+    _inherit = ['patient.room', 'hospital.dashboard.cache.mixin']
+
+
+class HospitalWard(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'hospital.ward'
+    _inherit = ['hospital.ward', 'hospital.dashboard.cache.mixin']
+
+
+class PharmacyMedicine(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'pharmacy.medicine'
+    _inherit = ['pharmacy.medicine', 'hospital.dashboard.cache.mixin']
+
+
+class ProductTemplate(models.Model):
+    """Inherited to invalidate the cached dashboard results"""
+    _name = 'product.template'
+    _inherit = ['product.template', 'hospital.dashboard.cache.mixin']
@@ -13,6 +13,8 @@
 from odoo import models, api
 from datetime import datetime, timedelta
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT
+from .dashboard_cache import dashboard_cache
+from .hospital_perf_sample import profiled
 
 
 class ResPartner(models.Model):
@@ -20,66 +22,40 @@ class ResPartner(models.Model):
     _inherit = 'res.partner'
 
     @api.model
+    @profiled()
+    @dashboard_cache('res.partner', 'hospital.outpatient',
+                     'hospital.inpatient', 'doctor.allocation')
     def get_dashboard_statistics(self):
         """
         Get all dashboard statistics in one optimized call
+        Counters are read from the hospital.kpi.snapshot rows of the
+        current company instead of being counted on the source models
         Returns dict with counts and trends
         """
-        today = datetime.today().date()
-        
-        # Total patients
-        total_patients = self.search_count([
-            ('patient_seq', 'not in', ['New', 'Employee', 'User'])
-        ])
+        counters = self.env['hospital.kpi.snapshot'].sudo().get_dashboard_counters()
+        total_patients = counters['total_patients']
         
         # Patients from last month for trend
-        last_month = today - timedelta(days=30)
-        patients_last_month = self.search_count([
-            ('patient_seq', 'not in', ['New', 'Employee', 'User']),
-            ('create_date', '>=', last_month.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
+        patients_last_month = counters['patients_last_month']
         if total_patients > patients_last_month:
             patients_trend = round((patients_last_month / max(total_patients - patients_last_month, 1)) * 100, 1)
         else:
             patients_trend = 0
         
-        # Consultations today
-        Outpatient = self.env['hospital.outpatient']
-        consultations_today = Outpatient.search_count([
-            ('op_date', '=', today),
-            ('state', '!=', 'cancel')
-        ])
-        
-        # Consultations this week for trend
-        week_ago = today - timedelta(days=7)
-        consultations_week = Outpatient.search_count([
-            ('op_date', '>=', week_ago),
-            ('op_date', '<', today),
-            ('state', '!=', 'cancel')
-        ])
+        # Consultations today, and this week for trend
+        consultations_today = counters['consultations_today']
+        consultations_week = counters['consultations_week']
         if consultations_week > 0:
             consultations_trend = round((consultations_today / max(consultations_week / 7, 1)) * 100, 1)
         else:
             consultations_trend = 0
         
         # Active inpatients
-        Inpatient = self.env['hospital.inpatient']
-        active_inpatients = Inpatient.search_count([
-            ('state', '=', 'admit')
-        ])
+        active_inpatients = counters['active_inpatients']
         
         # Inpatients trend (this month vs last month)
-        month_start = today.replace(day=1)
-        last_month_start = (month_start - timedelta(days=1)).replace(day=1)
-        
-        inpatients_this_month = Inpatient.search_count([
-            ('hosp_date', '>=', month_start.strftime(DEFAULT_SERVER_DATE_FORMAT)),
-            ('hosp_date', '<=', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
-        inpatients_last_month = Inpatient.search_count([
-            ('hosp_date', '>=', last_month_start.strftime(DEFAULT_SERVER_DATE_FORMAT)),
-            ('hosp_date', '<', month_start.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
+        inpatients_this_month = counters['inpatients_this_month']
+        inpatients_last_month = counters['inpatients_last_month']
         
         if inpatients_last_month > 0:
             inpatients_trend = round(
@@ -89,19 +65,9 @@ class ResPartner(models.Model):
         else:
             inpatients_trend = 0
         
-        # Active allocations today
-        Allocation = self.env['doctor.allocation']
-        active_allocations = Allocation.search_count([
-            ('date', '=', today),
-            ('state', '=', 'confirm')
-        ])
-        
-        # Total available slots
-        allocations = Allocation.search([
-            ('date', '=', today),
-            ('state', '=', 'confirm')
-        ])
-        total_slots = sum(alloc.slot_remaining for alloc in allocations)
+        # Active allocations and available slots today
+        active_allocations = counters['active_allocations']
+        total_slots = counters['total_slots']
         
         return {
             'total_patients': total_patients,
@@ -120,6 +86,9 @@ class HospitalOutpatient(models.Model):
     _inherit = 'hospital.outpatient'
 
     @api.model
+    @profiled()
+    @dashboard_cache('hospital.outpatient', 'hospital.inpatient',
+                     'doctor.allocation', per_user=True)
     def get_dashboard_charts_data(self):
         """
         Get all chart data in one optimized call
@@ -221,6 +190,49 @@ class HospitalOutpatient(models.Model):
             'workload': workload,
         }
 
+    @api.model
+    @profiled()
+    def get_recent_activities(self):
+        """
+        Get the latest consultations, admissions and discharges
+        Returns dict with the records of each activity, most recent first
+        """
+        Inpatient = self.env['hospital.inpatient']
+        return {
+            'consultations': self.search_read(
+                [('state', '=', 'op')],
+                ['op_reference', 'patient_id', 'create_date'],
+                limit=3, order='create_date desc'),
+            'admissions': Inpatient.search_read(
+                [('state', '=', 'admit')],
+                ['name', 'patient_id', 'hosp_date'],
+                limit=3, order='hosp_date desc'),
+            'discharges': Inpatient.search_read(
+                [('state', '=', 'dis')],
+                ['name', 'patient_id', 'discharge_date'],
+                limit=2, order='discharge_date desc'),
+        }
+
+    @api.model
+    @profiled()
+    def get_doctor_dashboard_bundle(self, sections=None):
+        """
+        Get the data of the doctor dashboard in a single call
+        Args:
+            sections: list of the sections to return among 'stats', 'charts'
+                and 'recent_activities', all of them when not given
+        Returns dict with the data of each requested section
+        """
+        loaders = {
+            'stats': self.env['res.partner'].get_dashboard_statistics,
+            'charts': self.get_dashboard_charts_data,
+            'recent_activities': self.get_recent_activities,
+        }
+        return {
+            section: loaders[section]()
+            for section in (sections or loaders) if section in loaders
+        }
+
     @api.model
     def _format_float_time(self, time_float):
         """Convert float time (9.5) to string (09:30)"""
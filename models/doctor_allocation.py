@@ -19,8 +19,13 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ################################################################################
+from contextlib import contextmanager
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import column_exists, create_column, table_exists
+
+# Key space of the advisory locks taken per allocation by the bookings
+OP_BOOKING_LOCK = 7301
 
 
 class DoctorAllocation(models.Model):
@@ -79,6 +84,31 @@ class DoctorAllocation(models.Model):
         [('draft', 'Draft'), ('confirm', 'Confirmed'),
          ('cancel', 'Cancelled')],
         default='draft', string='State', help='State of Doctor allocation')
+    op_sequence = fields.Integer(string='Last OP Number', readonly=True,
+                                 copy=False, default=0,
+                                 help='Number of the last OP reference of '
+                                      'the allocation')
+
+    def _auto_init(self):
+        """Fills op_sequence from the existing OP references on install"""
+        if not column_exists(self.env.cr, 'doctor_allocation', 'op_sequence'):
+            create_column(self.env.cr, 'doctor_allocation', 'op_sequence',
+                          'int4')
+            if table_exists(self.env.cr, 'hospital_outpatient'):
+                self.env.cr.execute("""
+                    UPDATE doctor_allocation allocation
+                    SET op_sequence = op.number
+                    FROM (
+                        SELECT doctor_id,
+                               MAX(substring(op_reference FROM 3)::int)
+                                   AS number
+                        FROM hospital_outpatient
+                        WHERE op_reference ~ '^OP[0-9]+$'
+                        GROUP BY doctor_id
+                    ) op
+                    WHERE op.doctor_id = allocation.id
+                """)
+        return super()._auto_init()
 
     @api.model
     def create(self, vals):
@@ -173,6 +203,81 @@ class DoctorAllocation(models.Model):
             'context': {'create': False}
         }
 
+    @api.model
+    def _reserve_op_numbers(self, counts, minimums=None):
+        """
+        Reserve OP numbers on the allocations
+        Each counter is incremented by a single UPDATE ... RETURNING, which
+        locks the allocation row until the end of the transaction, so
+        concurrent bookings never get the same number.
+        Args:
+            counts: dict of the number of OPs per allocation id
+            minimums: dict of the highest number already used per allocation
+                id, e.g. by explicit OP references. The counters are raised
+                to it before the numbers are reserved
+        Returns: Dict of the first reserved number per allocation id
+        """
+        minimums = minimums or {}
+        numbers = {}
+        # Always locked in the same order, concurrent batches cannot deadlock
+        for allocation_id in sorted(set(counts) | set(minimums)):
+            count = counts.get(allocation_id, 0)
+            self.env.cr.execute("""
+                UPDATE doctor_allocation
+                SET op_sequence = GREATEST(COALESCE(op_sequence, 0), %s) + %s
+                WHERE id = %s
+                RETURNING op_sequence
+            """, [minimums.get(allocation_id, 0), count, allocation_id])
+            row = self.env.cr.fetchone()
+            if not row:
+                raise ValidationError(
+                    "The doctor allocation %s does not exist." % allocation_id)
+            numbers[allocation_id] = row[0] - count + 1
+        self.browse(numbers).invalidate_recordset(['op_sequence'])
+        return numbers
+
+    def _lock_allocations(self):
+        """Locks the allocations until the end of the transaction, in id
+        order, and returns them with their slot fields read again. The
+        booking advisory lock is taken first, so the backend waits for the
+        portal bookings of book_slot and the other way round."""
+        if self:
+            self.env.cr.execute("""
+                SELECT pg_advisory_xact_lock(%s, id)
+                FROM (SELECT unnest(%s) AS id ORDER BY id) allocation
+            """, [OP_BOOKING_LOCK, sorted(self.ids)])
+            self.env.cr.execute("""
+                SELECT id FROM doctor_allocation
+                WHERE id IN %s ORDER BY id FOR UPDATE
+            """, [tuple(self.ids)])
+            self.invalidate_recordset(['latest_slot', 'slot_remaining',
+                                       'op_sequence', 'state'])
+        return self
+
+    @contextmanager
+    def _booking_lock(self, cr):
+        """Holds the booking advisory lock of the allocation on a cursor
+        of its own, across the transactions of the cursor. The transaction
+        which waited for the lock is ended, so the next one reads the slots
+        committed by the previous holder."""
+        self.ensure_one()
+        cr.execute("SELECT pg_advisory_lock(%s, %s)",
+                   [OP_BOOKING_LOCK, self.id])
+        try:
+            cr.commit()
+            yield
+        finally:
+            cr.rollback()
+            cr.execute("SELECT pg_advisory_unlock(%s, %s)",
+                       [OP_BOOKING_LOCK, self.id])
+            cr.commit()
+
+    def _next_slot(self, slot):
+        """Returns the slot following the given one, the start of the
+        allocation when no slot is taken yet"""
+        self.ensure_one()
+        return self.work_from if not slot else slot + self.time_avg
+
     def action_confirm_allocation(self):
         """Confirmation of allocation"""
         self.state = 'confirm'
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Dashboard Benchmarks
+#    Measures the query count, time and payload of the dashboard RPCs
+#
+################################################################################
+
+import json
+import statistics
+import time
+
+from odoo import models, api, _
+from odoo.exceptions import UserError
+from odoo.tools import json_default
+
+# Benchmarked methods: (name, model, method, args, query budget)
+# A budget is the maximum number of SQL queries of one cold call. It must
+# not depend on the volume of data, so N+1 loops exceed it. The budgets are
+# enforced by tests/test_dashboard_budgets.py.
+BENCHMARKS = [
+    ('get_dashboard_statistics', 'res.partner',
+     'get_dashboard_statistics', (), 5),
+    ('get_dashboard_charts_data', 'hospital.outpatient',
+     'get_dashboard_charts_data', (), 10),
+    ('get_pharmacy_statistics', 'hospital.pharmacy',
+     'get_pharmacy_statistics', (), 25),
+    ('get_stock_alerts', 'hospital.pharmacy', 'get_stock_alerts', (), 30),
+    ('get_lab_charts_data', 'hospital.laboratory', 'get_lab_charts_data', (),
+     15),
+    ('get_reception_statistics', 'res.partner', 'get_reception_statistics',
+     (), 5),
+    ('hospital_inpatient_list', 'hospital.inpatient',
+     'hospital_inpatient_list', (), 10),
+    # Replaces fetch_patient_data, removed for the paginated patient list
+    ('search_patients', 'res.partner', 'search_patients', (), 5),
+    ('print_test_results', 'lab.test.result', 'print_test_results', (), 10),
+]
+
+
+class HospitalBenchmark(models.AbstractModel):
+    """Runs the dashboard RPC methods and reports their SQL queries, time
+    and payload against their budget. The budgets themselves are checked by
+    the module tests; this report is meant to measure a real database.
+
+    From a shell, on a database that will not be committed::
+
+        odoo-bin shell -d <db>
+        >>> print(env['hospital.benchmark'].report(size=10000))
+    """
+    _name = 'hospital.benchmark'
+    _description = 'Hospital Benchmark'
+
+    @api.model
+    def run(self, names=None, repeat=3, size=0, seed=42,
+            raise_on_failure=False):
+        """
+        Benchmark the dashboard methods
+        Args:
+            names: names of the benchmarks to run, all of them when not given
+            repeat: number of cold calls per method, the median time is kept
+            size: number of patients to generate with
+                hospital.data.generator before running, 0 to use the data
+                of the database
+            seed: seed of the generated data
+            raise_on_failure: raise a UserError when a budget is exceeded
+        Returns: List of dicts with the queries, time in milliseconds,
+            payload bytes, budget and status of each method
+        """
+        if not self.env.is_superuser() and not self.env.user.has_group(
+                'base.group_system'):
+            raise UserError(_("Only administrators can run benchmarks."))
+        if size:
+            self.env['hospital.data.generator'].generate(
+                seed=seed, patients=size, outpatients=size * 5,
+                inpatients=size // 2, lab_tests=size, vaccinations=size // 2,
+                sale_orders=size, batch_size=min(size, 1000))
+        results = []
+        for name, model, method, args, budget in BENCHMARKS:
+            if names and name not in names:
+                continue
+            records = self.env[model].with_context(
+                hospital_dashboard_cache=False)
+            queries, timings = 0, []
+            for _index in range(max(1, repeat)):
+                # Cold call: flushed database and empty record cache
+                self.env.flush_all()
+                self.env.invalidate_all()
+                count = self.env.cr.sql_log_count
+                start = time.perf_counter()
+                result = getattr(records, method)(*args)
+                timings.append((time.perf_counter() - start) * 1000)
+                queries = self.env.cr.sql_log_count - count
+            results.append({
+                'name': name,
+                'queries': queries,
+                'time_ms': round(statistics.median(timings), 1),
+                'bytes': len(json.dumps(result, default=json_default)),
+                'budget': budget,
+                'status': 'ok' if queries <= budget else 'failed',
+            })
+        failures = [result for result in results
+                    if result['status'] == 'failed']
+        if failures and raise_on_failure:
+            raise UserError(_("Query budget exceeded: %s", ', '.join(
+                f"{result['name']} ({result['queries']} > {result['budget']})"
+                for result in failures)))
+        return results
+
+    @api.model
+    def report(self, **kwargs):
+        """Returns the result of run() as a text table"""
+        lines = [f"{'Method':<28}{'Queries':>9}{'Budget':>8}{'Time ms':>10}"
+                 f"{'Bytes':>10}  Status"]
+        for result in self.run(**kwargs):
+            lines.append(
+                f"{result['name']:<28}{result['queries']:>9}"
+                f"{result['budget']:>8}{result['time_ms']:>10}"
+                f"{result['bytes']:>10}  {result['status']}")
+        return '\n'.join(lines)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#    Author: Sreerag PM (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU AFFERO
+#    GENERAL PUBLIC LICENSE (AGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU AFFERO GENERAL PUBLIC LICENSE (AGPL v3) for more details.
+#
+#    You should have received a copy of the GNU AFFERO GENERAL PUBLIC LICENSE
+#    (AGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+from collections import defaultdict
+from odoo import api, fields, models, tools
+from odoo.tools import SQL, split_every
+
+
+class HospitalDailyCounter(models.AbstractModel):
+    """Base of the tables holding additive counters per company and day.
+    A row holds what happened on its day, so the current value of a gauge
+    (e.g. the number of admitted patients) is the sum of its column over all
+    the rows of the company.
+    The hooks only insert rows holding their increments, a day can have many
+    rows which are summed on read. Concurrent transactions therefore never
+    update the same row, and the rows are merged by _compact."""
+    _name = 'hospital.daily.counter'
+    _description = 'Hospital Daily Counter'
+    _rec_name = 'date'
+    _order = 'date desc'
+
+    # Names of the additive counter columns
+    _counter_fields = ()
+    # Models inheriting hospital.daily.counter.mixin which feed the counters
+    _counter_source_models = ()
+
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, index=True,
+                                 ondelete='cascade',
+                                 help='Company of the counters')
+    date = fields.Date(string='Date', required=True,
+                       help='Day to which the counters belong')
+    source_model = fields.Char(string='Source Model',
+                               help='Model whose records produced the '
+                                    'counters of the row')
+
+    def init(self):
+        """Drops the unique row per company and day of the previous
+        versions, the increments are now inserted as new rows"""
+        if self._abstract:
+            return
+        self.env.cr.execute(SQL(
+            "ALTER TABLE %s DROP CONSTRAINT IF EXISTS %s",
+            SQL.identifier(self._table),
+            SQL.identifier(f'{self._table}_company_date_uniq')))
+        tools.create_index(self.env.cr, f'{self._table}_company_date_index',
+                           self._table, ['company_id', 'date'])
+
+    @api.model
+    def _apply_contributions(self, after, before=None, source_model=None):
+        """Adds the difference between two contribution maps, as returned by
+        _daily_counter_contributions, to the counters. The differences are
+        inserted as new rows by a single query, no existing row is locked.
+        Args:
+            after: contributions to add
+            before: contributions to remove
+            source_model: model whose records produced the contributions
+        """
+        before = before or {}
+        placeholders = ', '.join(['%s'] * len(self._counter_fields))
+        rows = []
+        for key in sorted(set(after) | set(before)):
+            new, old = after.get(key, {}), before.get(key, {})
+            values = [new.get(column, 0) - old.get(column, 0)
+                      for column in self._counter_fields]
+            if not any(values):
+                continue
+            rows.append(SQL(
+                f"(%s, %s, %s, {placeholders}, %s, now() at time zone 'UTC', "
+                f"%s, now() at time zone 'UTC')",
+                *key, source_model, *values, self.env.uid, self.env.uid))
+        if not rows:
+            return
+        self.env.cr.execute(SQL("""
+            INSERT INTO %s
+                (company_id, date, source_model, %s,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES %s
+        """, SQL.identifier(self._table), SQL(', ').join(
+            SQL.identifier(column) for column in self._counter_fields),
+            SQL(', ').join(rows)))
+        self.invalidate_model()
+
+    @api.model
+    def _compact(self):
+        """Merges the rows of every company, day and source model into a
+        single row"""
+        self.flush_model()
+        self.env.cr.execute(SQL("""
+            WITH merged AS (
+                DELETE FROM %(table)s counter
+                USING (
+                    SELECT company_id, date, source_model
+                    FROM %(table)s
+                    GROUP BY company_id, date, source_model
+                    HAVING count(*) > 1
+                ) duplicate
+                WHERE counter.company_id = duplicate.company_id
+                  AND counter.date = duplicate.date
+                  AND counter.source_model IS NOT DISTINCT FROM
+                      duplicate.source_model
+                RETURNING counter.*
+            )
+            INSERT INTO %(table)s
+                (company_id, date, source_model, %(columns)s,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT company_id, date, source_model, %(sums)s,
+                   %(uid)s, now() at time zone 'UTC',
+                   %(uid)s, now() at time zone 'UTC'
+            FROM merged
+            GROUP BY company_id, date, source_model
+        """, table=SQL.identifier(self._table),
+            columns=SQL(', ').join(SQL.identifier(column)
+                                   for column in self._counter_fields),
+            sums=SQL(', ').join(SQL("SUM(%s)", SQL.identifier(column))
+                                for column in self._counter_fields),
+            uid=self.env.uid))
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self, commit=False):
+        """Recomputes the rows from the source records. The hooks of the
+        source models keep the rows up to date, this only corrects drifts
+        coming from changes that bypass them.
+        Args:
+            commit: commit after every source model, so that each one is
+                rebuilt in its own transaction
+        """
+        for model in self._counter_source_models:
+            self._rebuild_source(model)
+            if commit:
+                self.env.cr.commit()
+
+    @api.model
+    def _rebuild_source(self, model):
+        """Replaces the rows of a source model by the contributions of its
+        records. The rows inserted by transactions committed after the
+        snapshot of the rebuild are neither deleted nor counted again, so
+        the concurrent hooks do not have to wait for it."""
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE source_model = %s",
+            SQL.identifier(self._table), model))
+        contributions = defaultdict(lambda: defaultdict(int))
+        records = self.env[model].sudo().with_context(
+            active_test=False).search([])
+        for ids in split_every(1000, records.ids):
+            batch = records.browse(ids)
+            for key, counters in batch._daily_counter_contributions(
+            ).items():
+                for column, value in counters.items():
+                    contributions[key][column] += value
+            batch.invalidate_recordset()
+        self._apply_contributions(contributions, source_model=model)
+
+    @api.model
+    def _cron_rebuild(self):
+        """Scheduled action recomputing the rows, one source model per
+        transaction"""
+        self._rebuild(commit=True)
+
+
+class HospitalDailyCounterMixin(models.AbstractModel):
+    """Mixin keeping a hospital.daily.counter table up to date from the
+    create, write and unlink of the source model"""
+    _name = 'hospital.daily.counter.mixin'
+    _description = 'Hospital Daily Counter Mixin'
+
+    # Counter table fed by the model
+    _daily_counter_model = None
+    # Fields whose change can alter the contributions of a record
+    _daily_counter_fields = ()
+
+    def _daily_counter_contributions(self):
+        """Returns the counters the records add to the counter table, as a
+        dict {(company_id, date): {counter: value}}"""
+        return defaultdict(lambda: defaultdict(int))
+
+    def _daily_counter_company_id(self, company):
+        """Company of the counter row a record contributes to. Records
+        without company are counted in the company of the current user."""
+        return company.id or self.env.company.id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Adds the contributions of the new records"""
+        records = super().create(vals_list)
+        self.env[self._daily_counter_model]._apply_contributions(
+            records._daily_counter_contributions(), source_model=self._name)
+        return records
+
+    def write(self, vals):
+        """Applies the difference of contributions caused by the write"""
+        if not set(vals) & set(self._daily_counter_fields):
+            return super().write(vals)
+        before = self._daily_counter_contributions()
+        res = super().write(vals)
+        self.env[self._daily_counter_model]._apply_contributions(
+            self._daily_counter_contributions(), before,
+            source_model=self._name)
+        return res
+
+    def unlink(self):
+        """Removes the contributions of the deleted records"""
+        before = self._daily_counter_contributions()
+        res = super().unlink()
+        self.env[self._daily_counter_model]._apply_contributions(
+            {}, before, source_model=self._name)
+        return res
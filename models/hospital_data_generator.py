@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Synthetic Data Generator
+#    Populates a database at hospital scale for load testing
+#
+################################################################################
+
+import base64
+import random
+from datetime import timedelta
+
+from odoo import Command, models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+
+FIRST_NAMES = ('Amina', 'Omar', 'Fatou', 'Youssef', 'Claire', 'Hugo', 'Leila',
+               'Karim', 'Sofia', 'Lucas', 'Nadia', 'Malik', 'Emma', 'Ibrahim',
+               'Chloe', 'Samir', 'Ines', 'Adam', 'Sarah', 'Mehdi')
+LAST_NAMES = ('Diallo', 'Benali', 'Martin', 'Traore', 'Dubois', 'Haddad',
+              'Moreau', 'Kone', 'Laurent', 'Mansour', 'Petit', 'Ndiaye',
+              'Bernard', 'Cisse', 'Roux', 'Khelifi', 'Fournier', 'Sow')
+
+
+class HospitalDataGenerator(models.AbstractModel):
+    """Generates synthetic hospital data of configurable volume. The data
+    only depends on the seed, so two runs with the same seed and volumes
+    produce the same records.
+
+    From a shell::
+
+        odoo-bin shell -d <db>
+        >>> env['hospital.data.generator'].generate(
+        ...     seed=7, patients=1000000, outpatients=5000000, commit=True)
+    """
+    _name = 'hospital.data.generator'
+    _description = 'Hospital Data Generator'
+
+    @api.model
+    def generate(self, seed=42, patients=1000, doctors=20, days=30,
+                 outpatients=5000, inpatients=500, rooms=50, beds=200,
+                 lab_tests=2000, vaccinations=500, medicines=200,
+                 sale_orders=1000, batch_size=1000, prefix='GEN',
+                 commit=False):
+        """
+        Create the requested volume of every hospital object
+        Args:
+            seed: seed of the random generator
+            patients, doctors, outpatients, inpatients, rooms, beds,
+            lab_tests, vaccinations, medicines, sale_orders: number of
+                records to create
+            days: number of days, ending today, the records are spread on.
+                One allocation is created per doctor and day
+            batch_size: number of records per create call
+            prefix: prefix of the generated names
+            commit: commit after every batch, for the volumes which do not
+                fit in one transaction. Only meant for shell runs
+        Returns: Dict with the number of records created per model
+        """
+        if not self.env.is_superuser() and not self.env.user.has_group(
+                'base.group_system'):
+            raise UserError(_("Only administrators can generate data."))
+        generator = self.sudo().with_context(
+            tracking_disable=True, mail_create_nolog=True, mail_notrack=True)
+        rng = random.Random(seed)
+        today = fields.Date.today()
+        dates = [today - timedelta(days=day) for day in range(days)]
+        counts = {}
+
+        def create(model, vals_iter):
+            ids = generator._create_batches(model, vals_iter, batch_size,
+                                            commit)
+            counts[model] = counts.get(model, 0) + len(ids)
+            return ids
+
+        # 1. Doctors and their allocations
+        job = self.env['hr.job'].sudo().search([('name', '=', 'Doctor')],
+                                               limit=1)
+        if not job:
+            job = self.env['hr.job'].sudo().create({'name': 'Doctor'})
+        doctor_ids = create('hr.employee', ({
+            'name': f'{prefix} Dr. {rng.choice(LAST_NAMES)} {index}',
+            'job_id': job.id,
+            'doctor': True,
+            'time_avg': rng.choice([0.25, 0.5]),
+        } for index in range(doctors)))
+        allocations = []
+        allocation_ids = create('doctor.allocation', ({
+            'doctor_id': doctor_id,
+            'date': date,
+            'work_from': 8.0,
+            'work_to': rng.choice([12.0, 16.0, 18.0]),
+            'patient_type': 'outpatient',
+            'state': 'confirm',
+        } for date in dates for doctor_id in doctor_ids))
+        for index, allocation_id in enumerate(allocation_ids):
+            allocations.append((allocation_id, dates[index // doctors]))
+
+        # 2. Buildings, rooms and beds
+        building_ids = create('hospital.building', (
+            {'notes': f'{prefix} building {index}'}
+            for index in range(max(1, rooms // 20))))
+        room_ids = create('patient.room', ({
+            'name': f'{prefix}-{seed} R{index:05d}',
+            'building_id': building_ids[index % len(building_ids)],
+            'state': rng.choice(['avail', 'avail', 'reserve', 'not']),
+        } for index in range(rooms)))
+        create('hospital.bed', ({
+            'name': f'{prefix}-{seed} B{index:06d}',
+            'room_id': room_ids[index % len(room_ids)] if room_ids else False,
+            'bed_type': rng.choice(['gatch', 'electric', 'low']),
+            'bed_rent': rng.randint(20, 200),
+        } for index in range(beds)))
+
+        # 3. Patients
+        patient_ids = create('res.partner', ({
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'phone': f'+2216{rng.randrange(10 ** 8):08d}',
+            'gender': rng.choice(['male', 'female']),
+            'blood_group': rng.choice(['a', 'b', 'o', 'ab']),
+            'rh_type': rng.choice(['+', '-']),
+            'date_of_birth': today - timedelta(days=rng.randint(0, 90 * 365)),
+        } for _index in range(patients)))
+
+        # 4. Outpatients, at most one per patient and allocation
+        def outpatient_values():
+            taken = set()
+            for _index in range(outpatients):
+                allocation_id, date = rng.choice(allocations)
+                patient_id = rng.choice(patient_ids)
+                if (patient_id, allocation_id) in taken:
+                    continue
+                taken.add((patient_id, allocation_id))
+                yield {
+                    'patient_id': patient_id,
+                    'doctor_id': allocation_id,
+                    'op_date': date,
+                    'state': rng.choice(['draft', 'op', 'op', 'cancel']),
+                }
+        if allocations and patient_ids:
+            create('hospital.outpatient', outpatient_values())
+
+        # 5. Inpatients
+        if patient_ids and doctor_ids:
+            create('hospital.inpatient', ({
+                'patient_id': rng.choice(patient_ids),
+                'attending_doctor_id': rng.choice(doctor_ids),
+                'type_admission': rng.choice(['emergency', 'routine']),
+                'hosp_date': rng.choice(dates),
+                'state': rng.choice(['draft', 'admit', 'admit', 'dis']),
+            } for _index in range(inpatients)))
+
+        # 6. Lab tests with their results
+        test_ids = create('lab.test', ({
+            'name': f'{prefix} Test {index}',
+            'test_type': rng.choice(['range', 'objective']),
+            'price': rng.randint(10, 100),
+        } for index in range(10)))
+        if patient_ids and lab_tests:
+            lines = [(rng.choice(patient_ids), rng.choice(dates),
+                      rng.sample(test_ids, rng.randint(1, 3)))
+                     for _index in range(lab_tests)]
+            line_ids = create('lab.test.line', ({
+                'patient_id': patient_id,
+                'date': date,
+                'patient_type': 'outpatient',
+                'test_ids': [Command.set(tests)],
+                'state': 'created',
+            } for patient_id, date, tests in lines))
+            lab_test_ids = create('patient.lab.test', ({
+                'test_id': line_id,
+                'patient_id': patient_id,
+                'date': date,
+                'state': rng.choice(['draft', 'test', 'completed']),
+            } for line_id, (patient_id, date, _tests) in zip(line_ids, lines)))
+            create('lab.test.result', ({
+                'parent_id': lab_test_id,
+                'patient_id': patient_id,
+                'test_id': test_id,
+                'result': str(rng.randint(1, 200)),
+                # Half of the results are published with a document
+                'attachment': base64.b64encode(
+                    f'{prefix} result {lab_test_id}-{test_id}'.encode())
+                if rng.random() < 0.5 else False,
+            } for lab_test_id, (patient_id, _date, tests) in zip(
+                lab_test_ids, lines) for test_id in tests))
+
+        # 7. Vaccines, medicines and their pharmacy stock
+        vaccine_ids = create('product.template', ({
+            'name': f'{prefix} Vaccine {index}',
+            'vaccine_ok': True,
+            'list_price': rng.randint(5, 50),
+        } for index in range(5)))
+        if patient_ids and vaccinations:
+            create('hospital.vaccination', ({
+                'patient_id': rng.choice(patient_ids),
+                'vaccine_product_id': rng.choice(vaccine_ids),
+                'vaccine_date': rng.choice(dates),
+                'dose': 1,
+            } for _index in range(vaccinations)))
+        medicine_ids = create('product.template', ({
+            'name': f'{prefix} Medicine {index}',
+            'medicine_ok': True,
+            'sale_ok': True,
+            'list_price': rng.randint(1, 80),
+        } for index in range(medicines)))
+        create('pharmacy.medicine', ({
+            'product_id': medicine_id,
+            'expiry_date': today + timedelta(days=rng.randint(-60, 720)),
+            'batch_number': f'{prefix}-{seed}-L{index:05d}',
+            'min_qty': 10,
+        } for index, medicine_id in enumerate(medicine_ids)))
+
+        # 8. Pharmacy sale orders
+        if patient_ids and medicine_ids:
+            variants = dict(self.env['product.template'].browse(
+                medicine_ids).mapped(
+                lambda product: (product.id, product.product_variant_id.id)))
+            create('sale.order', ({
+                'partner_id': rng.choice(patient_ids),
+                'date_order': fields.Datetime.to_datetime(
+                    rng.choice(dates)) + timedelta(hours=rng.randint(8, 19)),
+                'state': rng.choice(['draft', 'sale', 'sale']),
+                'order_line': [Command.create({
+                    'product_id': variants[medicine_id],
+                    'product_uom_qty': rng.randint(1, 5),
+                }) for medicine_id in rng.sample(
+                    medicine_ids, min(len(medicine_ids), rng.randint(1, 4)))],
+            } for _index in range(sale_orders)))
+
+        return counts
+
+    @api.model
+    def _create_batches(self, model, vals_iter, batch_size=1000,
+                        commit=False):
+        """Creates the records of vals_iter in batches of batch_size and
+        returns their ids"""
+        ids = []
+        for vals_list in split_every(batch_size, vals_iter, list):
+            records = self.env[model].create(vals_list)
+            ids.extend(records.ids)
+            if commit:
+                self.env.cr.commit()
+            # Keep the memory flat whatever the volume
+            self.env.invalidate_all()
+        return ids
@@ -21,6 +21,7 @@
 ################################################################################
 import datetime
 from odoo import api, fields, models
+from .hospital_perf_sample import profiled
 
 
 class HospitalInpatient(models.Model):
@@ -32,7 +33,8 @@ class HospitalInpatient(models.Model):
     patient_id = fields.Many2one('res.partner', string="Patient",
                                  domain=[('patient_seq', 'not in',
                                           ['New', 'Employee', 'User'])],
-                                 required=True, help='Choose the patient')
+                                 required=True, index=True,
+                                 help='Choose the patient')
     name = fields.Char(string="Sequence Number", store=True,
                        copy=False, readonly=True, index=True,
                        help='Sequence number of inpatient for uniquely '
@@ -102,6 +104,9 @@ class HospitalInpatient(models.Model):
                                   help='Currency in which rent is calculating',
                                   default=lambda self: self.env.user.company_id
                                   .currency_id.id)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 default=lambda self: self.env.company.id,
+                                 help='Company admitting the patient')
     state = fields.Selection([('draft', 'Draft'),
                               ('reserve', 'Reserved'),
                               ('admit', 'Admitted'), ('invoice', 'Invoiced'),
@@ -462,6 +467,7 @@ class HospitalInpatient(models.Model):
             report_action(self, data=data)
 
     @api.model
+    @profiled()
     def hospital_inpatient_list(self):
         """Returns list of inpatients to doctor's dashboard"""
         patient_list = []
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#    Author: Sreerag PM (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU AFFERO
+#    GENERAL PUBLIC LICENSE (AGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU AFFERO GENERAL PUBLIC LICENSE (AGPL v3) for more details.
+#
+#    You should have received a copy of the GNU AFFERO GENERAL PUBLIC LICENSE
+#    (AGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+from datetime import timedelta
+from odoo import api, fields, models
+from .res_partner import NON_PATIENT_SEQ
+
+
+class HospitalKpiSnapshot(models.Model):
+    """Class holding the daily dashboard counters of a company"""
+    _name = 'hospital.kpi.snapshot'
+    _inherit = 'hospital.daily.counter'
+    _description = 'Hospital KPI Snapshot'
+
+    _counter_fields = ('new_patient_count', 'patient_delta',
+                       'consultation_count', 'admission_count',
+                       'inpatient_delta', 'allocation_count', 'slot_remaining')
+    _counter_source_models = ('res.partner', 'hospital.outpatient',
+                              'hospital.inpatient', 'doctor.allocation')
+
+    new_patient_count = fields.Integer(string='New Patients',
+                                       help='Patients registered on this day')
+    patient_delta = fields.Integer(string='Patient Variation',
+                                   help='Net change of the registered '
+                                        'patients recorded on this day')
+    consultation_count = fields.Integer(string='Consultations',
+                                        help='Outpatient consultations '
+                                             'scheduled on this day')
+    admission_count = fields.Integer(string='Admissions',
+                                     help='Inpatients admitted on this day')
+    inpatient_delta = fields.Integer(string='Inpatient Variation',
+                                     help='Net change of the admitted '
+                                          'inpatients recorded on this day')
+    allocation_count = fields.Integer(string='Allocations',
+                                      help='Confirmed doctor allocations of '
+                                           'this day')
+    slot_remaining = fields.Integer(string='Slots Remaining',
+                                    help='Remaining slots of the confirmed '
+                                         'doctor allocations of this day')
+
+    @api.model
+    def get_dashboard_counters(self, date=None):
+        """Returns the counters of the doctor dashboard for the current
+        company, aggregated over the snapshot rows in a single query"""
+        today = date or fields.Date.today()
+        company = self.env.company
+        month_start = today.replace(day=1)
+        self.env.cr.execute("""
+            SELECT
+                COALESCE(SUM(patient_delta), 0) AS total_patients,
+                COALESCE(SUM(new_patient_count)
+                    FILTER (WHERE date >= %(last_month)s), 0)
+                    AS patients_last_month,
+                COALESCE(SUM(consultation_count)
+                    FILTER (WHERE date = %(today)s), 0)
+                    AS consultations_today,
+                COALESCE(SUM(consultation_count)
+                    FILTER (WHERE date >= %(week_ago)s AND date < %(today)s),
+                    0) AS consultations_week,
+                COALESCE(SUM(inpatient_delta), 0) AS active_inpatients,
+                COALESCE(SUM(admission_count)
+                    FILTER (WHERE date >= %(month_start)s
+                            AND date <= %(today)s), 0)
+                    AS inpatients_this_month,
+                COALESCE(SUM(admission_count)
+                    FILTER (WHERE date >= %(last_month_start)s
+                            AND date < %(month_start)s), 0)
+                    AS inpatients_last_month,
+                COALESCE(SUM(allocation_count)
+                    FILTER (WHERE date = %(today)s), 0)
+                    AS active_allocations,
+                COALESCE(SUM(slot_remaining)
+                    FILTER (WHERE date = %(today)s), 0) AS total_slots
+            FROM hospital_kpi_snapshot
+            WHERE company_id = %(company_id)s
+        """, {
+            'company_id': company.id,
+            'today': today,
+            'last_month': today - timedelta(days=30),
+            'week_ago': today - timedelta(days=7),
+            'month_start': month_start,
+            'last_month_start': (month_start - timedelta(days=1)).replace(
+                day=1),
+        })
+        return self.env.cr.dictfetchone()
+
+
+class ResPartner(models.Model):
+    """Inherited to feed the patient counters of the KPI snapshots"""
+    _name = 'res.partner'
+    _inherit = ['res.partner', 'hospital.daily.counter.mixin']
+
+    _daily_counter_model = 'hospital.kpi.snapshot'
+    _daily_counter_fields = ('patient_seq', 'active', 'company_id')
+
+    def _daily_counter_contributions(self):
+        """Registered patients and patients registered per day"""
+        contributions = super()._daily_counter_contributions()
+        today = fields.Date.today()
+        for partner in self.sudo():
+            if not partner.active or partner.patient_seq in NON_PATIENT_SEQ:
+                continue
+            company_id = self._daily_counter_company_id(partner.company_id)
+            contributions[company_id, today]['patient_delta'] += 1
+            if partner.create_date:
+                contributions[company_id, partner.create_date.date()][
+                    'new_patient_count'] += 1
+        return contributions
+
+
+class HospitalOutpatient(models.Model):
+    """Inherited to feed the consultation counters of the KPI snapshots"""
+    _name = 'hospital.outpatient'
+    _inherit = ['hospital.outpatient', 'hospital.daily.counter.mixin']
+
+    _daily_counter_model = 'hospital.kpi.snapshot'
+    _daily_counter_fields = ('op_date', 'state', 'active', 'doctor_id')
+
+    def _daily_counter_contributions(self):
+        """Consultations per day and slots taken on confirmed allocations"""
+        contributions = super()._daily_counter_contributions()
+        for op in self.sudo():
+            if not op.active:
+                continue
+            allocation = op.doctor_id
+            company_id = self._daily_counter_company_id(allocation.company_id)
+            if op.op_date and op.state != 'cancel':
+                contributions[company_id, op.op_date][
+                    'consultation_count'] += 1
+            if allocation.state == 'confirm' and allocation.date:
+                contributions[company_id, allocation.date][
+                    'slot_remaining'] -= 1
+        return contributions
+
+
+class HospitalInpatient(models.Model):
+    """Inherited to feed the admission counters of the KPI snapshots"""
+    _name = 'hospital.inpatient'
+    _inherit = ['hospital.inpatient', 'hospital.daily.counter.mixin']
+
+    _daily_counter_model = 'hospital.kpi.snapshot'
+    _daily_counter_fields = ('hosp_date', 'state', 'active', 'company_id')
+
+    def _daily_counter_contributions(self):
+        """Admitted inpatients and admissions per day"""
+        contributions = super()._daily_counter_contributions()
+        today = fields.Date.today()
+        for inpatient in self.sudo():
+            if not inpatient.active:
+                continue
+            company_id = self._daily_counter_company_id(inpatient.company_id)
+            if inpatient.state == 'admit':
+                contributions[company_id, today]['inpatient_delta'] += 1
+            if inpatient.hosp_date:
+                contributions[company_id, inpatient.hosp_date][
+                    'admission_count'] += 1
+        return contributions
+
+
+class DoctorAllocation(models.Model):
+    """Inherited to feed the allocation counters of the KPI snapshots"""
+    _name = 'doctor.allocation'
+    _inherit = ['doctor.allocation', 'hospital.daily.counter.mixin']
+
+    _daily_counter_model = 'hospital.kpi.snapshot'
+    _daily_counter_fields = ('state', 'date', 'company_id', 'work_from',
+                            'work_to', 'doctor_id', 'time_avg')
+
+    def _daily_counter_contributions(self):
+        """Confirmed allocations and their slots per day. The booked OPs
+        take their slot back through their own contributions."""
+        contributions = super()._daily_counter_contributions()
+        for allocation in self.sudo():
+            if allocation.state != 'confirm' or not allocation.date:
+                continue
+            key = (self._daily_counter_company_id(allocation.company_id),
+                   allocation.date)
+            contributions[key]['allocation_count'] += 1
+            contributions[key]['slot_remaining'] += allocation.patient_limit
+        return contributions
@@ -20,8 +20,24 @@
 #
 ################################################################################
 import base64
+import hashlib
+import json
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from psycopg2.errors import UniqueViolation
+
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# Unique partial index of the active OPs per patient and allocation
+OP_BOOKING_INDEX = 'hospital_outpatient_patient_doctor_uniq'
 
 
 class HospitalOutpatient(models.Model):
@@ -39,7 +55,7 @@ class HospitalOutpatient(models.Model):
                                  domain=[('patient_seq', 'not in',
                                           ['New', 'Employee', 'User'])],
                                  string='Patient ID', help='Id of the patient',
-                                 required=True)
+                                 required=True, index=True)
     doctor_id = fields.Many2one('doctor.allocation',
                                 string='Doctor',
                                 help='Select the doctor',
@@ -79,29 +95,314 @@ class HospitalOutpatient(models.Model):
                         copy=False, readonly=True)
     is_sale_created = fields.Boolean(string='Sale Created',
                                      help='True if sale order created')
+    prescription_hash = fields.Char(string='Prescription Hash', copy=False,
+                                    readonly=True,
+                                    help='Hash of the prescription the '
+                                         'attachment was rendered from')
+    prescription_state = fields.Selection(
+        [('queued', 'Queued'), ('done', 'Ready'), ('failed', 'Failed')],
+        string='Prescription File', copy=False, readonly=True, index=True,
+        help='State of the rendering of the prescription PDF')
 
-    @api.model
-    def create(self, vals):
-        """Op number generator"""
-        if vals.get('op_reference', 'New') == 'New':
-            last_op = self.search([
-                ('doctor_id', '=', vals.get('doctor_id')),
-                ('op_reference', '!=', 'New'),
-            ], order='create_date desc', limit=1)
-            if last_op:
-                last_number = int(last_op.op_reference[2:])
-                new_number = last_number + 1
-                vals['op_reference'] = f'OP{str(new_number).zfill(3)}'
-            else:
-                vals['op_reference'] = 'OP001'
-        if self.search([
-            ('patient_id', '=', vals['patient_id']),
-            ('doctor_id', '=', vals['doctor_id'])
-        ]):
+    _sql_constraints = [
+        ('op_reference_uniq', 'unique (doctor_id, op_reference)',
+         'The OP reference must be unique per doctor allocation.'),
+    ]
+
+    def _auto_init(self):
+        """Renumbers the OPs sharing a reference within their allocation
+        before the op_reference_uniq constraint is added, the oldest OP
+        keeps the reference"""
+        if column_exists(self.env.cr, 'hospital_outpatient', 'op_reference'):
+            self.env.cr.execute("""
+                WITH duplicate AS (
+                    SELECT id, doctor_id, row_number() OVER (
+                        PARTITION BY doctor_id, op_reference ORDER BY id
+                    ) AS rank
+                    FROM hospital_outpatient
+                    WHERE op_reference IS NOT NULL
+                ), renumbered AS (
+                    SELECT id, doctor_id, row_number() OVER (
+                        PARTITION BY doctor_id ORDER BY id
+                    ) + COALESCE((
+                        SELECT MAX(substring(op.op_reference FROM 3)::int)
+                        FROM hospital_outpatient op
+                        WHERE op.doctor_id IS NOT DISTINCT FROM
+                              duplicate.doctor_id
+                          AND op.op_reference ~ '^OP[0-9]+$'
+                    ), 0) AS number
+                    FROM duplicate
+                    WHERE rank > 1
+                )
+                UPDATE hospital_outpatient op
+                SET op_reference = 'OP' || lpad(
+                    renumbered.number::text,
+                    GREATEST(3, length(renumbered.number::text)), '0')
+                FROM renumbered
+                WHERE op.id = renumbered.id
+                RETURNING op.id, op.op_reference
+            """)
+            renumbered = self.env.cr.fetchall()
+            if renumbered:
+                _logger.warning("Renumbered %s OPs sharing their reference: "
+                                "%s", len(renumbered), renumbered)
+                if column_exists(self.env.cr, 'doctor_allocation',
+                                 'op_sequence'):
+                    self.env.cr.execute("""
+                        UPDATE doctor_allocation allocation
+                        SET op_sequence = GREATEST(
+                            COALESCE(allocation.op_sequence, 0), op.number)
+                        FROM (
+                            SELECT doctor_id,
+                                   MAX(substring(op_reference FROM 3)::int)
+                                       AS number
+                            FROM hospital_outpatient
+                            WHERE op_reference ~ '^OP[0-9]+$'
+                            GROUP BY doctor_id
+                        ) op
+                        WHERE op.doctor_id = allocation.id
+                    """)
+        return super()._auto_init()
+
+    def init(self):
+        """Creates the unique index of the bookings, a patient can only
+        have one active OP per allocation. The duplicates booked before the
+        index existed are archived first. The booking kept is the one with
+        the most advanced state, then with the most linked prescriptions,
+        lab tests, sales and invoices, then the oldest."""
+        links = [SQL("(invoice_id IS NOT NULL)::int"),
+                 SQL("COALESCE(is_sale_created, false)::int")]
+        for table, column in (('prescription_line', 'outpatient_id'),
+                              ('lab_test_line', 'op_id')):
+            if column_exists(self.env.cr, table, column):
+                links.append(SQL(
+                    "(SELECT count(*) FROM %s link WHERE link.%s = op.id)",
+                    SQL.identifier(table), SQL.identifier(column)))
+        self.env.cr.execute(SQL("""
+            UPDATE hospital_outpatient SET active = false
+            FROM (
+                SELECT id, kept_id FROM (
+                    SELECT id, first_value(id) OVER w AS kept_id,
+                           row_number() OVER w AS rank
+                    FROM hospital_outpatient op
+                    WHERE active
+                    WINDOW w AS (
+                        PARTITION BY patient_id, doctor_id
+                        ORDER BY CASE state
+                                     WHEN 'invoice' THEN 4
+                                     WHEN 'inpatient' THEN 3
+                                     WHEN 'op' THEN 2
+                                     WHEN 'draft' THEN 1
+                                     ELSE 0
+                                 END DESC,
+                                 %s DESC, id
+                    )
+                ) booking
+                WHERE booking.rank > 1
+            ) AS kept
+            WHERE hospital_outpatient.id = kept.id
+            RETURNING hospital_outpatient.id, kept.kept_id
+        """, SQL(" + ").join(links)))
+        archived = self.env.cr.fetchall()
+        if archived:
+            _logger.warning(
+                "Archived %s duplicate OP bookings (archived, kept): %s",
+                len(archived), archived)
+        self.env.cr.execute(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {OP_BOOKING_INDEX}
+            ON hospital_outpatient (patient_id, doctor_id)
+            WHERE active
+        """)
+
+    @contextmanager
+    def _check_unique_booking(self):
+        """Raises the violations of the booking index as a
+        ValidationError. The guarded block runs in a savepoint, so the
+        transaction stays usable after a violation."""
+        try:
+            with self.env.cr.savepoint():
+                yield
+        except UniqueViolation as error:
+            if error.diag.constraint_name != OP_BOOKING_INDEX:
+                raise
             raise ValidationError(
                 'An OP already exists for this patient under the specified '
-                'allocation')
-        return super().create(vals)
+                'allocation') from error
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Op number generator, the numbers of an allocation come from its
+        counter instead of the last OP. Explicit references raise the
+        counter past their number. Duplicate bookings are rejected by the
+        database."""
+        new_vals = []
+        minimums = {}
+        for vals in vals_list:
+            if vals.get('op_reference', 'New') == 'New':
+                new_vals.append(vals)
+                continue
+            match = re.fullmatch(r'OP(\d+)', vals.get('op_reference') or '')
+            if match and vals.get('doctor_id'):
+                allocation_id = int(vals['doctor_id'])
+                minimums[allocation_id] = max(minimums.get(allocation_id, 0),
+                                              int(match.group(1)))
+        numbers = self.env['doctor.allocation']._reserve_op_numbers(
+            Counter(int(vals['doctor_id']) for vals in new_vals), minimums)
+        for vals in new_vals:
+            allocation_id = int(vals['doctor_id'])
+            vals['op_reference'] = f'OP{str(numbers[allocation_id]).zfill(3)}'
+            numbers[allocation_id] += 1
+        with self._check_unique_booking():
+            return super().create(vals_list)
+
+    def write(self, vals):
+        """Checks the booking index when the patient or the allocation
+        changes"""
+        result = super().write(vals)
+        if {'patient_id', 'doctor_id', 'active'} & vals.keys():
+            with self._check_unique_booking():
+                self.flush_recordset(['patient_id', 'doctor_id', 'active'])
+        return result
+
+    @api.model
+    def schedule_batch(self, requests):
+        """
+        Book and confirm many OPs at once
+        The requests are grouped by allocation, every allocation is locked
+        once, the slots follow each other from its latest slot, and all the
+        OPs are inserted by a single create call. When that call is
+        rejected, the OPs are created one by one and only the rejected
+        requests get an error.
+        Args:
+            requests: list of dicts with the patient_id, the allocation as
+                doctor_id, and optionally the reason and op_date
+        Returns: List with, for every request in order, a dict with the id,
+            op_reference and slot of the OP, or with the error
+        """
+        results = [{} for _request in requests]
+        by_allocation = {}
+        patient_ids = set()
+        for index, request in enumerate(requests):
+            if not request.get('patient_id') or not request.get('doctor_id'):
+                results[index] = {
+                    'error': 'A patient and an allocation are required'}
+                continue
+            by_allocation.setdefault(int(request['doctor_id']), []).append(
+                index)
+            patient_ids.add(int(request['patient_id']))
+        allocations = self.env['doctor.allocation'].browse(
+            sorted(by_allocation)).exists()._lock_allocations()
+        allocations_by_id = {allocation.id: allocation
+                             for allocation in allocations}
+        # Active OPs of the requested patients, found with one query. The
+        # record rules and the context must not hide a booking from it.
+        booked = {(op.patient_id.id, op.doctor_id.id) for op in self.sudo(
+        ).with_context(active_test=False).search([
+            ('doctor_id', 'in', allocations.ids),
+            ('patient_id', 'in', list(patient_ids)),
+            ('active', '=', True),
+        ])}
+        vals_list, indexes_list = [], []
+        for allocation_id, indexes in by_allocation.items():
+            allocation = allocations_by_id.get(allocation_id)
+            if not allocation or allocation.state != 'confirm':
+                for index in indexes:
+                    results[index] = {
+                        'error': 'The allocation is not confirmed'}
+                continue
+            remaining = allocation.slot_remaining
+            slot = allocation.latest_slot
+            for index in indexes:
+                patient_id = int(requests[index]['patient_id'])
+                if (patient_id, allocation_id) in booked:
+                    results[index] = {
+                        'error': 'An OP already exists for this patient '
+                                 'under the specified allocation'}
+                    continue
+                if remaining <= 0:
+                    results[index] = {
+                        'error': 'No slot remaining in the allocation'}
+                    continue
+                slot = allocation._next_slot(slot)
+                booked.add((patient_id, allocation_id))
+                remaining -= 1
+                vals_list.append({
+                    'patient_id': patient_id,
+                    'doctor_id': allocation_id,
+                    'op_date': requests[index].get('op_date') or
+                    allocation.date,
+                    'reason': requests[index].get('reason'),
+                    'slot': slot,
+                    'state': 'op',
+                })
+                indexes_list.append(index)
+        try:
+            with self.env.cr.savepoint():
+                # create numbers the vals in place, keep them for the retry
+                outpatients = self.create([dict(vals) for vals in vals_list])
+        except ValidationError:
+            # One request is rejected, e.g. by a booking committed since the
+            # check, book the others one by one
+            outpatients, created = self.browse(), []
+            for vals, index in zip(vals_list, indexes_list):
+                try:
+                    with self.env.cr.savepoint():
+                        outpatients |= self.create(vals)
+                    created.append(index)
+                except ValidationError as error:
+                    results[index] = {'error': error.args[0]}
+            indexes_list = created
+        latest_slots = {}
+        for outpatient in outpatients:
+            latest_slots[outpatient.doctor_id] = max(
+                latest_slots.get(outpatient.doctor_id, 0), outpatient.slot)
+        for allocation, slot in latest_slots.items():
+            if slot != allocation.latest_slot:
+                allocation.latest_slot = slot
+        for index, outpatient in zip(indexes_list, outpatients):
+            results[index] = {
+                'id': outpatient.id,
+                'op_reference': outpatient.op_reference,
+                'slot': outpatient.slot,
+            }
+        return results
+
+    @api.model
+    def book_slot(self, patient_id, allocation_id, op_date=None,
+                  reason=None):
+        """
+        Book and confirm an OP in its own short transaction
+        The advisory lock of the allocation is taken on a separate cursor
+        before its transaction starts, so concurrent bookings of the same
+        allocation queue on it, and each one reads the slot committed by the
+        previous one instead of failing with a serialization error. The
+        patient limit holds.
+        Args:
+            patient_id: id of the patient
+            allocation_id: id of the doctor allocation
+            op_date: date of the OP, the date of the allocation by default
+            reason: reason of the visit
+        Returns: Dict with the id, op_reference, slot and time of the OP,
+            or with the error
+        """
+        with self.env.registry.cursor() as cr:
+            env = self.env(cr=cr)
+            allocation = env['doctor.allocation'].browse(int(allocation_id))
+            with allocation._booking_lock(cr):
+                # Fail instead of waiting forever on a row locked by the
+                # transaction of the caller
+                cr.execute("SET LOCAL lock_timeout = '10s'")
+                result = self.with_env(env).schedule_batch([{
+                    'patient_id': patient_id,
+                    'doctor_id': allocation_id,
+                    'op_date': op_date,
+                    'reason': reason,
+                }])[0]
+                cr.commit()
+        if 'slot' in result:
+            hours, minutes = divmod(round(result['slot'] * 60), 60)
+            result['time'] = f'{hours:02d}:{minutes:02d}'
+        return result
 
     @api.depends('test_ids')
     def _compute_test_count(self):
@@ -154,13 +455,39 @@ class HospitalOutpatient(models.Model):
             })
             self.create_invoice()
 
-    @api.model
-    def create_file(self, rec_id):
-        """Method for creating prescription"""
-        record = self.env['hospital.outpatient'].sudo().browse(rec_id)
+    def _create_file(self, queue=True):
+        """
+        Get the prescription PDF of the OP, queueing its rendering
+        The PDF is rendered by a background job and cached by a hash of the
+        prescription, so reprints of an unchanged prescription reuse the
+        attachment. The caller polls until the state is done. The access
+        rights of the OP are not checked, the caller must.
+        Args:
+            queue: queue the rendering when the file is missing or
+                outdated, False to only poll its state
+        Returns: Dict with the state of the file, queued, done or failed,
+            and its url once done
+        """
+        self.ensure_one()
+        record = self.sudo()
+        if (record.attachment_id and record.prescription_hash ==
+                record._get_prescription_hash()):
+            return record._get_prescription_file()
+        if not queue:
+            # An outdated file is being rendered again
+            return {'state': 'queued' if record.prescription_state in (
+                'queued', 'done') else 'failed'}
+        if record.prescription_state != 'queued':
+            record.prescription_state = 'queued'
+            self.env.ref('base_hospital_management.'
+                         'ir_cron_hospital_prescription_render')._trigger()
+        return {'state': 'queued'}
+
+    def _get_prescription_data(self):
+        """Returns the values of the prescription report"""
         p_list = []
         data = False
-        for rec in record.prescription_ids:
+        for rec in self.prescription_ids:
             p_list.append({
                 'medicine': rec.medicine_id.name,
                 'intake': rec.no_intakes,
@@ -170,26 +497,68 @@ class HospitalOutpatient(models.Model):
             })
             data = {
                 'datas': p_list,
-                'date': record.op_date,
-                'patient_name': record.patient_id.name,
-                'doctor_name': record.doctor_id.doctor_id.name,
+                'date': self.op_date,
+                'patient_name': self.patient_id.name,
+                'doctor_name': self.doctor_id.doctor_id.name,
             }
-        pdf = self.env['ir.actions.report'].sudo()._render_qweb_pdf(
-            'base_hospital_management.action_report_patient_prescription',
-            rec_id, data=data)
-        record.attachment_id = self.env['ir.attachment'].sudo().create({
-            'datas': base64.b64encode(pdf[0]),
-            'name': "Prescription",
-            'type': 'binary',
-            'res_model': 'hospital.outpatient',
-            'res_id': rec_id,
-        })
+        return data
+
+    def _get_prescription_hash(self):
+        """Returns the hash of the content of the prescription"""
+        content = json.dumps([self.id, self._get_prescription_data()],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _get_prescription_file(self):
+        """Returns the state and the url of the prescription file"""
+        if not self.attachment_id:
+            return {'state': self.prescription_state or 'failed'}
+        attachment = self.attachment_id.sudo()
+        access_token = (attachment.access_token or
+                        attachment.generate_access_token()[0])
         return {
-            'url': f'/web/content'
-                   f'/{record.attachment_id.id}?download=true&amp'
-                   f';access_token=',
+            'state': 'done',
+            'url': f'/web/content/{attachment.id}?download=true'
+                   f'&access_token={access_token}',
         }
 
+    @api.model
+    def _cron_render_prescriptions(self, batch_size=10):
+        """Renders the queued prescriptions, committing each file so that
+        the pollers get it at once"""
+        records = self.sudo().search(
+            [('prescription_state', '=', 'queued')], limit=batch_size)
+        for record in records:
+            try:
+                with self.env.cr.savepoint():
+                    record._render_prescription()
+            except Exception:
+                _logger.exception("Unable to render the prescription of %s",
+                                  record.op_reference)
+                record.invalidate_recordset()
+                record.prescription_state = 'failed'
+            self.env.cr.commit()
+        self.env['ir.cron']._notify_progress(
+            done=len(records), remaining=self.sudo().search_count(
+                [('prescription_state', '=', 'queued')]))
+
+    def _render_prescription(self):
+        """Renders the prescription PDF, replacing the content of the
+        previous attachment"""
+        self.ensure_one()
+        digest = self._get_prescription_hash()
+        pdf = self.env['ir.actions.report'].sudo()._render_qweb_pdf(
+            'base_hospital_management.action_report_patient_prescription',
+            self.id, data=self._get_prescription_data())
+        values = {'datas': base64.b64encode(pdf[0])}
+        if self.attachment_id:
+            self.attachment_id.sudo().write(values)
+        else:
+            self.attachment_id = self.env['ir.attachment'].sudo().create(
+                dict(values, name="Prescription", type='binary',
+                     res_model='hospital.outpatient', res_id=self.id))
+        self.write({'prescription_hash': digest, 'prescription_state': 'done'})
+
     @api.model
     def create_new_out_patient(self, kw):
         """Create out patient from receptionist dashboard"""
@@ -256,12 +625,22 @@ class HospitalOutpatient(models.Model):
         self.state = 'cancel'
 
     def action_confirm(self):
-        """Button action for confirming an op"""
-        if self.doctor_id.latest_slot == 0:
-            self.slot = self.doctor_id.work_from
-        else:
-            self.slot = self.doctor_id.latest_slot + self.doctor_id.time_avg
-        self.doctor_id.latest_slot = self.slot
+        """Button action for confirming an op. The allocations are locked
+        while their latest slot is read, as by schedule_batch, so backend
+        confirmations and portal bookings never share a slot, and the
+        confirmed OPs stay within the patient limit."""
+        allocations = self.doctor_id._lock_allocations()
+        confirmed = dict(self.sudo()._read_group(
+            [('doctor_id', 'in', allocations.ids),
+             ('state', 'not in', ['draft', 'cancel'])],
+            ['doctor_id'], ['__count']))
+        for record in self:
+            allocation = record.doctor_id
+            if confirmed.get(allocation, 0) >= allocation.patient_limit:
+                raise ValidationError('No slot remaining in the allocation')
+            record.slot = allocation._next_slot(allocation.latest_slot)
+            allocation.latest_slot = record.slot
+            confirmed[allocation] = confirmed.get(allocation, 0) + 1
         self.state = 'op'
 
     def create_invoice(self):
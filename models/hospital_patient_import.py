@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Import
+#    Streams patient registers from CSV or JSON lines files in chunks
+#
+################################################################################
+
+import base64
+import csv
+import io
+import json
+import logging
+import tempfile
+from datetime import datetime
+
+import psycopg2
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import email_normalize, split_every
+
+_logger = logging.getLogger(__name__)
+
+# Columns read from the files, the other ones are ignored
+IMPORT_FIELDS = ('name', 'patient_seq', 'email', 'phone', 'mobile',
+                 'date_of_birth', 'gender', 'blood_group', 'rh_type',
+                 'marital_status', 'street', 'city', 'zip', 'country_code',
+                 'barcode', 'patient_profession')
+IMPORT_SELECTION_FIELDS = ('gender', 'blood_group', 'rh_type',
+                           'marital_status')
+IMPORT_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+# Errors kept in the summary, all of them are in the error file
+IMPORT_ERROR_PREVIEW = 50
+
+
+class HospitalPatientImport(models.TransientModel):
+    """Imports patient registers in chunks, one create call and one block
+    of patient numbers per chunk.
+
+    Large migrations are better run from a shell, committing every chunk::
+
+        odoo-bin shell -d <db>
+        >>> env['hospital.patient.import']._import_file('/path/patients.csv')
+    """
+    _name = 'hospital.patient.import'
+    _description = 'Patient Import'
+
+    file = fields.Binary(string='File', attachment=True,
+                         help='CSV file with a header line, or JSON lines '
+                              'file with one patient object per line')
+    file_name = fields.Char(string='File Name', help='Name of the file')
+    file_format = fields.Selection([('csv', 'CSV'), ('jsonl', 'JSON Lines')],
+                                   string='Format', required=True,
+                                   compute='_compute_file_format', store=True,
+                                   readonly=False,
+                                   help='Format of the file')
+    separator = fields.Selection([(',', 'Comma'), (';', 'Semicolon'),
+                                  ('\t', 'Tab')], string='Separator',
+                                 default=',', required=True,
+                                 help='Separator of the CSV columns')
+    chunk_size = fields.Integer(string='Chunk Size', default=1000,
+                                required=True,
+                                help='Patients validated and created at once')
+    state = fields.Selection([('draft', 'Draft'), ('done', 'Done')],
+                             string='State', default='draft',
+                             help='State of the import')
+    processed_count = fields.Integer(string='Processed Lines', readonly=True,
+                                     help='Lines of the file read so far')
+    imported_count = fields.Integer(string='Imported Patients', readonly=True,
+                                    help='Patients created so far')
+    error_count = fields.Integer(string='Errors', readonly=True,
+                                 help='Lines which were not imported')
+    error_summary = fields.Text(string='Error Summary', readonly=True,
+                                help='First errors of the import')
+    error_file = fields.Binary(string='Error Report', attachment=True,
+                               readonly=True,
+                               help='CSV file with every rejected line')
+    error_file_name = fields.Char(string='Error Report Name',
+                                  help='Name of the error report')
+
+    @api.depends('file_name')
+    def _compute_file_format(self):
+        """Guesses the format from the file extension"""
+        for wizard in self:
+            wizard.file_format = 'jsonl' if (wizard.file_name or '').lower(
+            ).endswith(('.jsonl', '.json', '.ndjson')) else 'csv'
+
+    def action_import(self):
+        """Imports the uploaded file and shows the result"""
+        self.ensure_one()
+        if not self.env.user.has_group(
+                'base_hospital_management.base_hospital_management_group_manager'):
+            raise UserError(_("Only managers can import patients."))
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name), ('res_id', '=', self.id),
+            ('res_field', '=', 'file')], limit=1)
+        if not attachment:
+            raise UserError(_("Please upload a file to import."))
+        # The stored file is streamed, not decoded as a whole
+        if attachment.store_fname:
+            stream = open(attachment._full_path(attachment.store_fname), 'rb')
+        else:
+            stream = io.BytesIO(attachment.raw)
+        with stream:
+            self._import_stream(stream)
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    @api.model
+    def _import_file(self, path, file_format=None, separator=',',
+                     chunk_size=1000, auto_commit=True):
+        """
+        Import a patient file of the server
+        Args:
+            path: path of the file
+            file_format: csv or jsonl, guessed from the extension when not
+                given
+            separator: separator of the CSV columns
+            chunk_size: number of patients created at once
+            auto_commit: commit after every chunk, so that the progress is
+                visible and a failure keeps the imported chunks
+        Returns: The import record holding the counters and the errors
+        """
+        values = {
+            'file_name': path.rsplit('/', 1)[-1],
+            'separator': separator,
+            'chunk_size': chunk_size,
+        }
+        if file_format:
+            values['file_format'] = file_format
+        wizard = self.create(values)
+        with open(path, 'rb') as stream:
+            wizard._import_stream(stream, auto_commit=auto_commit)
+        return wizard
+
+    def _import_stream(self, stream, auto_commit=False):
+        """
+        Import the patients of a binary stream, chunk by chunk
+        Each chunk is validated at once, then created by one create call
+        which reserves its patient numbers with one query. A chunk failing
+        in the database is retried line by line to isolate the bad lines.
+        Args:
+            stream: binary file object
+            auto_commit: commit after every chunk
+        """
+        self.ensure_one()
+        wizard_id = self.id
+        partners = self.env['res.partner'].with_context(
+            tracking_disable=True, mail_create_nolog=True,
+            mail_create_nosubscribe=True, mail_notrack=True)
+        lookups = self._get_import_lookups()
+        processed = imported = error_count = 0
+        preview = []
+        with tempfile.TemporaryFile('w+', newline='') as error_file:
+            error_writer = csv.writer(error_file)
+            error_writer.writerow(['line', 'error'])
+            for chunk in split_every(self.chunk_size or 1000,
+                                     self._read_rows(stream), list):
+                vals_list, lines, errors = self._prepare_chunk(chunk,
+                                                               *lookups)
+                create_errors = self._create_chunk(partners, vals_list, lines)
+                errors += create_errors
+                processed += len(chunk)
+                imported += len(vals_list) - len(create_errors)
+                error_count += len(errors)
+                for line, message in sorted(errors):
+                    error_writer.writerow([line, message])
+                    if len(preview) < IMPORT_ERROR_PREVIEW:
+                        preview.append(_("Line %(line)s: %(message)s",
+                                         line=line, message=message))
+                self.browse(wizard_id).write({
+                    'processed_count': processed,
+                    'imported_count': imported,
+                    'error_count': error_count,
+                })
+                if auto_commit:
+                    self.env.cr.commit()
+                _logger.info("Patient import: %s lines processed, %s "
+                             "patients imported", processed, imported)
+                # Keep the memory flat whatever the size of the file
+                self.env.invalidate_all()
+            wizard = self.browse(wizard_id)
+            values = {'state': 'done',
+                      'error_summary': '\n'.join(preview)}
+            if error_count:
+                error_file.seek(0)
+                values.update({
+                    'error_file': base64.b64encode(
+                        error_file.read().encode()),
+                    'error_file_name': f'{wizard.file_name or "patients"}'
+                                       f'.errors.csv',
+                })
+            wizard.write(values)
+        if auto_commit:
+            self.env.cr.commit()
+
+    def _read_rows(self, stream):
+        """Yields the line number, the values and the parsing error of
+        every row of the file"""
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        if self.file_format == 'csv':
+            reader = csv.DictReader(text, delimiter=self.separator or ',')
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+        for line, row in enumerate(text, 1):
+            if not row.strip():
+                continue
+            try:
+                values = json.loads(row)
+            except ValueError as error:
+                yield line, {}, _("Invalid JSON: %s", error)
+                continue
+            if not isinstance(values, dict):
+                yield line, {}, _("A line must hold a JSON object.")
+                continue
+            yield line, values, None
+
+    @api.model
+    def _get_import_lookups(self):
+        """Returns the selection keys by lowercase key or label of every
+        selection field, and the country ids by ISO code"""
+        partners = self.env['res.partner']
+        selections = {}
+        for fname in IMPORT_SELECTION_FIELDS:
+            selection = partners._fields[fname]._description_selection(
+                self.env)
+            selections[fname] = {str(label).lower(): key
+                                 for key, label in selection}
+            selections[fname].update({str(key).lower(): key
+                                      for key, _label in selection})
+        countries = {country.code.upper(): country.id
+                     for country in self.env['res.country'].search([])}
+        return selections, countries
+
+    def _prepare_chunk(self, chunk, selections, countries):
+        """
+        Validate and normalize the rows of a chunk
+        Args:
+            chunk: list of (line, values, error) tuples from _read_rows
+            selections: dict of the selection keys by lowercase key or
+                label, per field
+            countries: dict of the country ids by ISO code
+        Returns: Tuple of the values to create, of their line numbers and
+            of the (line, error) tuples of the rejected rows
+        """
+        partners = self.env['res.partner']
+        # Patient numbers of the file already used, found with one query
+        numbers = {str(values.get('patient_seq') or '').strip()
+                   for _line, values, _error in chunk} - {''}
+        used_numbers = set(partners.with_context(active_test=False).search(
+            [('patient_seq', 'in', list(numbers))]).mapped(
+            'patient_seq')) if numbers else set()
+        vals_list, lines, errors = [], [], []
+        for line, values, error in chunk:
+            if error:
+                errors.append((line, error))
+                continue
+            values = {fname: str(value).strip() for fname, value in
+                      values.items()
+                      if fname in IMPORT_FIELDS and value not in (None, '')}
+            try:
+                vals = self._prepare_patient(values, selections, countries)
+                if vals.get('patient_seq') in used_numbers:
+                    raise UserError(_("The patient number %s is already "
+                                      "used.", vals['patient_seq']))
+            except UserError as error:
+                errors.append((line, error.args[0]))
+                continue
+            if vals.get('patient_seq'):
+                used_numbers.add(vals['patient_seq'])
+            vals_list.append(vals)
+            lines.append(line)
+        return vals_list, lines, errors
+
+    @api.model
+    def _prepare_patient(self, values, selections, countries):
+        """Returns the create values of a row, raises a UserError when it
+        is not valid"""
+        if not values.get('name'):
+            raise UserError(_("The name is required."))
+        vals = {fname: value for fname, value in values.items()
+                if fname not in ('country_code', 'date_of_birth', 'email')
+                and fname not in IMPORT_SELECTION_FIELDS}
+        for fname in IMPORT_SELECTION_FIELDS:
+            if fname in values:
+                key = selections[fname].get(values[fname].lower())
+                if not key:
+                    raise UserError(_("Invalid %(field)s: %(value)s",
+                                      field=fname, value=values[fname]))
+                vals[fname] = key
+        if 'date_of_birth' in values:
+            vals['date_of_birth'] = self._parse_date(values['date_of_birth'])
+        if 'email' in values:
+            vals['email'] = email_normalize(values['email'])
+            if not vals['email']:
+                raise UserError(_("Invalid email: %s", values['email']))
+        if 'country_code' in values:
+            vals['country_id'] = countries.get(values['country_code'].upper())
+            if not vals['country_id']:
+                raise UserError(_("Unknown country: %s",
+                                  values['country_code']))
+        return vals
+
+    @api.model
+    def _parse_date(self, value):
+        """Returns the date of one of the IMPORT_DATE_FORMATS"""
+        for date_format in IMPORT_DATE_FORMATS:
+            try:
+                date = datetime.strptime(value, date_format).date()
+            except ValueError:
+                continue
+            if date > fields.Date.today():
+                raise UserError(_("The birth date %s is in the future.",
+                                  value))
+            return date
+        raise UserError(_("Invalid birth date: %s", value))
+
+    @api.model
+    def _create_chunk(self, partners, vals_list, lines):
+        """Creates the patients of a chunk, line by line when the chunk
+        fails, and returns the (line, error) tuples of the failed lines"""
+        try:
+            with self.env.cr.savepoint():
+                # Copies, so that a retry reserves its numbers again
+                partners.create([dict(vals) for vals in vals_list])
+            return []
+        except (psycopg2.Error, UserError, ValueError):
+            _logger.info("Patient import: retrying a chunk line by line")
+        errors = []
+        for vals, line in zip(vals_list, lines):
+            try:
+                with self.env.cr.savepoint():
+                    partners.create(vals)
+            except (psycopg2.Error, UserError, ValueError) as error:
+                errors.append((line, str(error).strip()))
+        return errors
@@ -0,0 +1,505 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Profile
+#    Socioeconomic, gynecology and lifestyle data of the patients
+#
+################################################################################
+
+from odoo import models, fields, api
+
+# Fields of the profile shown on the patients
+PROFILE_FIELDS = ('economic_level', 'education_level', 'house_level',
+                  'work_home', 'hours_outside', 'hostile', 'income',
+                  'sanitary', 'running', 'electricity', 'gas', 'trash',
+                  'home_phone', 'tv', 'internet', 'help', 'discussion',
+                  'ability', 'time_sharing', 'affection', 'single', 'violence',
+                  'children', 'abuse', 'drug', 'withdrawal', 'in_prison',
+                  'current_prison', 'relative_prison', 'fertile',
+                  'menarche_age', 'pause', 'pause_age', 'pap', 'colposcopy',
+                  'self', 'mommography', 'last_pap', 'last_col', 'deceased',
+                  'grandiva', 'alive', 'premature', 'abortions', 'exercise',
+                  'minute', 'day_sleep', 'sleep_hrs', 'meals', 'alone',
+                  'coffee', 'cup', 'drink', 'salt', 'diet', 'smoke',
+                  'ex_smoke', 'age_start', 'cigarettes', 'passive', 'age_quit',
+                  'alcoholic', 'ex_alcoholic', 'age_start_alco', 'beer',
+                  'liquor', 'wine', 'age_quit_alcoholic', 'drugs', 'ex_drugs',
+                  'iv_user', 'age_start_drug', 'age_quit_drug', 'orientation',
+                  'age_sex', 'partners', 'anti', 'oral', 'anal', 'prostitute',
+                  'prostitute_sex', 'sex_notes', 'rider', 'helmet', 'laws',
+                  'revision', 'belt', 'safety', 'home', 'occupation')
+
+
+class HospitalPatientProfile(models.Model):
+    """Socioeconomic, gynecology, lifestyle, sexuality and safety data of a
+    patient, kept out of res.partner and only created for the patients
+    filling them"""
+    _name = 'hospital.patient.profile'
+    _description = 'Patient Profile'
+    _rec_name = 'partner_id'
+
+    partner_id = fields.Many2one('res.partner', string='Patient',
+                                 required=True, ondelete='cascade',
+                                 index=True, help='Patient of the profile')
+    economic_level = fields.Selection(selection=[
+        ('low', 'Lower Class'), ('middle', 'Middle Class'),
+        ('upper', 'Upper Class')], string="Socioeconomic",
+        help="Specify your economic status")
+    education_level = fields.Selection(selection=[
+        ('post', 'Post Graduation'), ('graduation', 'Graduation'),
+        ('pre', 'Pre Graduation')], string="Education Level",
+        help="Education status of patient")
+    house_level = fields.Selection(selection=[
+        ('good', 'Good'), ('bad', 'Bad'), ('poor', 'Poor')],
+        string="House Condition", help="Specify your house's condition")
+    work_home = fields.Boolean(string='Work At Home',
+                               help='True if you are working from home')
+    hours_outside = fields.Integer(string='Hours Stay Outside Home',
+                                   help="Specify how many hours you stay away "
+                                        "from home")
+    hostile = fields.Boolean(string='Hostile Area',
+                             help="Specify your house in a friendly "
+                                  "neighbourhood ")
+    income = fields.Monetary(string='Income', help="The in come of patient")
+    currency_id = fields.Many2one('res.currency', string='Currency',
+                                  help='Currency in which invoices and payments'
+                                       ' will be generated',
+                                  default=lambda self: self.env.user.company_id
+                                  .currency_id.id, required=True)
+    sanitary = fields.Boolean('Sanitary Sewers',
+                              help="A sewer or sewer system for carrying off "
+                                   "wastewater, waste matter from a residence,"
+                                   " business, etc")
+    running = fields.Boolean(string='Running Water',
+                             help="water that comes into a building through "
+                                  "pipes. A cabin with hot and cold running "
+                                  "water.")
+    electricity = fields.Boolean(string='Electricity',
+                                 help='True if you have electricity')
+    gas = fields.Boolean(string='Gas Supply',
+                         help='True if you have gas supply')
+    trash = fields.Boolean(string='Trash Collection',
+                           help='True if you have trash collection')
+    home_phone = fields.Boolean(string='Telephone',
+                                help='True if you have telephone')
+    tv = fields.Boolean(string='Television', help='True if you have television')
+    internet = fields.Boolean(string='Internet',
+                              help='True if you have internet')
+    help = fields.Selection([('yes', 'Yes'), ('no', 'No')],
+                            string="Family Help",
+                            help="Specify whether your family is willing "
+                                 "to help or not")
+    discussion = fields.Selection([('yes', 'Yes'), ('no', 'No')],
+                                  string="Family Discussion ",
+                                  help="Specify your family have a good "
+                                       "discussion at home ")
+    ability = fields.Selection([('very', 'Very good'), ('good', 'Good'),
+                                ('bad', 'Bad'), ('poor', 'Poor')],
+                               string="Family Ability",
+                               help="family status of the patient")
+    time_sharing = fields.Selection([('yes', 'Yes'), ('no', 'No')],
+                                    string=" Family Time Sharing ",
+                                    help="Specify your family share time "
+                                         "at home ")
+    affection = fields.Selection([('very', 'Very good'),
+                                  ('good', 'Good'),
+                                  ('bad', 'Bad'), ('poor', 'Poor')],
+                                 string="Family Affection ",
+                                 help="Specify your family's affection ")
+    single = fields.Boolean(string='Single Parent Family',
+                            help='Whether single parent family or not')
+    violence = fields.Boolean(string='Domestic Violence',
+                              help='True if you are facing any domestic '
+                                   'violence')
+    children = fields.Boolean(string='Working Children',
+                              help='Do you have working children')
+    abuse = fields.Boolean(string='Sexual Abuse',
+                           help='Do you faced any sexual abuse')
+    drug = fields.Boolean(string='Drug Addiction',
+                          help='Do you have drug addiction')
+    withdrawal = fields.Boolean(string='Withdrawal',
+                                help='Do you faced any withdrawal symptoms')
+    in_prison = fields.Boolean(string='Has Been In Prison',
+                               help='True if you had been in prison')
+    current_prison = fields.Boolean(string='Currently In Prison',
+                                    help='True if you are in prison currently')
+    relative_prison = fields.Boolean(string='Relative In Prison',
+                                     help='True if any of your relative is '
+                                          'in prison')
+    fertile = fields.Boolean(string='Fertile', help="""Capable of developing 
+                                             into a complete organism; 
+                                             fertilized. Capable of supporting 
+                                             plant life; favorable to the 
+                                             growth of crops and plants.""")
+    menarche_age = fields.Integer(string='Menarche Age', help="""The first 
+                                     menstrual period in a female adolescent""")
+    pause = fields.Boolean(string='Menopause', help="""Menopause is a point in 
+                                 time 12 months after a woman's last period""")
+    pause_age = fields.Integer(string='Menopause Age',
+                               help='Age at which menopause occurred')
+    pap = fields.Boolean(string='PAP Test',
+                         help="""
+                         A procedure in which a small brush is used to gently 
+                         remove cells from the surface of the cervix and the 
+                         area around it so they can be checked under a 
+                         microscope for cervical cancer or cell changes that
+                         may lead to cervical cancer.""")
+    colposcopy = fields.Boolean(string='Colposcopy', help=""" test to take a
+                            closer look at your cervix""")
+    self = fields.Boolean(string='Self breast examination',
+                          help="A breast self-exam for breast awareness is "
+                               "in inspection "
+                               "of your breasts that women do on your own")
+    mommography = fields.Boolean(string='Mommography',
+                                 help="Mammograms can be used to look for "
+                                      "breast cancer")
+    last_pap = fields.Date(string="Last PAP Test",
+                           help='The date on which last PAP test has been done')
+    last_col = fields.Date(string="Last Colposcopy",
+                           help='The date on which last colposcopy has been '
+                                'done')
+    deceased = fields.Boolean(string='Deceased during 1st week',
+                              help='The family member deceased during first '
+                                   'week')
+    grandiva = fields.Boolean(string='Grandiva', help='True for grandiva')
+    alive = fields.Boolean(string='Born Alive', help='Whether born alive or '
+                                                     'not')
+    premature = fields.Integer(string='Premature',
+                               help="Premature birth is birth that happens too"
+                                    "soon, before 37 weeks of pregnancy")
+    abortions = fields.Integer(string='No Of Abortions', help='Number of '
+                                                              'abortions of '
+                                                              'patient')
+    exercise = fields.Boolean(string='Exercise', help='True if patient doing '
+                                                      'exercise regularly')
+    minute = fields.Integer(string='Minute/Day', help='The duration of '
+                                                      'exercise per day')
+
+    day_sleep = fields.Boolean(string='Sleeps At Daytime', help='True if '
+                                                                'sleeps at '
+                                                                'daytime')
+    sleep_hrs = fields.Integer(string='Sleep Hours', help='Duration of sleep')
+    meals = fields.Integer(string='Meals/Day', help='Number of meals per day')
+    alone = fields.Boolean(string='Eat Alone', help='True if eats alone')
+    coffee = fields.Boolean(string='Coffee', help='True if you have a habit '
+                                                  'of drinking coffee')
+    cup = fields.Integer(string='Cups/Day', help='Number of cups of coffee '
+                                                 'per day')
+    drink = fields.Boolean(string='Soft Drink', help='True if you drinks soft '
+                                                     'drinks')
+    salt = fields.Boolean(string='Salt', help='True if you use salt')
+    diet = fields.Boolean(string='Currently On Diet', help='True if you are '
+                                                           'on diet currently')
+    smoke = fields.Boolean(string='Smoker', help='True for smoker')
+    ex_smoke = fields.Boolean(string='Ex-Smoker', help='True for ex-smoker')
+    age_start = fields.Integer(string='Age of Started Smoking',
+                               help='Age on which you started your smoking')
+    cigarettes = fields.Integer(string='Cigarettes/Day',
+                                help='Number of cigarettes per day')
+    passive = fields.Boolean(string='Passive Smoker',
+                             help='True for passive smokers')
+    age_quit = fields.Integer(string='Age of Quitting',
+                              help='Age at which you quit your smoking habit')
+    alcoholic = fields.Boolean(string='Alcoholic', help='True for alcoholics')
+    ex_alcoholic = fields.Boolean(string='Ex-Alcoholic', help='True for ex- '
+                                                              'alcoholics')
+    age_start_alco = fields.Integer(string='Age to Start Drinking',
+                                    help='Age at which you started your '
+                                         'drinking habit')
+    beer = fields.Integer(string='Beer/Day',
+                          help='Number of beers per day')
+    liquor = fields.Integer(string='Liquor/Day',
+                            help='Liquors per day')
+    wine = fields.Integer(string='Wine/Day',
+                          help='Number of wines per day')
+    age_quit_alcoholic = fields.Integer(string='Age Of Quitting',
+                                        help='Age at which you started your '
+                                             'drinking habit')
+    drugs = fields.Boolean(string='Drug User', help='True for drug users')
+    ex_drugs = fields.Boolean(string='Ex-Drug User', help='True for Ex drug '
+                                                          'user')
+    iv_user = fields.Boolean(string='IV Drug User', help='True for IV drug '
+                                                         'user')
+    age_start_drug = fields.Integer(string='Age to Start Using Drugs',
+                                    help='Age at which you started using drug')
+    age_quit_drug = fields.Integer(string='Drug Quitting Age', help='Age of '
+                                                                    'quitting '
+                                                                    'drug')
+    orientation = fields.Selection([('straight', 'Straight'),
+                                    ('homo', 'Homosexual'),
+                                    ('trans', 'Trans-Gender')],
+                                   string="Orientation")
+    age_sex = fields.Integer(string="Age of First Encounter",
+                             help='Age of first sex encounter')
+    partners = fields.Integer(string="No of Partners",
+                              help='Number of sex partners')
+    anti = fields.Selection(
+        [('pills', 'Contraceptive Pills'), ('ring', 'Contraceptive Ring'),
+         ('injection', 'Contraceptive Injection')],
+        string="Contraceptive Methods", help='Choose your contraceptive method')
+    oral = fields.Boolean(string='Oral Sex', help=("uttered by the mouth or in "
+                                                   "words"))
+    anal = fields.Boolean(string='Anal Sex', help="True if you are "
+                                                  "encountering anal sex")
+    prostitute = fields.Boolean(string='Prostitute', help='True for '
+                                                          'prostitutes')
+    prostitute_sex = fields.Boolean(string='Sex With Prostitute',
+                                    help='True if you are encountered sex '
+                                         'with prostitute')
+    sex_notes = fields.Text(string='Notes', help='Write down the notes')
+    rider = fields.Boolean(string='Motorcycle Rider', help='True for '
+                                                           'motorcycle riders')
+    helmet = fields.Boolean(string='Uses Helmet',
+                            help='True if you regularly use helmet')
+    laws = fields.Boolean(string='Obey Traffic Laws',
+                          help='True if you obey traffic rules')
+    revision = fields.Boolean(string='Car Revision', help='True if car '
+                                                          'revision is done')
+    belt = fields.Boolean(string='Seat Belt',
+                          help='True if you uses seat belt regularly')
+    safety = fields.Boolean(string='Car Child Safety',
+                            help='True if you have car child safety')
+    home = fields.Boolean(string='Home Safety', help='True for home safety')
+    occupation = fields.Char(string='Occupation', help='Your occupation')
+
+    _sql_constraints = [
+        ('partner_uniq', 'unique (partner_id)',
+         'A patient can only have one profile.'),
+    ]
+
+
+class ResPartner(models.Model):
+    """Inherited to show the profile fields on the patients"""
+    _inherit = 'res.partner'
+
+    patient_profile_ids = fields.One2many('hospital.patient.profile',
+                                          'partner_id', string='Profiles',
+                                          help='Profile of the patient')
+    patient_profile_id = fields.Many2one('hospital.patient.profile',
+                                         string='Profile',
+                                         compute='_compute_patient_profile_id',
+                                         search='_search_patient_profile_id',
+                                         help='Profile of the patient, '
+                                              'created when one of its '
+                                              'fields is set')
+    profile_currency_id = fields.Many2one(
+        related='patient_profile_id.currency_id')
+    economic_level = fields.Selection(
+        related='patient_profile_id.economic_level', readonly=False)
+    education_level = fields.Selection(
+        related='patient_profile_id.education_level', readonly=False)
+    house_level = fields.Selection(
+        related='patient_profile_id.house_level', readonly=False)
+    work_home = fields.Boolean(
+        related='patient_profile_id.work_home', readonly=False)
+    hours_outside = fields.Integer(
+        related='patient_profile_id.hours_outside', readonly=False)
+    hostile = fields.Boolean(
+        related='patient_profile_id.hostile', readonly=False)
+    income = fields.Monetary(
+        related='patient_profile_id.income', readonly=False,
+        currency_field='profile_currency_id')
+    sanitary = fields.Boolean(
+        related='patient_profile_id.sanitary', readonly=False)
+    running = fields.Boolean(
+        related='patient_profile_id.running', readonly=False)
+    electricity = fields.Boolean(
+        related='patient_profile_id.electricity', readonly=False)
+    gas = fields.Boolean(
+        related='patient_profile_id.gas', readonly=False)
+    trash = fields.Boolean(
+        related='patient_profile_id.trash', readonly=False)
+    home_phone = fields.Boolean(
+        related='patient_profile_id.home_phone', readonly=False)
+    tv = fields.Boolean(
+        related='patient_profile_id.tv', readonly=False)
+    internet = fields.Boolean(
+        related='patient_profile_id.internet', readonly=False)
+    help = fields.Selection(
+        related='patient_profile_id.help', readonly=False)
+    discussion = fields.Selection(
+        related='patient_profile_id.discussion', readonly=False)
+    ability = fields.Selection(
+        related='patient_profile_id.ability', readonly=False)
+    time_sharing = fields.Selection(
+        related='patient_profile_id.time_sharing', readonly=False)
+    affection = fields.Selection(
+        related='patient_profile_id.affection', readonly=False)
+    single = fields.Boolean(
+        related='patient_profile_id.single', readonly=False)
+    violence = fields.Boolean(
+        related='patient_profile_id.violence', readonly=False)
+    children = fields.Boolean(
+        related='patient_profile_id.children', readonly=False)
+    abuse = fields.Boolean(
+        related='patient_profile_id.abuse', readonly=False)
+    drug = fields.Boolean(
+        related='patient_profile_id.drug', readonly=False)
+    withdrawal = fields.Boolean(
+        related='patient_profile_id.withdrawal', readonly=False)
+    in_prison = fields.Boolean(
+        related='patient_profile_id.in_prison', readonly=False)
+    current_prison = fields.Boolean(
+        related='patient_profile_id.current_prison', readonly=False)
+    relative_prison = fields.Boolean(
+        related='patient_profile_id.relative_prison', readonly=False)
+    fertile = fields.Boolean(
+        related='patient_profile_id.fertile', readonly=False)
+    menarche_age = fields.Integer(
+        related='patient_profile_id.menarche_age', readonly=False)
+    pause = fields.Boolean(
+        related='patient_profile_id.pause', readonly=False)
+    pause_age = fields.Integer(
+        related='patient_profile_id.pause_age', readonly=False)
+    pap = fields.Boolean(
+        related='patient_profile_id.pap', readonly=False)
+    colposcopy = fields.Boolean(
+        related='patient_profile_id.colposcopy', readonly=False)
+    self = fields.Boolean(
+        related='patient_profile_id.self', readonly=False)
+    mommography = fields.Boolean(
+        related='patient_profile_id.mommography', readonly=False)
+    last_pap = fields.Date(
+        related='patient_profile_id.last_pap', readonly=False)
+    last_col = fields.Date(
+        related='patient_profile_id.last_col', readonly=False)
+    deceased = fields.Boolean(
+        related='patient_profile_id.deceased', readonly=False)
+    grandiva = fields.Boolean(
+        related='patient_profile_id.grandiva', readonly=False)
+    alive = fields.Boolean(
+        related='patient_profile_id.alive', readonly=False)
+    premature = fields.Integer(
+        related='patient_profile_id.premature', readonly=False)
+    abortions = fields.Integer(
+        related='patient_profile_id.abortions', readonly=False)
+    exercise = fields.Boolean(
+        related='patient_profile_id.exercise', readonly=False)
+    minute = fields.Integer(
+        related='patient_profile_id.minute', readonly=False)
+    day_sleep = fields.Boolean(
+        related='patient_profile_id.day_sleep', readonly=False)
+    sleep_hrs = fields.Integer(
+        related='patient_profile_id.sleep_hrs', readonly=False)
+    meals = fields.Integer(
+        related='patient_profile_id.meals', readonly=False)
+    alone = fields.Boolean(
+        related='patient_profile_id.alone', readonly=False)
+    coffee = fields.Boolean(
+        related='patient_profile_id.coffee', readonly=False)
+    cup = fields.Integer(
+        related='patient_profile_id.cup', readonly=False)
+    drink = fields.Boolean(
+        related='patient_profile_id.drink', readonly=False)
+    salt = fields.Boolean(
+        related='patient_profile_id.salt', readonly=False)
+    diet = fields.Boolean(
+        related='patient_profile_id.diet', readonly=False)
+    smoke = fields.Boolean(
+        related='patient_profile_id.smoke', readonly=False)
+    ex_smoke = fields.Boolean(
+        related='patient_profile_id.ex_smoke', readonly=False)
+    age_start = fields.Integer(
+        related='patient_profile_id.age_start', readonly=False)
+    cigarettes = fields.Integer(
+        related='patient_profile_id.cigarettes', readonly=False)
+    passive = fields.Boolean(
+        related='patient_profile_id.passive', readonly=False)
+    age_quit = fields.Integer(
+        related='patient_profile_id.age_quit', readonly=False)
+    alcoholic = fields.Boolean(
+        related='patient_profile_id.alcoholic', readonly=False)
+    ex_alcoholic = fields.Boolean(
+        related='patient_profile_id.ex_alcoholic', readonly=False)
+    age_start_alco = fields.Integer(
+        related='patient_profile_id.age_start_alco', readonly=False)
+    beer = fields.Integer(
+        related='patient_profile_id.beer', readonly=False)
+    liquor = fields.Integer(
+        related='patient_profile_id.liquor', readonly=False)
+    wine = fields.Integer(
+        related='patient_profile_id.wine', readonly=False)
+    age_quit_alcoholic = fields.Integer(
+        related='patient_profile_id.age_quit_alcoholic', readonly=False)
+    drugs = fields.Boolean(
+        related='patient_profile_id.drugs', readonly=False)
+    ex_drugs = fields.Boolean(
+        related='patient_profile_id.ex_drugs', readonly=False)
+    iv_user = fields.Boolean(
+        related='patient_profile_id.iv_user', readonly=False)
+    age_start_drug = fields.Integer(
+        related='patient_profile_id.age_start_drug', readonly=False)
+    age_quit_drug = fields.Integer(
+        related='patient_profile_id.age_quit_drug', readonly=False)
+    orientation = fields.Selection(
+        related='patient_profile_id.orientation', readonly=False)
+    age_sex = fields.Integer(
+        related='patient_profile_id.age_sex', readonly=False)
+    partners = fields.Integer(
+        related='patient_profile_id.partners', readonly=False)
+    anti = fields.Selection(
+        related='patient_profile_id.anti', readonly=False)
+    oral = fields.Boolean(
+        related='patient_profile_id.oral', readonly=False)
+    anal = fields.Boolean(
+        related='patient_profile_id.anal', readonly=False)
+    prostitute = fields.Boolean(
+        related='patient_profile_id.prostitute', readonly=False)
+    prostitute_sex = fields.Boolean(
+        related='patient_profile_id.prostitute_sex', readonly=False)
+    sex_notes = fields.Text(
+        related='patient_profile_id.sex_notes', readonly=False)
+    rider = fields.Boolean(
+        related='patient_profile_id.rider', readonly=False)
+    helmet = fields.Boolean(
+        related='patient_profile_id.helmet', readonly=False)
+    laws = fields.Boolean(
+        related='patient_profile_id.laws', readonly=False)
+    revision = fields.Boolean(
+        related='patient_profile_id.revision', readonly=False)
+    belt = fields.Boolean(
+        related='patient_profile_id.belt', readonly=False)
+    safety = fields.Boolean(
+        related='patient_profile_id.safety', readonly=False)
+    home = fields.Boolean(
+        related='patient_profile_id.home', readonly=False)
+    occupation = fields.Char(
+        related='patient_profile_id.occupation', readonly=False)
+
+    @api.depends('patient_profile_ids')
+    def _compute_patient_profile_id(self):
+        """Computes the profile of the patients"""
+        for partner in self:
+            partner.patient_profile_id = partner.patient_profile_ids[:1]
+
+    def _search_patient_profile_id(self, operator, value):
+        """Searches the patients by profile"""
+        return [('patient_profile_ids', operator, value)]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Creates the profiles of the new patients given a profile value"""
+        profile_vals_list = [{
+            fname: vals.pop(fname) for fname in PROFILE_FIELDS if fname in vals
+        } for vals in vals_list]
+        partners = super().create(vals_list)
+        self.env['hospital.patient.profile'].sudo().create([
+            dict(profile_vals, partner_id=partner.id)
+            for partner, profile_vals in zip(partners, profile_vals_list)
+            if any(profile_vals.values())])
+        return partners
+
+    def write(self, vals):
+        """Creates the missing profiles before a profile value is set"""
+        if any(vals.get(fname) for fname in PROFILE_FIELDS):
+            missing = self.filtered(
+                lambda partner: not partner.patient_profile_id)
+            self.env['hospital.patient.profile'].sudo().create([
+                {'partner_id': partner.id} for partner in missing])
+            missing.invalidate_recordset(['patient_profile_ids',
+                                          'patient_profile_id'])
+        return super().write(vals)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Performance Samples
+#    Profiles the RPC entry points and stores sampled measures
+#
+################################################################################
+
+import functools
+import json
+import logging
+import random
+import threading
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api, tools
+from odoo.http import request
+from odoo.modules.registry import Registry
+from odoo.tools import json_default
+
+_logger = logging.getLogger(__name__)
+
+# Samples waiting to be written, per database
+_SAMPLES = {}
+_SAMPLES_LOCK = threading.Lock()
+_SAMPLES_FLUSH_SIZE = 50
+_SAMPLES_FLUSH_DELAY = 10
+_SAMPLES_LAST_FLUSH = {}
+_SAMPLE_RATE_PARAM = 'base_hospital_management.perf_sample_rate'
+_SAMPLE_RETENTION_DAYS = 30
+
+
+def profiled(name=None):
+    """
+    Profile a model method or a controller endpoint
+    A sampled call records its wall time, SQL query count and time, rows
+    returned and response size in hospital.perf.sample. The share of
+    sampled calls is read from the base_hospital_management.perf_sample_rate
+    parameter, between 0 (default, disabled) and 1.
+    Args:
+        name: name of the samples, model.method or the function name by
+            default
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            env = self.env if isinstance(self, models.BaseModel) else (
+                request and request.env)
+            if not env or not _is_sampled(env):
+                return method(self, *args, **kwargs)
+            thread = threading.current_thread()
+            query_count = env.cr.sql_log_count
+            query_time = getattr(thread, 'query_time', 0)
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            duration = time.perf_counter() - start
+            _add_sample(env, {
+                'name': name or (f'{self._name}.{method.__name__}'
+                                 if isinstance(self, models.BaseModel)
+                                 else method.__name__),
+                'duration_ms': duration * 1000,
+                'query_count': env.cr.sql_log_count - query_count,
+                'query_time_ms': (getattr(thread, 'query_time', 0) -
+                                  query_time) * 1000,
+                'row_count': _count_rows(result),
+                'response_bytes': _response_bytes(result),
+                'user_id': env.uid,
+                'company_id': env.company.id,
+            })
+            return result
+        return wrapper
+    return decorator
+
+
+def _is_sampled(env):
+    """Whether the current call is sampled"""
+    rate = float(env['ir.config_parameter'].sudo().get_param(
+        _SAMPLE_RATE_PARAM, 0) or 0)
+    return rate > 0 and random.random() < rate
+
+
+def _count_rows(result):
+    """Number of rows of an RPC result"""
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        return sum(_count_rows(value) for value in result.values()
+                   if isinstance(value, (list, tuple, dict))) or 1
+    return 1 if result else 0
+
+
+def _response_bytes(result):
+    """Size of an RPC result once serialized"""
+    if hasattr(result, 'get_data'):
+        # Controller responses, the lazy QWeb ones are not rendered yet
+        if getattr(result, 'is_qweb', False):
+            return 0
+        return len(result.get_data() or b'')
+    try:
+        return len(json.dumps(result, default=json_default))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _add_sample(env, sample):
+    """Buffers a sample and writes the buffer in the background once it is
+    large or old enough, so that the measured transaction never writes"""
+    dbname = env.cr.dbname
+    sample['create_date'] = fields.Datetime.now()
+    with _SAMPLES_LOCK:
+        samples = _SAMPLES.setdefault(dbname, [])
+        samples.append(sample)
+        last_flush = _SAMPLES_LAST_FLUSH.setdefault(dbname, time.monotonic())
+        if (len(samples) < _SAMPLES_FLUSH_SIZE and
+                time.monotonic() - last_flush < _SAMPLES_FLUSH_DELAY):
+            return
+        _SAMPLES[dbname] = []
+        _SAMPLES_LAST_FLUSH[dbname] = time.monotonic()
+    threading.Thread(target=_write_samples, args=(dbname, samples),
+                     name='hospital.perf.sample', daemon=True).start()
+
+
+def _write_samples(dbname, samples):
+    """Writes the samples in their own transaction"""
+    try:
+        with Registry(dbname).cursor() as cr:
+            env = api.Environment(cr, api.SUPERUSER_ID, {})
+            env['hospital.perf.sample']._insert_samples(samples)
+    except Exception:
+        _logger.exception("Unable to write %s performance samples",
+                          len(samples))
+
+
+class HospitalPerfSample(models.Model):
+    """Measures of one sampled RPC call"""
+    _name = 'hospital.perf.sample'
+    _description = 'Hospital Performance Sample'
+    _order = 'create_date desc'
+
+    name = fields.Char(string='Method', required=True, index=True,
+                       readonly=True, help='Profiled method or endpoint')
+    date = fields.Date(string='Date', required=True, index=True,
+                       readonly=True, default=fields.Date.today,
+                       help='Day of the call')
+    duration_ms = fields.Float(string='Duration (ms)', readonly=True,
+                               help='Wall time of the call')
+    query_count = fields.Integer(string='Queries', readonly=True,
+                                 help='SQL queries run by the call')
+    query_time_ms = fields.Float(string='SQL Time (ms)', readonly=True,
+                                 help='Time spent in the SQL queries')
+    row_count = fields.Integer(string='Rows', readonly=True,
+                               help='Rows returned by the call')
+    response_bytes = fields.Integer(string='Response Size', readonly=True,
+                                    help='Size of the serialized response in '
+                                         'bytes')
+    user_id = fields.Many2one('res.users', string='User', readonly=True,
+                              help='User who made the call')
+    company_id = fields.Many2one('res.company', string='Company',
+                                 readonly=True, help='Company of the call')
+
+    @api.model
+    def _insert_samples(self, samples):
+        """Inserts buffered samples with a single query"""
+        columns = ('name', 'date', 'duration_ms', 'query_count',
+                   'query_time_ms', 'row_count', 'response_bytes', 'user_id',
+                   'company_id', 'create_uid', 'create_date', 'write_uid',
+                   'write_date')
+        values = [(
+            sample['name'], sample['create_date'].date(),
+            sample['duration_ms'], sample['query_count'],
+            sample['query_time_ms'], sample['row_count'],
+            sample['response_bytes'], sample['user_id'],
+            sample['company_id'], self.env.uid, sample['create_date'],
+            self.env.uid, sample['create_date'],
+        ) for sample in samples]
+        placeholders = ', '.join(['%s'] * len(values))
+        self.env.cr.execute(
+            f"INSERT INTO hospital_perf_sample ({', '.join(columns)}) "
+            f"VALUES {placeholders}", values)
+
+    @api.autovacuum
+    def _gc_samples(self):
+        """Deletes the samples older than the retention period"""
+        self.env.cr.execute(
+            "DELETE FROM hospital_perf_sample WHERE date < %s",
+            [fields.Date.today() - timedelta(days=_SAMPLE_RETENTION_DAYS)])
+
+
+class HospitalPerfStat(models.Model):
+    """Percentiles of the samples per method and day"""
+    _name = 'hospital.perf.stat'
+    _description = 'Hospital Performance Statistics'
+    _auto = False
+    _order = 'date desc, p95_ms desc'
+
+    name = fields.Char(string='Method', readonly=True,
+                       help='Profiled method or endpoint')
+    date = fields.Date(string='Date', readonly=True, help='Day of the calls')
+    sample_count = fields.Integer(string='Samples', readonly=True,
+                                  help='Number of sampled calls')
+    p50_ms = fields.Float(string='p50 (ms)', readonly=True,
+                          aggregator='max',
+                          help='Median duration of the calls')
+    p95_ms = fields.Float(string='p95 (ms)', readonly=True,
+                          aggregator='max',
+                          help='95th percentile of the duration')
+    p99_ms = fields.Float(string='p99 (ms)', readonly=True,
+                          aggregator='max',
+                          help='99th percentile of the duration')
+    avg_queries = fields.Float(string='Avg Queries', readonly=True,
+                               aggregator='avg',
+                               help='Average SQL queries per call')
+    max_queries = fields.Integer(string='Max Queries', readonly=True,
+                                 aggregator='max',
+                                 help='Most SQL queries of a call')
+    avg_query_time_ms = fields.Float(string='Avg SQL Time (ms)',
+                                     readonly=True, aggregator='avg',
+                                     help='Average SQL time per call')
+    avg_response_bytes = fields.Float(string='Avg Response Size',
+                                      readonly=True, aggregator='avg',
+                                      help='Average response size in bytes')
+
+    def init(self):
+        """Creates the view computing the percentiles"""
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT
+                    MIN(id) AS id,
+                    name,
+                    date,
+                    COUNT(*) AS sample_count,
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms)
+                        AS p50_ms,
+                    percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms)
+                        AS p95_ms,
+                    percentile_cont(0.99) WITHIN GROUP (ORDER BY duration_ms)
+                        AS p99_ms,
+                    AVG(query_count) AS avg_queries,
+                    MAX(query_count) AS max_queries,
+                    AVG(query_time_ms) AS avg_query_time_ms,
+                    AVG(response_bytes) AS avg_response_bytes
+                FROM hospital_perf_sample
+                GROUP BY name, date
+            )
+        """)
@@ -73,9 +73,11 @@ class HospitalPharmacy(models.Model):
     @api.model
     def create_sale_order(self, kwargs):
         """Creating sale order from pharmacy dashboard"""
+        duplicates = []
         if 'op' not in kwargs.keys():
-            patient_id = self.env['res.partner'].sudo().search(
-                [('name', '=', kwargs['name']), ('email', '=', kwargs['email'])])
+            patient_id, duplicates = self.env[
+                'res.partner'].sudo()._find_registered_patient({
+                    'name': kwargs['name'], 'email': kwargs['email']})
         else:
             patient_id = self.env['hospital.outpatient'].sudo().search(
                 [('op_reference', '=', kwargs['op'])]).patient_id
@@ -84,6 +86,9 @@ class HospitalPharmacy(models.Model):
                 'name': kwargs['name'],
                 'email': kwargs['email'],
             })
+            self.env['hospital.patient.duplicate'].sudo()._queue([
+                (duplicate.id, patient_id.id, score, [])
+                for duplicate, score in duplicates])
         pharmacy_sale_order = self.env['sale.order'].sudo().create({
             'partner_id': patient_id.id,
         })
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#    Author: Sreerag PM (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU AFFERO
+#    GENERAL PUBLIC LICENSE (AGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU AFFERO GENERAL PUBLIC LICENSE (AGPL v3) for more details.
+#
+#    You should have received a copy of the GNU AFFERO GENERAL PUBLIC LICENSE
+#    (AGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+import logging
+from contextlib import contextmanager
+from odoo import api, fields, models
+from odoo.tools import SQL, float_is_zero
+from .res_partner import NON_PATIENT_SEQ
+
+_logger = logging.getLogger(__name__)
+
+
+class HospitalRevenueLedger(models.Model):
+    """Class holding the daily pharmacy revenue and purchase cost of a
+    company"""
+    _name = 'hospital.revenue.ledger'
+    _inherit = 'hospital.daily.counter'
+    _description = 'Hospital Revenue Ledger'
+
+    _counter_fields = ('revenue_amount', 'revenue_count', 'cost_amount',
+                       'cost_count')
+    _counter_source_models = ('sale.order', 'purchase.order')
+
+    revenue_amount = fields.Float(string='Revenue',
+                                  help='Total of the patient sale orders '
+                                       'confirmed on this day')
+    revenue_count = fields.Integer(string='Sale Orders',
+                                   help='Number of patient sale orders '
+                                        'confirmed on this day')
+    cost_amount = fields.Float(string='Cost',
+                               help='Total of the purchase orders confirmed '
+                                    'on this day')
+    cost_count = fields.Integer(string='Purchase Orders',
+                                help='Number of purchase orders confirmed on '
+                                     'this day')
+
+    @api.model
+    def get_totals(self):
+        """Returns the revenue and cost totals of the allowed companies,
+        summed over the ledger rows"""
+        revenue_amount, revenue_count, cost_amount = self.sudo()._read_group(
+            [('company_id', 'in', self.env.companies.ids)],
+            aggregates=['revenue_amount:sum', 'revenue_count:sum',
+                        'cost_amount:sum'])[0]
+        return {
+            'revenue_amount': revenue_amount or 0.0,
+            'revenue_count': revenue_count or 0,
+            'cost_amount': cost_amount or 0.0,
+        }
+
+    @api.model
+    def _source_counters(self):
+        """Returns the counters of the confirmed orders, aggregated in SQL
+        in the format of _daily_counter_contributions"""
+        self.env['sale.order'].flush_model(['state', 'date_order',
+                                            'company_id', 'partner_id',
+                                            'amount_total'])
+        self.env['purchase.order'].flush_model(['state', 'date_approve',
+                                                'date_order', 'company_id',
+                                                'amount_total'])
+        self.env['res.partner'].flush_model(['patient_seq'])
+        self.env.cr.execute(SQL("""
+            SELECT company_id, day,
+                   SUM(revenue_amount), SUM(revenue_count),
+                   SUM(cost_amount), SUM(cost_count)
+            FROM (
+                SELECT so.company_id, so.date_order::date AS day,
+                       so.amount_total AS revenue_amount,
+                       1 AS revenue_count, 0 AS cost_amount, 0 AS cost_count
+                FROM sale_order so
+                JOIN res_partner partner ON partner.id = so.partner_id
+                WHERE so.state IN ('sale', 'done')
+                  AND (partner.patient_seq IS NULL
+                       OR partner.patient_seq NOT IN %(non_patient)s)
+                UNION ALL
+                SELECT po.company_id,
+                       COALESCE(po.date_approve, po.date_order)::date,
+                       0, 0, po.amount_total, 1
+                FROM purchase_order po
+                WHERE po.state IN ('purchase', 'done')
+            ) source
+            GROUP BY company_id, day
+        """, non_patient=NON_PATIENT_SEQ))
+        return {
+            (company_id, day): dict(zip(self._counter_fields, (
+                float(revenue_amount), revenue_count,
+                float(cost_amount), cost_count)))
+            for company_id, day, revenue_amount, revenue_count, cost_amount,
+            cost_count in self.env.cr.fetchall()
+        }
+
+    @api.model
+    def _check_drift(self):
+        """Compares the rows with the counters aggregated from the orders
+        and corrects the days that drifted, e.g. after changes made in SQL
+        or by modules bypassing the hooks. Returns the corrected keys."""
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            "SELECT company_id, date, %s FROM %s GROUP BY company_id, date",
+            SQL(', ').join(SQL("SUM(%s)", SQL.identifier(column))
+                           for column in self._counter_fields),
+            SQL.identifier(self._table)))
+        ledger = {
+            (company_id, day): dict(zip(self._counter_fields, counters))
+            for company_id, day, *counters in self.env.cr.fetchall()
+        }
+        expected = self._source_counters()
+        drifts = {}
+        for key in set(ledger) | set(expected):
+            new, old = expected.get(key, {}), ledger.get(key, {})
+            drift = {column: new.get(column, 0) - old.get(column, 0)
+                     for column in self._counter_fields}
+            if any(not float_is_zero(value, precision_digits=2)
+                   for value in drift.values()):
+                drifts[key] = drift
+        if drifts:
+            _logger.warning('Correcting the revenue ledger of %s drifted '
+                            'days', len(drifts))
+            self._apply_contributions(drifts)
+        return list(drifts)
+
+    @api.model
+    def _rebuild(self, commit=False):
+        """Recomputes the rows from a SQL aggregate of the orders instead
+        of reading every order through the ORM"""
+        self._check_drift()
+
+    @api.model
+    def _cron_check_drift(self):
+        """Scheduled action merging the rows of each day and correcting
+        the drifted ones"""
+        self._compact()
+        self._check_drift()
+
+
+class SaleOrder(models.Model):
+    """Inherited to feed the revenue of the ledger on confirmation"""
+    _name = 'sale.order'
+    _inherit = ['sale.order', 'hospital.daily.counter.mixin']
+
+    _daily_counter_model = 'hospital.revenue.ledger'
+    _daily_counter_fields = ('state', 'date_order', 'company_id',
+                             'partner_id')
+
+    def _daily_counter_contributions(self):
+        """Confirmed patient sale orders per day"""
+        contributions = super()._daily_counter_contributions()
+        for order in self.sudo():
+            if (order.state not in ('sale', 'done') or
+                    order.partner_id.patient_seq in NON_PATIENT_SEQ):
+                continue
+            key = (self._daily_counter_company_id(order.company_id),
+                   order.date_order.date())
+            contributions[key]['revenue_amount'] += order.amount_total
+            contributions[key]['revenue_count'] += 1
+        return contributions
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """The lines created along with the orders are counted by the
+        order hook"""
+        orders = super(SaleOrder, self.with_context(
+            hospital_order_counted=True)).create(vals_list)
+        return orders.with_env(self.env)
+
+    def write(self, vals):
+        """The lines written along with the counted fields are counted by
+        the order hook"""
+        if set(vals) & set(self._daily_counter_fields):
+            return super(SaleOrder, self.with_context(
+                hospital_order_counted=True)).write(vals)
+        return super().write(vals)
+
+    @contextmanager
+    def _track_daily_counters(self):
+        """Applies the change of contributions of the orders caused by the
+        wrapped block, e.g. an edit of their lines changing amount_total"""
+        if self.env.context.get('hospital_order_counted'):
+            yield
+            return
+        before = self._daily_counter_contributions()
+        yield
+        self.env[self._daily_counter_model]._apply_contributions(
+            self._daily_counter_contributions(), before,
+            source_model=self._name)
+
+
+class SaleOrderLine(models.Model):
+    """Inherited to feed the ledger with the line edits of confirmed
+    orders, which change their amount_total without writing on them"""
+    _inherit = 'sale.order.line'
+
+    # Fields whose change can alter the amount_total of the order
+    _daily_counter_fields = ('order_id', 'product_id', 'product_uom_qty',
+                             'product_uom', 'price_unit', 'discount',
+                             'tax_id', 'display_type')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Applies the new amount of the orders"""
+        orders = self.env['sale.order'].browse(
+            {vals['order_id'] for vals in vals_list if vals.get('order_id')})
+        with orders._track_daily_counters():
+            return super().create(vals_list)
+
+    def write(self, vals):
+        """Applies the new amount of the orders"""
+        if not set(vals) & set(self._daily_counter_fields):
+            return super().write(vals)
+        orders = self.order_id
+        if vals.get('order_id'):
+            orders |= orders.browse(vals['order_id'])
+        with orders._track_daily_counters():
+            return super().write(vals)
+
+    def unlink(self):
+        """Applies the new amount of the orders"""
+        with self.order_id._track_daily_counters():
+            return super().unlink()
+
+
+class PurchaseOrder(models.Model):
+    """Inherited to feed the cost of the ledger on confirmation"""
+    _name = 'purchase.order'
+    _inherit = ['purchase.order', 'hospital.daily.counter.mixin']
+
+    _daily_counter_model = 'hospital.revenue.ledger'
+    _daily_counter_fields = ('state', 'date_approve', 'date_order',
+                             'company_id')
+
+    def _daily_counter_contributions(self):
+        """Confirmed purchase orders per day"""
+        contributions = super()._daily_counter_contributions()
+        for order in self.sudo():
+            if order.state not in ('purchase', 'done'):
+                continue
+            key = (self._daily_counter_company_id(order.company_id),
+                   (order.date_approve or order.date_order).date())
+            contributions[key]['cost_amount'] += order.amount_total
+            contributions[key]['cost_count'] += 1
+        return contributions
@@ -35,7 +35,7 @@ class HospitalVaccination(models.Model):
     patient_id = fields.Many2one('res.partner',
                                  domain=[('patient_seq', 'not in',
                                           ['New', 'Employee', 'User'])],
-                                 required=True,
+                                 required=True, index=True,
                                  string="Patient", help='Choose the patient')
     vaccine_date = fields.Date(string='Vaccination Date', help='Date of '
                                                                'vaccination',
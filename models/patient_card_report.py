@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Card Report
+#    Values of the patient cards, printed one by one or in batches
+#
+################################################################################
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import models, fields, api
+
+
+class PatientCardReport(models.AbstractModel):
+    """Values of the patient card report"""
+    _name = 'report.base_hospital_management.patient_card_report'
+    _description = 'Patient Card Report'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        """
+        Get the values of the cards of the patients
+        The company and the current date are read once for the batch, and
+        the patients are read together, so a batch of cards costs the same
+        queries as a single one.
+        Args:
+            docids: ids of the patients
+            data: unused, the cards only depend on the patients
+        Returns: Dict with the patients and the values of their cards
+        """
+        patients = self.env['res.partner'].sudo().browse(docids)
+        patients._ensure_patient_barcodes()
+        company = self.env.company
+        today = fields.Date.today()
+        cards = []
+        for patient in patients:
+            cards.append({
+                'name': patient.name,
+                'code': patient.patient_seq,
+                'age': relativedelta(today, patient.date_of_birth).years
+                if patient.date_of_birth else 0,
+                'gender': (patient.gender or '').capitalize(),
+                'dob': patient.date_of_birth,
+                'blood': (patient.blood_group or '').capitalize() + (
+                    patient.rh_type or ''),
+                'street': patient.street,
+                'street2': patient.street2,
+                'state': patient.state_id.name,
+                'country': patient.country_id.name,
+                'city': patient.city,
+                'phone': patient.phone,
+                'image': patient.image_256 and patient.image_256.decode(),
+                'barcode': patient.barcode_png and
+                patient.barcode_png.decode(),
+            })
+        return {
+            'doc_ids': docids,
+            'doc_model': 'res.partner',
+            'docs': patients,
+            'cards': cards,
+            'company': company,
+        }
@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Deduplication
+#    Blocking keys, duplicate scoring and the merge queue of the patients
+#
+################################################################################
+
+import itertools
+import logging
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools.sql import column_exists, create_column
+from .res_partner import NON_PATIENT_SEQ, normalize_phone
+
+_logger = logging.getLogger(__name__)
+
+# Score from which two patients are queued for review
+DEDUP_MIN_SCORE = 0.6
+DEDUP_PHONE_SUFFIX = 4
+# Larger blocks are split on the full key to keep the pairs bounded
+DEDUP_MAX_BLOCK = 200
+SOUNDEX_CODES = dict(itertools.chain.from_iterable(
+    ((letter, str(code)) for letter in letters) for code, letters in enumerate(
+        ('aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r'))))
+
+
+def normalize_name(name):
+    """Returns the lowercase ASCII words of a name, sorted so that the order
+    of the first and last names does not matter"""
+    name = unicodedata.normalize('NFKD', name or '').encode(
+        'ascii', 'ignore').decode().lower()
+    return sorted(re.findall('[a-z]+', name))
+
+
+def soundex(word):
+    """Returns the Soundex code of a lowercase ASCII word"""
+    codes = [SOUNDEX_CODES.get(letter, '0') for letter in word]
+    result = [word[0].upper()]
+    for previous, code in zip(codes, codes[1:]):
+        if code != '0' and code != previous:
+            result.append(code)
+    return ''.join(result)[:4].ljust(4, '0')
+
+
+def phonetic_key(name):
+    """Returns the phonetic key of a name, False when it has no word"""
+    words = [word for word in normalize_name(name) if len(word) > 1]
+    return words and ' '.join(sorted(soundex(word) for word in words))
+
+
+def blocking_key(name_key, date_of_birth, phone):
+    """Returns the blocking key of a patient from the phonetic key of its
+    name, its birth date and its normalized phone"""
+    return name_key and '|'.join((
+        name_key,
+        str(date_of_birth.year) if date_of_birth else '',
+        (phone or '')[-DEDUP_PHONE_SUFFIX:],
+    ))
+
+
+class ResPartner(models.Model):
+    """Inherited to find the duplicate patients"""
+    _inherit = 'res.partner'
+
+    dedup_name_key = fields.Char(string='Phonetic Name',
+                                 compute='_compute_dedup_keys', store=True,
+                                 index='btree_not_null', copy=False,
+                                 help='Phonetic key of the name, patients '
+                                      'sharing it are compared for '
+                                      'duplicates')
+    dedup_key = fields.Char(string='Blocking Key',
+                            compute='_compute_dedup_keys', store=True,
+                            index='btree_not_null', copy=False,
+                            help='Phonetic name, birth year and phone '
+                                 'suffix of the patient')
+
+    def _auto_init(self):
+        """Creates the blocking key columns empty, they are filled in
+        chunks by the duplicate detection job instead of at install"""
+        for column in ('dedup_name_key', 'dedup_key'):
+            if not column_exists(self.env.cr, 'res_partner', column):
+                create_column(self.env.cr, 'res_partner', column, 'varchar')
+        return super()._auto_init()
+
+    @api.depends('name', 'date_of_birth', 'phone_normalized')
+    def _compute_dedup_keys(self):
+        """Computes the blocking keys of the patients"""
+        for partner in self:
+            name_key = phonetic_key(partner.name)
+            partner.dedup_name_key = name_key
+            partner.dedup_key = blocking_key(
+                name_key, partner.date_of_birth, partner.phone_normalized)
+
+    @api.model
+    def _dedup_score(self, values, other):
+        """
+        Score the likelihood of two patients being the same person
+        Args:
+            values: dict with the name, date_of_birth, phone and email of
+                the first patient
+            other: dict with the same keys for the second patient
+        Returns: Tuple of the score, between 0 and 1, and of the matching
+            criteria
+        """
+        score = SequenceMatcher(
+            None, ' '.join(normalize_name(values.get('name'))),
+            ' '.join(normalize_name(other.get('name')))).ratio() * 0.5
+        reasons = [_("Name")] if score >= 0.45 else []
+        dob, other_dob = values.get('date_of_birth'), other.get(
+            'date_of_birth')
+        if dob and other_dob:
+            if dob == other_dob:
+                score += 0.25
+                reasons.append(_("Birth date"))
+            elif dob.year == other_dob.year:
+                score += 0.1
+            else:
+                score -= 0.2
+        phone, other_phone = values.get('phone'), other.get('phone')
+        if phone and other_phone:
+            if phone == other_phone:
+                score += 0.4
+                reasons.append(_("Phone"))
+            elif phone[-DEDUP_PHONE_SUFFIX:] == other_phone[
+                                                -DEDUP_PHONE_SUFFIX:]:
+                score += 0.1
+        email, other_email = values.get('email'), other.get('email')
+        if email and other_email and email.lower() == other_email.lower():
+            score += 0.4
+            reasons.append(_("Email"))
+        return max(0.0, min(1.0, score)), reasons
+
+    @api.model
+    def _dedup_values(self, partners):
+        """Returns the scored values of the partners, read at once"""
+        return {
+            partner['id']: {
+                'name': partner['name'],
+                'date_of_birth': partner['date_of_birth'],
+                'phone': partner['phone_normalized'],
+                'email': partner['email'],
+            } for partner in partners.read(
+                ['name', 'date_of_birth', 'phone_normalized', 'email'],
+                load=False)
+        }
+
+    @api.model
+    def _find_duplicate_patients(self, values, min_score=DEDUP_MIN_SCORE,
+                                 limit=5):
+        """
+        Find the patients that may be the person being registered
+        The candidates share the blocking key of the person, then the
+        phonetic key of its name, each found with an indexed equality, and
+        are then scored. The blocking key comes first so that the closest
+        candidates are kept when a common name exceeds DEDUP_MAX_BLOCK.
+        Args:
+            values: dict with the name and optionally the date_of_birth,
+                phone and email of the person
+            min_score: minimum score of the returned patients
+            limit: maximum number of patients
+        Returns: List of (patient, score) tuples, best first
+        """
+        name_key = phonetic_key(values.get('name'))
+        if not name_key:
+            return []
+        values = dict(values, phone=normalize_phone(
+            values.get('phone'), self.env.company.country_id))
+        if values.get('date_of_birth'):
+            values['date_of_birth'] = fields.Date.to_date(
+                values['date_of_birth'])
+        candidates = self.search([
+            ('dedup_key', '=', blocking_key(
+                name_key, values.get('date_of_birth'), values['phone'])),
+            ('patient_seq', 'not in', NON_PATIENT_SEQ),
+        ], limit=DEDUP_MAX_BLOCK, order='id')
+        if len(candidates) < DEDUP_MAX_BLOCK:
+            candidates |= self.search([
+                ('dedup_name_key', '=', name_key),
+                ('id', 'not in', candidates.ids),
+                ('patient_seq', 'not in', NON_PATIENT_SEQ),
+            ], limit=DEDUP_MAX_BLOCK - len(candidates), order='id')
+        scores = []
+        for partner_id, other in self._dedup_values(candidates).items():
+            score = self._dedup_score(values, other)[0]
+            if score >= min_score:
+                scores.append((self.browse(partner_id), score))
+        scores.sort(key=lambda item: -item[1])
+        return scores[:limit]
+
+    @api.model
+    def _find_registered_patient(self, values):
+        """
+        Find the patient a registration is with certainty
+        A patient is only reused on its wristband barcode or patient number,
+        or when both the normalized name and the birth date are the same.
+        Similar names sharing a phone or a birth date, as twins or relatives
+        do, are only returned as possible duplicates.
+        Args:
+            values: dict with the name and optionally the date_of_birth,
+                phone, email, barcode and patient_seq of the person
+        Returns: Tuple of the patient, empty when not registered, and of
+            the (patient, score) possible duplicates to queue once the
+            patient is created
+        """
+        for fname in ('barcode', 'patient_seq'):
+            if values.get(fname) and values[fname] not in NON_PATIENT_SEQ:
+                patient = self.search([
+                    (fname, '=', values[fname]),
+                    ('patient_seq', 'not in', NON_PATIENT_SEQ),
+                ], limit=1)
+                if patient:
+                    return patient, []
+        name = normalize_name(values.get('name'))
+        name_key = phonetic_key(values.get('name'))
+        if name_key and values.get('date_of_birth'):
+            for patient in self.search([
+                ('dedup_name_key', '=', name_key),
+                ('date_of_birth', '=', fields.Date.to_date(
+                    values['date_of_birth'])),
+                ('patient_seq', 'not in', NON_PATIENT_SEQ),
+            ], order='id'):
+                if normalize_name(patient.name) == name:
+                    return patient, []
+        return self.browse(), self._find_duplicate_patients(values)
+
+    @api.model
+    def register_patient(self, vals):
+        """
+        Register a patient from the reception dashboard
+        The patient already registered is returned instead of a new one,
+        and the possible duplicates of a new patient are queued for review.
+        Args:
+            vals: values of the new patient
+        Returns: Dict with the id of the patient and whether it already
+            existed
+        """
+        patient, duplicates = self.sudo()._find_registered_patient(vals)
+        if patient:
+            return {'id': patient.id, 'existing': True}
+        patient = self.create(vals)
+        self.env['hospital.patient.duplicate'].sudo()._queue([
+            (duplicate.id, patient.id, score, [])
+            for duplicate, score in duplicates])
+        return {'id': patient.id, 'existing': False}
+
+    @api.model
+    def _cron_find_duplicates(self, chunk_size=1000, auto_commit=False):
+        """
+        Score the patients sharing a blocking key and queue the likely
+        duplicates for review
+        The blocking keys missing since install are computed first, then
+        the blocks are walked in chunks ordered by key. Blocks larger than
+        DEDUP_MAX_BLOCK are split on the full blocking key.
+        Args:
+            chunk_size: number of partners or blocks per chunk
+            auto_commit: commit after every chunk, for the cron
+        Returns: Number of pairs queued
+        """
+        partners = self.sudo().with_context(active_test=False)
+        last_id = 0
+        while True:
+            # Partners whose name has no letter keep an empty key, the
+            # chunks are walked by id so they are not read again
+            missing = partners.search([
+                ('id', '>', last_id), ('dedup_name_key', '=', False),
+                ('name', '!=', False),
+                ('patient_seq', 'not in', NON_PATIENT_SEQ),
+            ], limit=chunk_size, order='id')
+            if not missing:
+                break
+            last_id = missing[-1].id
+            for fname in ('dedup_name_key', 'dedup_key'):
+                self.env.add_to_compute(partners._fields[fname], missing)
+            missing._recompute_recordset(['dedup_name_key', 'dedup_key'])
+            partners.env.flush_all()
+            if auto_commit:
+                self.env.cr.commit()
+            partners.env.invalidate_all()
+        queued = 0
+        last_key = ''
+        while True:
+            self.env.cr.execute("""
+                SELECT dedup_name_key, array_agg(id ORDER BY id)
+                FROM res_partner
+                WHERE dedup_name_key > %s AND active
+                  AND patient_seq NOT IN %s
+                GROUP BY dedup_name_key
+                HAVING count(*) > 1
+                ORDER BY dedup_name_key
+                LIMIT %s
+            """, [last_key, NON_PATIENT_SEQ, chunk_size])
+            blocks = self.env.cr.fetchall()
+            if not blocks:
+                break
+            last_key = blocks[-1][0]
+            queued += self._queue_duplicate_blocks(
+                [partner_ids for _key, partner_ids in blocks])
+            if auto_commit:
+                self.env.cr.commit()
+            partners.env.invalidate_all()
+        _logger.info("Queued %s duplicate patient pairs", queued)
+        return queued
+
+    @api.model
+    def _queue_duplicate_blocks(self, blocks):
+        """Scores the pairs of every block and queues the likely
+        duplicates, returns the number of new pairs"""
+        partners = self.sudo().browse(itertools.chain.from_iterable(blocks))
+        values = self._dedup_values(partners)
+        keys = dict(zip(partners.ids, partners.mapped('dedup_key')))
+        pairs = []
+        for block in blocks:
+            if len(block) > DEDUP_MAX_BLOCK:
+                sub_blocks = {}
+                for partner_id in block:
+                    sub_blocks.setdefault(keys[partner_id], []).append(
+                        partner_id)
+                block_list = [ids[:DEDUP_MAX_BLOCK]
+                              for ids in sub_blocks.values()]
+            else:
+                block_list = [block]
+            for ids in block_list:
+                for first, second in itertools.combinations(sorted(ids), 2):
+                    score, reasons = self._dedup_score(values[first],
+                                                       values[second])
+                    if score >= DEDUP_MIN_SCORE:
+                        pairs.append((first, second, score, reasons))
+        return self.env['hospital.patient.duplicate']._queue(pairs)
+
+
+class HospitalPatientDuplicate(models.Model):
+    """Pair of patients which may be the same person, waiting for a
+    review"""
+    _name = 'hospital.patient.duplicate'
+    _description = 'Patient Duplicate'
+    _order = 'score desc, id'
+    _rec_name = 'patient_id'
+
+    patient_id = fields.Many2one('res.partner', string='Patient',
+                                 required=True, ondelete='cascade',
+                                 index=True, readonly=True,
+                                 help='Oldest patient of the pair, kept '
+                                      'when merging')
+    duplicate_id = fields.Many2one('res.partner', string='Duplicate',
+                                   required=True, ondelete='cascade',
+                                   index=True, readonly=True,
+                                   help='Patient merged into the first one')
+    score = fields.Float(string='Score', readonly=True, digits=(3, 2),
+                         help='Likelihood of the patients being the same '
+                              'person, between 0 and 1')
+    reasons = fields.Char(string='Matching', readonly=True,
+                         help='Matching criteria of the patients')
+    state = fields.Selection([('new', 'To Review'), ('merged', 'Merged'),
+                              ('ignored', 'Not a Duplicate')],
+                             string='State', default='new', required=True,
+                             index=True, readonly=True,
+                             help='Review state of the pair')
+
+    _sql_constraints = [
+        ('patient_duplicate_uniq', 'unique (patient_id, duplicate_id)',
+         'A pair of patients can only be queued once.'),
+    ]
+
+    @api.model
+    def _queue(self, pairs):
+        """
+        Queue pairs of patients, the pairs already queued are skipped
+        Args:
+            pairs: list of (patient id, duplicate id, score, reasons)
+                tuples
+        Returns: Number of pairs queued
+        """
+        pairs = [(min(first, second), max(first, second), score, reasons)
+                 for first, second, score, reasons in pairs
+                 if first != second]
+        if not pairs:
+            return 0
+        self.env.cr.execute(f"""
+            INSERT INTO hospital_patient_duplicate
+                (patient_id, duplicate_id, score, reasons, state, create_uid,
+                 create_date, write_uid, write_date)
+            VALUES {', '.join(['%s'] * len(pairs))}
+            ON CONFLICT (patient_id, duplicate_id) DO NOTHING
+        """, [(first, second, round(score, 2), ', '.join(reasons), 'new',
+               self.env.uid, fields.Datetime.now(), self.env.uid,
+               fields.Datetime.now())
+              for first, second, score, reasons in pairs])
+        return self.env.cr.rowcount
+
+    def action_merge(self):
+        """Merges the duplicates into their patients"""
+        if not self.env.user.has_group(
+                'base_hospital_management.base_hospital_management_group_manager'):
+            raise UserError(_("Only managers can merge patients."))
+        merge = self.env['base.partner.merge.automatic.wizard']
+        for pair in self:
+            # The merge moves or deletes the other pairs of the duplicate
+            pair = pair.exists()
+            if not pair or pair.state != 'new':
+                continue
+            patient, duplicate = pair.patient_id, pair.duplicate_id
+            pair.state = 'merged'
+            pair.flush_recordset()
+            if patient != duplicate:
+                merge._merge([patient.id, duplicate.id], patient,
+                             extra_checks=False)
+                self.env.invalidate_all()
+
+    def action_ignore(self):
+        """Marks the pairs as different persons"""
+        self.write({'state': 'ignored'})
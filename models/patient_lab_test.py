@@ -33,7 +33,8 @@ class PatientLabTest(models.Model):
     patient_id = fields.Many2one('res.partner', string="Patient",
                                  domain=[('patient_seq', 'not in',
                                           ['New', 'Employee', 'User'])],
-                                 required=True, help='Choose the patient')
+                                 required=True, index=True,
+                                 help='Choose the patient')
     patient_type = fields.Selection(selection=[
         ('inpatient', 'Inpatient'), ('outpatient', 'Outpatient')
     ], related='test_id.patient_type', string='Type',
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Patient Timeline
+#    Medical history of a patient as one chronological stream
+#
+################################################################################
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+from .hospital_perf_sample import profiled
+
+TIMELINE_KINDS = ('outpatient', 'inpatient', 'lab_test', 'vaccination',
+                  'prescription')
+TIMELINE_MODELS = {
+    'outpatient': 'hospital.outpatient',
+    'inpatient': 'hospital.inpatient',
+    'lab_test': 'patient.lab.test',
+    'vaccination': 'hospital.vaccination',
+    'prescription': 'prescription.line',
+}
+TIMELINE_MAX_LIMIT = 200
+
+
+class ResPartner(models.Model):
+    """Inherited to serve the timeline of the patients"""
+    _inherit = 'res.partner'
+
+    @api.model
+    @profiled()
+    def get_patient_timeline(self, patient_id, limit=50, cursor=None,
+                             kinds=None):
+        """
+        Get one page of the medical history of a patient, most recent first
+        Visits, stays, lab tests, vaccinations and prescriptions are merged
+        by a single UNION query. Pages are chained with a keyset cursor on
+        (date, kind, id), and the doctor, product and test names of a page
+        are read in one query per model.
+        Args:
+            patient_id: id of the patient
+            limit: maximum number of events, at most TIMELINE_MAX_LIMIT
+            cursor: next_cursor of the previous page, None for the first one
+            kinds: kinds of events to return, all of TIMELINE_KINDS when
+                not given
+        Returns: Dict with the events and the cursor of the next page,
+            False on the last page
+        """
+        patient = self.browse(patient_id)
+        patient.check_access('read')
+        limit = max(1, min(int(limit or 1), TIMELINE_MAX_LIMIT))
+        # Only the kinds the user is allowed to read
+        kinds = [kind for kind in kinds or TIMELINE_KINDS
+                 if kind in TIMELINE_MODELS and
+                 self.env[TIMELINE_MODELS[kind]].has_access('read')]
+        if not kinds:
+            return {'events': [], 'next_cursor': False}
+        after = SQL()
+        if cursor:
+            date, kind, res_id = self._decode_cursor(
+                cursor, fields.Datetime.to_datetime, str, int)
+            after = SQL("AND (event_date, kind, res_id) < (%s, %s, %s)",
+                        date, kind, res_id)
+        queries = self._get_timeline_queries(patient.id)
+        self.env.flush_all()
+        # Each branch is limited too, so a page never sorts the whole history
+        self.env.cr.execute(SQL("""
+            SELECT kind, res_id, event_date, reference, state, employee_id,
+                   product_id, test_line_id
+            FROM (%s) AS timeline
+            ORDER BY event_date DESC, kind DESC, res_id DESC
+            LIMIT %s
+        """, SQL(" UNION ALL ").join(SQL("""
+            (SELECT * FROM (%s) AS branch
+             WHERE event_date IS NOT NULL %s
+             ORDER BY event_date DESC, kind DESC, res_id DESC
+             LIMIT %s)
+        """, queries[kind], after, limit + 1) for kind in kinds), limit + 1))
+        rows = self.env.cr.dictfetchall()
+        next_cursor = False
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor([
+                fields.Datetime.to_string(rows[-1]['event_date']),
+                rows[-1]['kind'], rows[-1]['res_id']])
+        return {'events': self._format_timeline_events(rows),
+                'next_cursor': next_cursor}
+
+    @api.model
+    def _get_timeline_queries(self, patient_id):
+        """Returns the query of every kind of event of the patient. They all
+        select the same columns, event_date being truncated to the second
+        so that it can be held by a cursor."""
+        return {
+            'outpatient': SQL("""
+                SELECT 'outpatient' AS kind, op.id AS res_id,
+                       date_trunc('second', COALESCE(op.op_date::timestamp,
+                                                     op.create_date))
+                           AS event_date,
+                       op.op_reference AS reference, op.state AS state,
+                       allocation.doctor_id AS employee_id,
+                       NULL::integer AS product_id,
+                       NULL::integer AS test_line_id
+                FROM hospital_outpatient op
+                LEFT JOIN doctor_allocation allocation
+                    ON allocation.id = op.doctor_id
+                WHERE op.patient_id = %s AND op.active
+            """, patient_id),
+            'inpatient': SQL("""
+                SELECT 'inpatient' AS kind, inpatient.id AS res_id,
+                       date_trunc('second', COALESCE(
+                           inpatient.hosp_date::timestamp,
+                           inpatient.create_date)) AS event_date,
+                       inpatient.name AS reference, inpatient.state AS state,
+                       inpatient.attending_doctor_id AS employee_id,
+                       NULL::integer AS product_id,
+                       NULL::integer AS test_line_id
+                FROM hospital_inpatient inpatient
+                WHERE inpatient.patient_id = %s AND inpatient.active
+            """, patient_id),
+            'lab_test': SQL("""
+                SELECT 'lab_test' AS kind, test.id AS res_id,
+                       date_trunc('second', COALESCE(test.date::timestamp,
+                                                     test.create_date))
+                           AS event_date,
+                       NULL::varchar AS reference, test.state AS state,
+                       NULL::integer AS employee_id,
+                       NULL::integer AS product_id,
+                       test.test_id AS test_line_id
+                FROM patient_lab_test test
+                WHERE test.patient_id = %s
+            """, patient_id),
+            'vaccination': SQL("""
+                SELECT 'vaccination' AS kind, vaccination.id AS res_id,
+                       date_trunc('second', COALESCE(
+                           vaccination.vaccine_date::timestamp,
+                           vaccination.create_date)) AS event_date,
+                       vaccination.name AS reference,
+                       NULL::varchar AS state,
+                       NULL::integer AS employee_id,
+                       vaccination.vaccine_product_id AS product_id,
+                       NULL::integer AS test_line_id
+                FROM hospital_vaccination vaccination
+                WHERE vaccination.patient_id = %s
+            """, patient_id),
+            'prescription': SQL("""
+                SELECT 'prescription' AS kind, line.id AS res_id,
+                       date_trunc('second', line.create_date) AS event_date,
+                       COALESCE(op.op_reference, inpatient.name)
+                           AS reference,
+                       line.state AS state,
+                       NULL::integer AS employee_id,
+                       line.medicine_id AS product_id,
+                       NULL::integer AS test_line_id
+                FROM prescription_line line
+                LEFT JOIN hospital_outpatient op ON op.id = line.outpatient_id
+                LEFT JOIN hospital_inpatient inpatient
+                    ON inpatient.id = line.inpatient_id
+                WHERE line.outpatient_id IN (
+                        SELECT id FROM hospital_outpatient
+                        WHERE patient_id = %s)
+                   OR line.inpatient_id IN (
+                        SELECT id FROM hospital_inpatient
+                        WHERE patient_id = %s)
+            """, patient_id, patient_id),
+        }
+
+    @api.model
+    def _format_timeline_events(self, rows):
+        """Returns the timeline rows with their names resolved, reading the
+        names of each model at once"""
+        employees = self.env['hr.employee'].sudo().browse(
+            {row['employee_id'] for row in rows if row['employee_id']})
+        products = self.env['product.template'].sudo().browse(
+            {row['product_id'] for row in rows if row['product_id']})
+        tests = self.env['lab.test.line'].sudo().browse(
+            {row['test_line_id'] for row in rows if row['test_line_id']})
+        names = {
+            'employee_id': dict(zip(employees.ids, employees.mapped('name'))),
+            'product_id': dict(zip(products.ids, products.mapped('name'))),
+            'test_line_id': dict(zip(tests.ids, tests.mapped('name'))),
+        }
+        states = {
+            kind: dict(self.env[model]._fields['state']._description_selection(
+                self.env))
+            for kind, model in TIMELINE_MODELS.items()
+            if 'state' in self.env[model]._fields
+        }
+        return [{
+            'id': f"{row['kind']}-{row['res_id']}",
+            'kind': row['kind'],
+            'res_model': TIMELINE_MODELS[row['kind']],
+            'res_id': row['res_id'],
+            'date': fields.Datetime.to_string(row['event_date']),
+            'reference': row['reference'] or '',
+            'description': names['product_id'].get(row['product_id']) or
+            names['test_line_id'].get(row['test_line_id']) or '',
+            'doctor': names['employee_id'].get(row['employee_id'], ''),
+            'state': states.get(row['kind'], {}).get(row['state'], ''),
+        } for row in rows]
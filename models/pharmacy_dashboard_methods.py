@@ -4,9 +4,33 @@ Pharmacy Dashboard Backend Methods
 Add these methods to your hospital.pharmacy model
 """
 
-from odoo import models, api
+from odoo import models, api, _
+from odoo.exceptions import UserError
 from datetime import datetime, timedelta
-from odoo.tools import DEFAULT_SERVER_DATE_FORMAT, DEFAULT_SERVER_DATETIME_FORMAT
+from odoo.tools import DEFAULT_SERVER_DATE_FORMAT, DEFAULT_SERVER_DATETIME_FORMAT, SQL
+from .dashboard_cache import dashboard_cache
+from .hospital_perf_sample import profiled
+
+# Stock alerts pagination
+STOCK_ALERT_MAX_LIMIT = 100
+STOCK_ALERT_ORDERS = (
+    'id', 'id desc', 'product_id', 'product_id desc',
+    'expiry_date, id', 'expiry_date desc, id',
+)
+STOCK_ALERT_DEFAULT_ORDERS = {
+    'out_of_stock': 'id',
+    'low_stock': 'id',
+    'expiring_soon': 'expiry_date, id',
+    'expired': 'expiry_date desc, id',
+}
+STOCK_ALERT_COUNT_KEYS = {
+    'out_of_stock': 'out_of_stock_count',
+    'low_stock': 'low_stock_count',
+    'expiring_soon': 'expiring_count',
+    'expired': 'expired_count',
+}
+# Prescription queue pagination
+PRESCRIPTION_QUEUE_MAX_LIMIT = 100
 
 
 class HospitalPharmacy(models.Model):
@@ -14,9 +38,34 @@ class HospitalPharmacy(models.Model):
     _inherit = 'hospital.pharmacy'
 
     @api.model
+    @profiled()
     def get_pharmacy_statistics(self):
         """
         Get all pharmacy dashboard statistics in one optimized call
+        The stock based counts are computed on every call, since the on hand
+        quantities change through stock moves which do not invalidate the
+        dashboard cache
+        Returns dict with counts and trends
+        """
+        statistics = dict(self._get_pharmacy_order_statistics())
+        # Low stock medicines (qty < 10)
+        statistics['low_stock_count'] = self.env[
+            'pharmacy.medicine'].search_count([('qty_available', '<', 10)])
+        # Vaccines in stock
+        statistics['vaccines_in_stock'] = self.env[
+            'pharmacy.medicine'].search_count([
+                ('product_id.vaccine_ok', '=', True),
+                ('qty_available', '>', 0)
+            ])
+        return statistics
+
+    @api.model
+    @dashboard_cache('sale.order', 'pharmacy.medicine', 'product.template',
+                     per_user=True)
+    def _get_pharmacy_order_statistics(self):
+        """
+        Get the cached pharmacy dashboard statistics, which do not depend
+        on the stock quantities
         Returns dict with counts and trends
         """
         today = datetime.today().date()
@@ -26,11 +75,6 @@ class HospitalPharmacy(models.Model):
         # Total medicines in pharmacy
         total_medicines = self.env['pharmacy.medicine'].search_count([])
         
-        # Low stock medicines (qty < 10)
-        low_stock_count = self.env['pharmacy.medicine'].search_count([
-            ('qty_available', '<', 10)
-        ])
-        
         # Orders today
         orders_today = self.env['sale.order'].search_count([
             ('date_order', '>=', today.strftime(DEFAULT_SERVER_DATE_FORMAT)),
@@ -89,12 +133,6 @@ class HospitalPharmacy(models.Model):
             ('vaccine_ok', '=', True)
         ])
         
-        # Vaccines in stock
-        vaccines_in_stock = self.env['pharmacy.medicine'].search_count([
-            ('product_id.vaccine_ok', '=', True),
-            ('qty_available', '>', 0)
-        ])
-        
         # Pending orders (draft state)
         pending_orders = self.env['sale.order'].search_count([
             ('state', '=', 'draft'),
@@ -103,17 +141,16 @@ class HospitalPharmacy(models.Model):
         
         return {
             'total_medicines': total_medicines,
-            'low_stock_count': low_stock_count,
             'orders_today': orders_today,
             'orders_trend': orders_trend,
             'revenue_today': round(revenue_today, 2),
             'revenue_trend': revenue_trend,
             'total_vaccines': total_vaccines,
-            'vaccines_in_stock': vaccines_in_stock,
             'pending_orders': pending_orders,
         }
 
     @api.model
+    @profiled()
     def get_pharmacy_charts_data(self):
         """
         Get all chart data for pharmacy dashboard
@@ -153,26 +190,7 @@ class HospitalPharmacy(models.Model):
             })
         
         # 2. Top products (most sold in last 30 days)
-        thirty_days_ago = today - timedelta(days=30)
-        
-        # Get sale order lines from last 30 days
-        order_lines = self.env['sale.order.line'].search([
-            ('order_id.date_order', '>=', thirty_days_ago.strftime(DEFAULT_SERVER_DATE_FORMAT)),
-            ('order_id.state', 'in', ['sale', 'done']),
-            ('order_id.partner_id.patient_seq', 'not in', ['New', 'Employee', 'User'])
-        ])
-        
-        # Aggregate by product
-        product_sales = {}
-        for line in order_lines:
-            product_name = line.product_id.name
-            if product_name not in product_sales:
-                product_sales[product_name] = 0
-            product_sales[product_name] += line.product_uom_qty
-        
-        # Get top 5
-        sorted_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_products = [{'name': name, 'qty': qty} for name, qty in sorted_products]
+        top_products = self.get_top_products()
         
         # 3. Monthly revenue (last 6 months)
         six_months_ago = today - timedelta(days=180)
@@ -229,167 +247,219 @@ class HospitalPharmacy(models.Model):
         }
 
     @api.model
-    def get_stock_alerts(self):
+    @profiled()
+    def get_top_products(self, limit=5, days=30):
         """
-        Get critical stock alerts
-        Returns: Dict with rupture, low stock, and expiring medicines
+        Get the most sold products of the last days
+        Quantities are summed and ranked by the database, grouped by product
+        so that distinct products sharing a name are not merged
+        Args:
+            limit: number of products to return
+            days: size of the window in days
+        Returns: List of dicts with product id, name and quantity
         """
+        date_from = datetime.today().date() - timedelta(days=days)
+        sales = self.env['sale.order.line']._read_group(
+            domain=[
+                ('product_id', '!=', False),
+                ('order_id.date_order', '>=', date_from.strftime(DEFAULT_SERVER_DATE_FORMAT)),
+                ('order_id.state', 'in', ['sale', 'done']),
+                ('order_id.partner_id.patient_seq', 'not in', ['New', 'Employee', 'User'])
+            ],
+            groupby=['product_id'],
+            aggregates=['product_uom_qty:sum'],
+            order='product_uom_qty:sum desc',
+            limit=limit
+        )
+        return [{
+            'id': product.id,
+            'name': product.name,
+            'qty': qty
+        } for product, qty in sales]
+
+    @api.model
+    def _get_stock_alert_domains(self):
+        """Returns the domain of each kind of stock alert"""
         today = datetime.today().date()
         expiry_threshold = today + timedelta(days=30)
-        
-        # Medicines out of stock (qty = 0)
-        out_of_stock = self.env['pharmacy.medicine'].search([
-            ('qty_available', '=', 0)
-        ])
-        
-        # Low stock (qty < min_qty)
-        low_stock = self.env['pharmacy.medicine'].search([
-            ('qty_available', '>', 0),
-            ('qty_available', '<', 10)  # Default or min_qty field
-        ])
-        
-        # Expiring soon (within 30 days)
-        expiring_soon = self.env['pharmacy.medicine'].search([
-            ('expiry_date', '!=', False),
-            ('expiry_date', '<=', expiry_threshold.strftime(DEFAULT_SERVER_DATE_FORMAT)),
-            ('expiry_date', '>', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
-        
-        # Already expired
-        expired = self.env['pharmacy.medicine'].search([
-            ('expiry_date', '!=', False),
-            ('expiry_date', '<', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
-        
-        out_of_stock_data = [{'name': m.product_id.name, 'qty': 0} for m in out_of_stock[:10]]
-        low_stock_data = [{'name': m.product_id.name, 'qty': m.qty_available, 'min': m.min_qty or 10} for m in low_stock[:10]]
-        expiring_data = [{
-            'name': m.product_id.name,
-            'date': m.expiry_date.strftime('%Y-%m-%d') if m.expiry_date else '',
-            'batch': m.batch_number or '-'
-        } for m in expiring_soon[:10]]
-        expired_data = [{
-            'name': m.product_id.name,
-            'date': m.expiry_date.strftime('%Y-%m-%d') if m.expiry_date else '',
-            'batch': m.batch_number or '-'
-        } for m in expired[:10]]
-        
         return {
-            'out_of_stock': out_of_stock_data,
-            'out_of_stock_count': len(out_of_stock),
-            'low_stock': low_stock_data,
-            'low_stock_count': len(low_stock),
-            'expiring_soon': expiring_data,
-            'expiring_count': len(expiring_soon),
-            'expired': expired_data,
-            'expired_count': len(expired),
+            # Medicines out of stock (qty = 0)
+            'out_of_stock': [('qty_available', '=', 0)],
+            # Low stock (qty < min_qty)
+            'low_stock': [
+                ('qty_available', '>', 0),
+                ('qty_available', '<', 10)  # Default or min_qty field
+            ],
+            # Expiring soon (within 30 days)
+            'expiring_soon': [
+                ('expiry_date', '!=', False),
+                ('expiry_date', '<=', expiry_threshold.strftime(DEFAULT_SERVER_DATE_FORMAT)),
+                ('expiry_date', '>', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
+            ],
+            # Already expired
+            'expired': [
+                ('expiry_date', '!=', False),
+                ('expiry_date', '<', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
+            ],
         }
 
     @api.model
+    @profiled()
+    def get_stock_alerts(self, kind=None, limit=10, offset=0, order=None):
+        """
+        Get critical stock alerts, one page per kind of alert
+        Args:
+            kind: 'out_of_stock', 'low_stock', 'expiring_soon' or 'expired'
+                to only get this kind of alert, all the kinds when not given
+            limit: number of medicines per kind, at most STOCK_ALERT_MAX_LIMIT
+            offset: number of medicines to skip in each kind
+            order: sort order of the medicines among STOCK_ALERT_ORDERS,
+                most urgent first when not given
+        Returns: Dict with rupture, low stock, and expiring medicines and
+            the total count of each kind
+        """
+        domains = self._get_stock_alert_domains()
+        if kind and kind not in domains:
+            raise UserError(_("Unknown stock alert: %s", kind))
+        if order and order not in STOCK_ALERT_ORDERS:
+            raise UserError(_("Invalid stock alert order: %s", order))
+        limit = max(0, min(int(limit or 0), STOCK_ALERT_MAX_LIMIT))
+        offset = max(0, int(offset or 0))
+        Medicine = self.env['pharmacy.medicine']
+        result = {}
+        for alert, domain in domains.items():
+            if kind and alert != kind:
+                continue
+            medicines = Medicine.search(
+                domain, limit=limit, offset=offset,
+                order=order or STOCK_ALERT_DEFAULT_ORDERS[alert]
+            ) if limit else Medicine
+            if alert in ('out_of_stock', 'low_stock'):
+                rows = [{
+                    'id': m.id,
+                    'name': m.product_id.name,
+                    'qty': m.qty_available,
+                    'min': m.min_qty or 10
+                } for m in medicines]
+            else:
+                rows = [{
+                    'id': m.id,
+                    'name': m.product_id.name,
+                    'date': m.expiry_date.strftime('%Y-%m-%d') if m.expiry_date else '',
+                    'batch': m.batch_number or '-'
+                } for m in medicines]
+            result[alert] = rows
+            # The first page tells the count when it is not full
+            if not offset and len(medicines) < limit:
+                count = len(medicines)
+            else:
+                count = Medicine.search_count(domain)
+            result[STOCK_ALERT_COUNT_KEYS[alert]] = count
+        return result
+
+    @api.model
+    @profiled()
+    def get_prescription_queue(self, state='draft', limit=20, offset=0):
+        """
+        Get one page of the prescription lines of a state, oldest first
+        Args:
+            state: state of the prescription lines
+            limit: number of lines, at most PRESCRIPTION_QUEUE_MAX_LIMIT
+            offset: number of lines to skip
+        Returns: List of dicts with the medicine, patient, quantity and date
+            of each line
+
+        The patient name is resolved in SQL from the outpatient or the
+        inpatient of the line, the medicine names are read in one batch.
+        """
+        limit = max(0, min(int(limit or 0), PRESCRIPTION_QUEUE_MAX_LIMIT))
+        offset = max(0, int(offset or 0))
+        if not limit:
+            return []
+        Line = self.env['prescription.line']
+        Line.flush_model(['state', 'outpatient_id', 'inpatient_id'])
+        self.env['hospital.outpatient'].flush_model(['patient_id'])
+        self.env['hospital.inpatient'].flush_model(['patient_id'])
+        self.env['res.partner'].flush_model(['name'])
+        query = Line._search([('state', '=', state)])
+        self.env.cr.execute(SQL("""
+            SELECT line.id, COALESCE(op_patient.name, ip_patient.name)
+            FROM prescription_line line
+            LEFT JOIN hospital_outpatient op ON op.id = line.outpatient_id
+            LEFT JOIN res_partner op_patient ON op_patient.id = op.patient_id
+            LEFT JOIN hospital_inpatient ip ON ip.id = line.inpatient_id
+            LEFT JOIN res_partner ip_patient ON ip_patient.id = ip.patient_id
+            WHERE line.id IN %s
+            ORDER BY line.create_date, line.id
+            LIMIT %s OFFSET %s
+        """, query.subselect(), limit, offset))
+        patients = dict(self.env.cr.fetchall())
+        lines = Line.browse(list(patients))
+        return [{
+            'id': line.id,
+            'medicine': line.medicine_id.name,
+            'patient': patients[line.id] or 'Unknown',
+            'quantity': line.quantity,
+            'date': line.create_date.strftime('%Y-%m-%d') if line.create_date else '',
+        } for line in lines]
+
+    @api.model
+    @profiled()
     def get_prescriptions_data(self):
         """
         Get prescription data by state
         Returns: Dict with pending, completed, dispensed prescriptions
         """
-        # Pending prescriptions (draft state)
-        pending = self.env['prescription.line'].search([
-            ('state', '=', 'draft')
-        ])
-        
-        # Completed prescriptions
-        completed = self.env['prescription.line'].search([
-            ('state', '=', 'completed')
-        ])
-        
-        # Dispensed prescriptions
-        dispensed = self.env['prescription.line'].search([
-            ('state', '=', 'dispensed')
-        ])
-        
-        pending_data = []
-        for p in pending[:20]:
-            patient_name = 'Unknown'
-            if p.res_partner_id:
-                patient_name = p.res_partner_id.name
-            elif p.outpatient_id:
-                patient_name = p.outpatient_id.patient_id.name if p.outpatient_id.patient_id else 'Unknown'
-            elif p.inpatient_id:
-                patient_name = p.inpatient_id.patient_name if hasattr(p.inpatient_id, 'patient_name') else 'Unknown'
-            
-            pending_data.append({
-                'medicine': p.medicine_id.name,
-                'patient': patient_name,
-                'quantity': p.quantity,
-                'date': p.create_date.strftime('%Y-%m-%d') if p.create_date else '',
-            })
-        
-        completed_data = [{
-            'medicine': p.medicine_id.name,
-            'patient': p.res_partner_id.name if p.res_partner_id else 'Unknown',
-            'date': p.create_date.strftime('%Y-%m-%d') if p.create_date else '',
-        } for p in completed[:10]]
-        
-        dispensed_data = [{
-            'medicine': p.medicine_id.name,
-            'patient': p.res_partner_id.name if p.res_partner_id else 'Unknown',
-            'date': p.create_date.strftime('%Y-%m-%d') if p.create_date else '',
-        } for p in dispensed[:10]]
+        # Count every state in one grouped query
+        counts = dict(self.env['prescription.line']._read_group(
+            [], ['state'], ['__count']))
         
         return {
-            'pending': pending_data,
-            'pending_count': len(pending),
-            'completed': completed_data,
-            'completed_count': len(completed),
-            'dispensed': dispensed_data,
-            'dispensed_count': len(dispensed),
+            'pending': self.get_prescription_queue('draft', limit=20),
+            'pending_count': counts.get('draft', 0),
+            'completed': self.get_prescription_queue('completed', limit=10),
+            'completed_count': counts.get('completed', 0),
+            'dispensed': self.get_prescription_queue('dispensed', limit=10),
+            'dispensed_count': counts.get('dispensed', 0),
         }
 
     @api.model
+    @profiled()
     def get_financial_data(self):
         """
         Get financial summary data
         Returns: Dict with revenue, costs, profit, pending payments
         """
-        today = datetime.today().date()
-        
-        # Revenue: sum of confirmed/done sale orders
-        revenue_orders = self.env['sale.order'].search([
-            ('state', 'in', ['sale', 'done']),
-            ('partner_id.patient_seq', 'not in', ['New', 'Employee', 'User'])
-        ])
-        total_revenue = sum(revenue_orders.mapped('amount_total'))
-        
-        # Costs: sum of confirmed purchase orders (if purchase module installed)
-        try:
-            cost_orders = self.env['purchase.order'].search([
-                ('state', 'in', ['purchase', 'done'])
-            ])
-            total_cost = sum(cost_orders.mapped('amount_total'))
-        except:
-            total_cost = 0
+        # Revenue and costs: summed over the daily ledger rows maintained by
+        # the sale order and purchase order confirmations
+        totals = self.env['hospital.revenue.ledger'].get_totals()
+        total_revenue = totals['revenue_amount']
+        total_cost = totals['cost_amount']
         
         # Profit
         profit = total_revenue - total_cost
         
         # Pending payments (draft payment records)
         try:
-            pending_payments = self.env['account.payment'].search([
-                ('state', '=', 'draft')
-            ])
-            pending_count = len(pending_payments)
-            pending_amount = sum(pending_payments.mapped('amount'))
+            pending_count, pending_amount = self.env['account.payment']._read_group(
+                [('state', '=', 'draft')],
+                aggregates=['__count', 'amount:sum']
+            )[0]
+            pending_amount = pending_amount or 0
         except:
             pending_count = 0
             pending_amount = 0
         
         # Unpaid invoices (in_invoice not paid)
         try:
-            unpaid_invoices = self.env['account.move'].search([
-                ('type', '=', 'in_invoice'),
-                ('payment_state', 'in', ['not_paid', 'partial'])
-            ])
-            unpaid_count = len(unpaid_invoices)
-            unpaid_amount = sum(unpaid_invoices.mapped('amount_residual'))
+            unpaid_count, unpaid_amount = self.env['account.move']._read_group(
+                [
+                    ('move_type', '=', 'in_invoice'),
+                    ('payment_state', 'in', ['not_paid', 'partial'])
+                ],
+                aggregates=['__count', 'amount_residual:sum']
+            )[0]
+            unpaid_amount = unpaid_amount or 0
         except:
             unpaid_count = 0
             unpaid_amount = 0
@@ -398,7 +468,7 @@ class HospitalPharmacy(models.Model):
             'total_revenue': round(total_revenue, 2),
             'total_cost': round(total_cost, 2),
             'profit': round(profit, 2),
-            'revenue_count': len(revenue_orders),
+            'revenue_count': totals['revenue_count'],
             'pending_payments_count': pending_count,
             'pending_payments_amount': round(pending_amount, 2),
             'unpaid_invoices_count': unpaid_count,
@@ -475,10 +545,8 @@ class ResPartner(models.Model):
         
         code = patient_code[0]
         
-        # Search by patient_seq
-        patient = self.search([
-            ('patient_seq', '=', code)
-        ], limit=1)
+        # Wristband barcode, patient number or phone number
+        patient = self._find_patient(code)
         
         if not patient:
             return {
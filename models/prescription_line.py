@@ -56,14 +56,16 @@ class PrescriptionLine(models.Model):
          ('completed', 'Traitée'),
          ('dispensed', 'Dispensée/Livrée')],
         string='Statut',
-        default='draft',
+        default='draft', index=True,
         help='État de l\'ordonnance')
     inpatient_id = fields.Many2one('hospital.inpatient',
                                    string='Inpatient',
+                                   index='btree_not_null',
                                    help='The inpatient corresponds to the '
                                         'prescription line')
     outpatient_id = fields.Many2one('hospital.outpatient',
                                     string='Outpatient',
+                                    index='btree_not_null',
                                     help='The outpatient corresponds to the '
                                          'prescription line')
     res_partner_id = fields.Many2one('res.partner',
@@ -7,6 +7,8 @@ Add these methods to manage patient registration, appointments, and room assignm
 from odoo import models, api, fields
 from datetime import datetime, timedelta
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT
+from .dashboard_cache import dashboard_cache
+from .hospital_perf_sample import profiled
 
 
 class ResPartner(models.Model):
@@ -14,28 +16,50 @@ class ResPartner(models.Model):
     _inherit = 'res.partner'
 
     @api.model
+    @profiled()
+    @dashboard_cache('res.partner', 'hospital.outpatient',
+                     'hospital.inpatient', 'patient.room', 'hospital.ward',
+                     per_user=True)
     def get_reception_statistics(self):
         """
         Get all reception dashboard statistics
+        All counters are computed in one query by hospital.dashboard.aggregate
         Returns dict with counts and trends
         """
         today = datetime.today().date()
         yesterday = today - timedelta(days=1)
         
-        # Total patients
-        total_patients = self.search_count([
-            ('patient_seq', 'not in', ['New', 'Employee', 'User'])
-        ])
-        
-        # Appointments today
-        appointments_today = self.env['hospital.outpatient'].search_count([
-            ('op_date', '=', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
-        
-        # Appointments yesterday for trend
-        appointments_yesterday = self.env['hospital.outpatient'].search_count([
-            ('op_date', '=', yesterday.strftime(DEFAULT_SERVER_DATE_FORMAT))
+        counters = self.env['hospital.dashboard.aggregate'].count([
+            # Total patients
+            ('total_patients', 'res.partner', [
+                ('patient_seq', 'not in', ['New', 'Employee', 'User'])
+            ], False),
+            # Appointments today
+            ('appointments_today', 'hospital.outpatient', [
+                ('op_date', '=', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
+            ], False),
+            # Appointments yesterday for trend
+            ('appointments_yesterday', 'hospital.outpatient', [
+                ('op_date', '=', yesterday.strftime(DEFAULT_SERVER_DATE_FORMAT))
+            ], False),
+            # Active inpatients
+            ('active_inpatients', 'hospital.inpatient', [
+                ('state', 'in', ['admit', 'reserve'])
+            ], False),
+            # Rooms available
+            ('rooms_available', 'patient.room', [
+                ('state', '=', 'avail')
+            ], False),
+            # Wards available
+            ('wards_available', 'hospital.ward', [], False),
+            # New patients created today
+            ('new_patients_today', 'res.partner', [
+                ('patient_seq', 'not in', ['New', 'Employee', 'User']),
+                ('create_date', '>=', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
+            ], False),
         ])
+        appointments_today = counters['appointments_today']
+        appointments_yesterday = counters['appointments_yesterday']
         
         # Calculate appointments trend
         if appointments_yesterday > 0:
@@ -46,36 +70,18 @@ class ResPartner(models.Model):
         else:
             appointments_trend = 0 if appointments_today == 0 else 100
         
-        # Active inpatients
-        active_inpatients = self.env['hospital.inpatient'].search_count([
-            ('state', 'in', ['admit', 'reserve'])
-        ])
-        
-        # Rooms available
-        rooms_available = self.env['patient.room'].search_count([
-            ('state', '=', 'avail')
-        ])
-        
-        # Wards available
-        wards_available = self.env['hospital.ward'].search_count([])
-        
-        # New patients created today
-        new_patients_today = self.search_count([
-            ('patient_seq', 'not in', ['New', 'Employee', 'User']),
-            ('create_date', '>=', today.strftime(DEFAULT_SERVER_DATE_FORMAT))
-        ])
-        
         return {
-            'total_patients': total_patients,
+            'total_patients': counters['total_patients'],
             'appointments_today': appointments_today,
             'appointments_trend': appointments_trend,
-            'active_inpatients': active_inpatients,
-            'rooms_available': rooms_available,
-            'wards_available': wards_available,
-            'new_patients_today': new_patients_today,
+            'active_inpatients': counters['active_inpatients'],
+            'rooms_available': counters['rooms_available'],
+            'wards_available': counters['wards_available'],
+            'new_patients_today': counters['new_patients_today'],
         }
 
     @api.model
+    @profiled()
     def get_reception_charts_data(self):
         """
         Get chart data for reception dashboard
@@ -111,19 +117,18 @@ class ResPartner(models.Model):
                 'count': item.get('__count', 0)
             })
         
-        # 2. Room status (available, reserved, unavailable)
-        room_status = {
-            'available': self.env['patient.room'].search_count([('state', '=', 'avail')]),
-            'reserved': self.env['patient.room'].search_count([('state', '=', 'reserve')]),
-            'unavailable': self.env['patient.room'].search_count([('state', '=', 'not')])
-        }
-        
-        # 3. Inpatient status by state
-        inpatient_status = {
-            'admitted': self.env['hospital.inpatient'].search_count([('state', '=', 'admit')]),
-            'reserved': self.env['hospital.inpatient'].search_count([('state', '=', 'reserve')]),
-            'discharged': self.env['hospital.inpatient'].search_count([('state', '=', 'dis')])
-        }
+        # 2. Room status (available, reserved, unavailable) and
+        # 3. Inpatient status by state, counted in one query
+        status = self.env['hospital.dashboard.aggregate'].count([
+            ('available', 'patient.room', [('state', '=', 'avail')], 'room_status'),
+            ('reserved', 'patient.room', [('state', '=', 'reserve')], 'room_status'),
+            ('unavailable', 'patient.room', [('state', '=', 'not')], 'room_status'),
+            ('admitted', 'hospital.inpatient', [('state', '=', 'admit')], 'inpatient_status'),
+            ('reserved', 'hospital.inpatient', [('state', '=', 'reserve')], 'inpatient_status'),
+            ('discharged', 'hospital.inpatient', [('state', '=', 'dis')], 'inpatient_status'),
+        ])
+        room_status = status['room_status']
+        inpatient_status = status['inpatient_status']
         
         # 4. Appointments by doctor (top 5)
         doctors_data = self.env['hospital.outpatient'].read_group(
@@ -157,6 +162,7 @@ class HospitalOutpatient(models.Model):
     _inherit = 'hospital.outpatient'
 
     @api.model
+    @profiled()
     def get_appointments_today(self):
         """Get all appointments scheduled for today"""
         today = datetime.today().date()
@@ -186,6 +192,7 @@ class HospitalInpatient(models.Model):
     _inherit = 'hospital.inpatient'
 
     @api.model
+    @profiled()
     def get_active_inpatients(self):
         """Get all currently admitted inpatients"""
         active = self.search([
@@ -213,6 +220,7 @@ class PatientRoom(models.Model):
     _inherit = 'patient.room'
 
     @api.model
+    @profiled()
     def get_room_status(self):
         """Get all rooms with their availability status"""
         rooms = self.search([])
@@ -244,6 +252,7 @@ class PatientRoom(models.Model):
         return result
 
     @api.model
+    @profiled()
     def get_available_rooms(self):
         """Get only available rooms for assignment"""
         rooms = self.search([('state', '=', 'avail')])
@@ -267,6 +276,7 @@ class HospitalWard(models.Model):
     _inherit = 'hospital.ward'
 
     @api.model
+    @profiled()
     def get_ward_status(self):
         """Get all wards with available bed count"""
         wards = self.search([])
@@ -285,6 +295,7 @@ class HospitalWard(models.Model):
         return result
 
     @api.model
+    @profiled()
     def get_available_wards(self):
         """Get wards with available beds"""
         wards = self.search([])
@@ -314,6 +325,7 @@ class DoctorAllocation(models.Model):
     _inherit = 'doctor.allocation'
 
     @api.model
+    @profiled()
     def get_available_doctors(self):
         """Get doctors available for appointments"""
         today = datetime.today()
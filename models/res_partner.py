@@ -19,14 +19,56 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ################################################################################
+import io
+import json
 import math
 import re
 import base64
-from datetime import date
 from barcode import EAN13
 from barcode.writer import ImageWriter
-from dateutil.relativedelta import *
-from odoo import api, fields, models
+from odoo import api, fields, models, tools, _
+from odoo.exceptions import UserError
+from odoo.tools.sql import column_exists, create_column
+from .hospital_perf_sample import profiled
+
+# Fewer digits than this is a partner id, not a phone number
+PHONE_MIN_DIGITS = 8
+# Fields search_patients may return, the binary and HTML ones are left out
+PATIENT_LIST_FIELDS = ('patient_seq', 'name', 'phone', 'email',
+                       'date_of_birth', 'gender', 'blood_group', 'rh_type',
+                       'marital_status')
+PATIENT_LIST_DEFAULT_FIELDS = ('patient_seq', 'name')
+PATIENT_LIST_MAX_LIMIT = 200
+# Sequences of the partners which are not patients
+NON_PATIENT_SEQ = ('New', 'Employee', 'User')
+
+
+def normalize_phone(number, country=None):
+    """
+    Normalize a phone number to its E.164 digits, without the leading +
+    Args:
+        number: phone number as typed or scanned
+        country: country whose calling code replaces the trunk prefix 0 of
+            national numbers
+    Returns: String of digits, False when the number holds no digit
+    """
+    digits = re.sub(r'\D', '', number or '')
+    if not digits:
+        return False
+    if number.strip().startswith('+'):
+        return digits
+    if digits.startswith('00'):
+        return digits[2:]
+    if digits.startswith('0') and country and country.phone_code:
+        return f'{country.phone_code}{digits[1:]}'
+    return digits
+
+
+def render_barcode_png(code):
+    """Returns the PNG image of an EAN-13 barcode, rendered in memory"""
+    buffer = io.BytesIO()
+    EAN13(code, writer=ImageWriter()).write(buffer)
+    return buffer.getvalue()
 
 
 class ResPartner(models.Model):
@@ -66,9 +108,17 @@ class ResPartner(models.Model):
                                 domain=[('job_id.name', '=', 'Doctor')],
                                 string="Family Doctor",
                                 help='Family doctor of the patient')
-    barcode = fields.Char(string='Barcode', help='Barcode for the patient')
+    barcode = fields.Char(string='Barcode', help='Barcode for the patient',
+                          index='btree_not_null')
     barcode_png = fields.Binary(string='Barcode PNG',
-                                help='Image file of the barcode', readonly=True)
+                                help='Image file of the barcode', readonly=True,
+                                compute='_compute_barcode_png', store=True)
+    phone_normalized = fields.Char(string='Normalized Phone',
+                                   compute='_compute_phone_normalized',
+                                   store=True, index='btree_not_null',
+                                   help='Digits of the phone number in E.164 '
+                                        'format, used to find the patient '
+                                        'from a typed or scanned number')
     group = fields.Selection(selection=[
         ('hindu', 'Hindu'), ('muslim', 'Muslim'), ('christian', 'Christian')],
         string="Ethnic Group", help="Specify your religion")
@@ -91,238 +141,132 @@ class ResPartner(models.Model):
                                        'res_partner_id',
                                        string='Prescription',
                                        help='Prescription for patient')
-    economic_level = fields.Selection(selection=[
-        ('low', 'Lower Class'), ('middle', 'Middle Class'),
-        ('upper', 'Upper Class')], string="Socioeconomic",
-        help="Specify your economic status")
-    education_level = fields.Selection(selection=[
-        ('post', 'Post Graduation'), ('graduation', 'Graduation'),
-        ('pre', 'Pre Graduation')], string="Education Level",
-        help="Education status of patient")
-    house_level = fields.Selection(selection=[
-        ('good', 'Good'), ('bad', 'Bad'), ('poor', 'Poor')],
-        string="House Condition", help="Specify your house's condition")
-    work_home = fields.Boolean(string='Work At Home',
-                               help='True if you are working from home')
-    hours_outside = fields.Integer(string='Hours Stay Outside Home',
-                                   help="Specify how many hours you stay away "
-                                        "from home")
-    hostile = fields.Boolean(string='Hostile Area',
-                             help="Specify your house in a friendly "
-                                  "neighbourhood ")
-    income = fields.Monetary(string='Income', help="The in come of patient")
-    currency_id = fields.Many2one('res.currency', string='Currency',
-                                  help='Currency in which invoices and payments'
-                                       ' will be generated',
-                                  default=lambda self: self.env.user.company_id
-                                  .currency_id.id, required=True)
-    sanitary = fields.Boolean('Sanitary Sewers',
-                              help="A sewer or sewer system for carrying off "
-                                   "wastewater, waste matter from a residence,"
-                                   " business, etc")
-    running = fields.Boolean(string='Running Water',
-                             help="water that comes into a building through "
-                                  "pipes. A cabin with hot and cold running "
-                                  "water.")
-    electricity = fields.Boolean(string='Electricity',
-                                 help='True if you have electricity')
-    gas = fields.Boolean(string='Gas Supply',
-                         help='True if you have gas supply')
-    trash = fields.Boolean(string='Trash Collection',
-                           help='True if you have trash collection')
-    home_phone = fields.Boolean(string='Telephone',
-                                help='True if you have telephone')
-    tv = fields.Boolean(string='Television', help='True if you have television')
-    internet = fields.Boolean(string='Internet',
-                              help='True if you have internet')
-    help = fields.Selection([('yes', 'Yes'), ('no', 'No')],
-                            string="Family Help",
-                            help="Specify whether your family is willing "
-                                 "to help or not")
-    discussion = fields.Selection([('yes', 'Yes'), ('no', 'No')],
-                                  string="Family Discussion ",
-                                  help="Specify your family have a good "
-                                       "discussion at home ")
-    ability = fields.Selection([('very', 'Very good'), ('good', 'Good'),
-                                ('bad', 'Bad'), ('poor', 'Poor')],
-                               string="Family Ability",
-                               help="family status of the patient")
-    time_sharing = fields.Selection([('yes', 'Yes'), ('no', 'No')],
-                                    string=" Family Time Sharing ",
-                                    help="Specify your family share time "
-                                         "at home ")
-    affection = fields.Selection([('very', 'Very good'),
-                                  ('good', 'Good'),
-                                  ('bad', 'Bad'), ('poor', 'Poor')],
-                                 string="Family Affection ",
-                                 help="Specify your family's affection ")
-    single = fields.Boolean(string='Single Parent Family',
-                            help='Whether single parent family or not')
-    violence = fields.Boolean(string='Domestic Violence',
-                              help='True if you are facing any domestic '
-                                   'violence')
-    children = fields.Boolean(string='Working Children',
-                              help='Do you have working children')
-    abuse = fields.Boolean(string='Sexual Abuse',
-                           help='Do you faced any sexual abuse')
-    drug = fields.Boolean(string='Drug Addiction',
-                          help='Do you have drug addiction')
-    withdrawal = fields.Boolean(string='Withdrawal',
-                                help='Do you faced any withdrawal symptoms')
-    in_prison = fields.Boolean(string='Has Been In Prison',
-                               help='True if you had been in prison')
-    current_prison = fields.Boolean(string='Currently In Prison',
-                                    help='True if you are in prison currently')
-    relative_prison = fields.Boolean(string='Relative In Prison',
-                                     help='True if any of your relative is '
-                                          'in prison')
     hospital_vaccination_ids = fields.One2many(
         'hospital.vaccination', 'patient_id',
         string='Vaccination', help='Vaccination details of '
                                    'patient')
-    fertile = fields.Boolean(string='Fertile', help="""Capable of developing 
-                                             into a complete organism; 
-                                             fertilized. Capable of supporting 
-                                             plant life; favorable to the 
-                                             growth of crops and plants.""")
-    menarche_age = fields.Integer(string='Menarche Age', help="""The first 
-                                     menstrual period in a female adolescent""")
-    pause = fields.Boolean(string='Menopause', help="""Menopause is a point in 
-                                 time 12 months after a woman's last period""")
-    pause_age = fields.Integer(string='Menopause Age',
-                               help='Age at which menopause occurred')
-    pap = fields.Boolean(string='PAP Test',
-                         help="""
-                         A procedure in which a small brush is used to gently 
-                         remove cells from the surface of the cervix and the 
-                         area around it so they can be checked under a 
-                         microscope for cervical cancer or cell changes that
-                         may lead to cervical cancer.""")
-    colposcopy = fields.Boolean(string='Colposcopy', help=""" test to take a
-                            closer look at your cervix""")
-    self = fields.Boolean(string='Self breast examination',
-                          help="A breast self-exam for breast awareness is "
-                               "in inspection "
-                               "of your breasts that women do on your own")
-    mommography = fields.Boolean(string='Mommography',
-                                 help="Mammograms can be used to look for "
-                                      "breast cancer")
-    last_pap = fields.Date(string="Last PAP Test",
-                           help='The date on which last PAP test has been done')
-    last_col = fields.Date(string="Last Colposcopy",
-                           help='The date on which last colposcopy has been '
-                                'done')
-    deceased = fields.Boolean(string='Deceased during 1st week',
-                              help='The family member deceased during first '
-                                   'week')
-    grandiva = fields.Boolean(string='Grandiva', help='True for grandiva')
-    alive = fields.Boolean(string='Born Alive', help='Whether born alive or '
-                                                     'not')
-    premature = fields.Integer(string='Premature',
-                               help="Premature birth is birth that happens too"
-                                    "soon, before 37 weeks of pregnancy")
-    abortions = fields.Integer(string='No Of Abortions', help='Number of '
-                                                              'abortions of '
-                                                              'patient')
-    exercise = fields.Boolean(string='Exercise', help='True if patient doing '
-                                                      'exercise regularly')
-    minute = fields.Integer(string='Minute/Day', help='The duration of '
-                                                      'exercise per day')
-
-    day_sleep = fields.Boolean(string='Sleeps At Daytime', help='True if '
-                                                                'sleeps at '
-                                                                'daytime')
-    sleep_hrs = fields.Integer(string='Sleep Hours', help='Duration of sleep')
-    meals = fields.Integer(string='Meals/Day', help='Number of meals per day')
-    alone = fields.Boolean(string='Eat Alone', help='True if eats alone')
-    coffee = fields.Boolean(string='Coffee', help='True if you have a habit '
-                                                  'of drinking coffee')
-    cup = fields.Integer(string='Cups/Day', help='Number of cups of coffee '
-                                                 'per day')
-    drink = fields.Boolean(string='Soft Drink', help='True if you drinks soft '
-                                                     'drinks')
-    salt = fields.Boolean(string='Salt', help='True if you use salt')
-    diet = fields.Boolean(string='Currently On Diet', help='True if you are '
-                                                           'on diet currently')
-    smoke = fields.Boolean(string='Smoker', help='True for smoker')
-    ex_smoke = fields.Boolean(string='Ex-Smoker', help='True for ex-smoker')
-    age_start = fields.Integer(string='Age of Started Smoking',
-                               help='Age on which you started your smoking')
-    cigarettes = fields.Integer(string='Cigarettes/Day',
-                                help='Number of cigarettes per day')
-    passive = fields.Boolean(string='Passive Smoker',
-                             help='True for passive smokers')
-    age_quit = fields.Integer(string='Age of Quitting',
-                              help='Age at which you quit your smoking habit')
-    alcoholic = fields.Boolean(string='Alcoholic', help='True for alcoholics')
-    ex_alcoholic = fields.Boolean(string='Ex-Alcoholic', help='True for ex- '
-                                                              'alcoholics')
-    age_start_alco = fields.Integer(string='Age to Start Drinking',
-                                    help='Age at which you started your '
-                                         'drinking habit')
-    beer = fields.Integer(string='Beer/Day',
-                          help='Number of beers per day')
-    liquor = fields.Integer(string='Liquor/Day',
-                            help='Liquors per day')
-    wine = fields.Integer(string='Wine/Day',
-                          help='Number of wines per day')
-    age_quit_alcoholic = fields.Integer(string='Age Of Quitting',
-                                        help='Age at which you started your '
-                                             'drinking habit')
-    drugs = fields.Boolean(string='Drug User', help='True for drug users')
-    ex_drugs = fields.Boolean(string='Ex-Drug User', help='True for Ex drug '
-                                                          'user')
-    iv_user = fields.Boolean(string='IV Drug User', help='True for IV drug '
-                                                         'user')
-    age_start_drug = fields.Integer(string='Age to Start Using Drugs',
-                                    help='Age at which you started using drug')
-    age_quit_drug = fields.Integer(string='Drug Quitting Age', help='Age of '
-                                                                    'quitting '
-                                                                    'drug')
-    orientation = fields.Selection([('straight', 'Straight'),
-                                    ('homo', 'Homosexual'),
-                                    ('trans', 'Trans-Gender')],
-                                   string="Orientation")
-    age_sex = fields.Integer(string="Age of First Encounter",
-                             help='Age of first sex encounter')
-    partners = fields.Integer(string="No of Partners",
-                              help='Number of sex partners')
-    anti = fields.Selection(
-        [('pills', 'Contraceptive Pills'), ('ring', 'Contraceptive Ring'),
-         ('injection', 'Contraceptive Injection')],
-        string="Contraceptive Methods", help='Choose your contraceptive method')
-    oral = fields.Boolean(string='Oral Sex', help=("uttered by the mouth or in "
-                                                   "words"))
-    anal = fields.Boolean(string='Anal Sex', help="True if you are "
-                                                  "encountering anal sex")
-    prostitute = fields.Boolean(string='Prostitute', help='True for '
-                                                          'prostitutes')
-    prostitute_sex = fields.Boolean(string='Sex With Prostitute',
-                                    help='True if you are encountered sex '
-                                         'with prostitute')
-    sex_notes = fields.Text(string='Notes', help='Write down the notes')
-    rider = fields.Boolean(string='Motorcycle Rider', help='True for '
-                                                           'motorcycle riders')
-    helmet = fields.Boolean(string='Uses Helmet',
-                            help='True if you regularly use helmet')
-    laws = fields.Boolean(string='Obey Traffic Laws',
-                          help='True if you obey traffic rules')
-    revision = fields.Boolean(string='Car Revision', help='True if car '
-                                                          'revision is done')
-    belt = fields.Boolean(string='Seat Belt',
-                          help='True if you uses seat belt regularly')
-    safety = fields.Boolean(string='Car Child Safety',
-                            help='True if you have car child safety')
-    home = fields.Boolean(string='Home Safety', help='True for home safety')
-    occupation = fields.Char(string='Occupation', help='Your occupation')
+
+    def _auto_init(self):
+        """Fills phone_normalized in SQL on install, computing it through
+        the ORM is too slow on large partner tables"""
+        if not column_exists(self.env.cr, 'res_partner', 'phone_normalized'):
+            create_column(self.env.cr, 'res_partner', 'phone_normalized',
+                          'varchar')
+            self.env.cr.execute("""
+                WITH partner AS (
+                    SELECT p.id, btrim(p.phone) AS phone,
+                           regexp_replace(p.phone, '\\D', '', 'g') AS digits,
+                           COALESCE(c.phone_code, %s) AS phone_code
+                    FROM res_partner p
+                    LEFT JOIN res_country c ON c.id = p.country_id
+                    WHERE p.phone IS NOT NULL
+                )
+                UPDATE res_partner p SET phone_normalized = CASE
+                    WHEN partner.phone LIKE '+%%' THEN partner.digits
+                    WHEN partner.digits LIKE '00%%'
+                        THEN substr(partner.digits, 3)
+                    WHEN partner.digits LIKE '0%%' AND partner.phone_code > 0
+                        THEN partner.phone_code || substr(partner.digits, 2)
+                    ELSE partner.digits
+                END
+                FROM partner
+                WHERE p.id = partner.id AND partner.digits != ''
+            """, [self.env.company.country_id.phone_code or 0])
+        return super()._auto_init()
+
+    @api.depends('phone', 'country_id')
+    def _compute_phone_normalized(self):
+        """Normalizes the phone number for the scan lookups"""
+        for partner in self:
+            partner.phone_normalized = normalize_phone(
+                partner.phone,
+                partner.country_id or self.env.company.country_id)
 
     @api.model
-    def create(self, vals):
-        """Inherits create function for sequence generation"""
-        if vals.get('patient_seq', 'New') == 'New':
-            vals['patient_seq'] = self.env['ir.sequence'].next_by_code(
-                'patient.sequence') or 'New'
-        return super().create(vals)
+    def _find_patient(self, code):
+        """
+        Find the partner matching a scanned or typed code
+        The code is resolved through one indexed equality, chosen from its
+        shape: wristband barcode (EAN-13), patient number, phone number or
+        partner id of a patient. A 13 digits code not matching a barcode is
+        tried as a phone number.
+        Args:
+            code: scanned or typed code
+        Returns: Matching partner, empty when not found
+        """
+        code = str(code or '').strip()
+        digits = re.sub(r'\D', '', code)
+        if not code:
+            return self.browse()
+        if re.search('[A-Za-z]', code):
+            domains = [[('patient_seq', '=', code)]]
+        elif len(digits) < PHONE_MIN_DIGITS:
+            if not digits:
+                return self.browse()
+            domains = [[('id', '=', int(digits)),
+                        ('patient_seq', '!=', False),
+                        ('patient_seq', 'not in', NON_PATIENT_SEQ)]]
+        else:
+            domains = [[('phone_normalized', '=', normalize_phone(
+                code, self.env.company.country_id))]]
+            if code.isdigit() and len(code) == 13:
+                domains.insert(0, [('barcode', '=', code)])
+        for domain in domains:
+            patient = self.search(domain, limit=1)
+            if patient:
+                return patient
+        return self.browse()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Inherits create function for sequence generation, the numbers of
+        a batch are reserved at once"""
+        new_vals = [vals for vals in vals_list
+                    if vals.get('patient_seq', 'New') == 'New']
+        for vals, patient_seq in zip(
+                new_vals, self._next_patient_sequences(len(new_vals))):
+            vals['patient_seq'] = patient_seq
+        return super().create(vals_list)
+
+    @api.model
+    def _next_patient_sequences(self, count):
+        """
+        Reserve patient numbers with a single query instead of one
+        next_by_code call per patient
+        Args:
+            count: number of patient numbers
+        Returns: List of the patient numbers, 'New' when the sequence is
+            missing
+        """
+        if not count:
+            return []
+        sequences = self.env['ir.sequence']
+        sequences.check_access('read')
+        sequence = sequences.sudo().search([
+            ('code', '=', 'patient.sequence'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return ['New'] * count
+        if sequence.use_date_range or count == 1:
+            return [sequence._next() for _index in range(count)]
+        if sequence.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [f'ir_sequence_{sequence.id:03d}', count])
+            numbers = [number for number, in self.env.cr.fetchall()]
+        else:
+            self.env.cr.execute("""
+                UPDATE ir_sequence
+                SET number_next = number_next + number_increment * %s
+                WHERE id = %s
+                RETURNING number_next, number_increment
+            """, [count, sequence.id])
+            number_next, increment = self.env.cr.fetchone()
+            numbers = range(number_next - increment * count, number_next,
+                            increment)
+            sequence.invalidate_recordset(['number_next'])
+        return [sequence.get_next_char(number) for number in numbers]
 
     def action_view_invoice(self):
         """Returns patient invoice"""
@@ -404,56 +348,38 @@ class ResPartner(models.Model):
             ean = ean + '0' * (13 - len(ean))
             return ean[:-1] + str(self.ean_checksum(ean))
 
+    @api.depends('barcode')
+    def _compute_barcode_png(self):
+        """Renders the barcode image in memory, it is only rendered again
+        when the barcode changes"""
+        for partner in self:
+            barcode = partner.barcode or ''
+            partner.barcode_png = barcode.isdigit() and len(barcode) in (
+                12, 13) and base64.b64encode(render_barcode_png(barcode))
+
+    def _ensure_patient_barcodes(self):
+        """Gives a barcode to the patients which do not have one yet"""
+        for partner in self.sudo().filtered(lambda rec: not rec.barcode):
+            partner.barcode = partner.generate_ean(str(partner.id))
+
     def action_generate_patient_card(self):
         """Method for generating the patient card"""
-        current_age = 0
-        gender_caps = ''
-        blood_caps = ''
-        if not self.barcode:
-            ean = self.sudo().generate_ean(str(self.id))
-            self.sudo().write({'barcode': ean})
-            number = self.barcode
-            my_code = EAN13(number, writer=ImageWriter())
-            my_code.save("code")
-            with open('code.png', 'rb') as f:
-                self.sudo().write({
-                    'barcode_png': base64.b64encode(f.read())
-                })
-        if self.gender:
-            gender_caps = self.gender.capitalize()
-        if self.blood_group:
-            blood_caps = self.blood_group.capitalize()
-        if self.date_of_birth:
-            today = date.today()
-            dob = self.date_of_birth
-            current_age = relativedelta(today, dob).years
-        company = self.env['res.company'].sudo().search(
-            [('id', '=', self.env.context['allowed_company_ids'])])
-        data = {
-            'name': self.name,
-            'code': self.patient_seq,
-            'age': current_age,
-            'gender': gender_caps,
-            'dob': self.date_of_birth,
-            'blood': blood_caps + str(self.rh_type),
-            'street': self.street,
-            'street2': self.street2,
-            'state': self.state_id.name,
-            'country': self.country_id.name,
-            'city': self.city,
-            'phone': self.phone,
-            'image': self.sudo().read(['image_1920'])[0],
-            'barcode': self.sudo().read(['barcode_png'])[0],
-            'company_name': company.name,
-            'company_street': company.street,
-            'company_street2': company.street2,
-            'company_city': company.city,
-            'company_state': company.state_id.name,
-            'company_zip': company.zip,
-        }
         return self.env.ref(
             'base_hospital_management.action_report_patient_card'
-        ).report_action(None, data=data)
+        ).report_action(self)
+
+    @api.model
+    def action_print_patient_cards(self, domain):
+        """
+        Print the cards of the patients matching a domain as one PDF
+        Args:
+            domain: domain of the patients
+        Returns: Report action of the merged patient cards
+        """
+        patients = self.search(domain)
+        if not patients:
+            raise UserError(_("No patient matches the selection."))
+        return patients.action_generate_patient_card()
 
     @api.model
     def reception_op_barcode(self, kw):
@@ -465,25 +391,33 @@ class ResPartner(models.Model):
             'blood_group': '',
             'gender': '',
         }
-        if kw['patient_data']:
-            patient = self.sudo().search(
-                ['|', ('id', '=', kw['patient_data']),
-                 ('phone', '=', kw['patient_data'])])
-            if patient:
-                values = {
-                    'name': patient.name,
-                    'date_of_birth': patient.date_of_birth,
-                    'phone': patient.phone,
-                    'blood_group': patient.blood_group,
-                    'gender': patient.gender,
-                }
+        if kw.get('patient_id'):
+            # Partner selected in the patient picker
+            patient = self.sudo().search([
+                ('id', '=', int(kw['patient_id'])),
+                ('patient_seq', '!=', False),
+                ('patient_seq', 'not in', NON_PATIENT_SEQ),
+            ], limit=1)
+        else:
+            # Code typed or scanned
+            patient = self.sudo()._find_patient(kw.get('patient_data'))
+        if patient:
+            values = {
+                'name': patient.name,
+                'date_of_birth': patient.date_of_birth,
+                'phone': patient.phone,
+                'blood_group': patient.blood_group,
+                'gender': patient.gender,
+            }
         return values
 
     @api.model
     def reception_op_phone(self, phone):
         """Returns a patient details having the phone number"""
-        patient_phone = self.sudo().search(
-            [('phone', '=', phone['patient-phone'])])
+        patient_phone = self.sudo().search([
+            ('phone_normalized', '=', normalize_phone(
+                phone['patient-phone'], self.env.company.country_id) or '')
+        ], limit=1)
         return {
             'patient_seq': patient_phone.patient_seq,
             'name': patient_phone.name,
@@ -495,16 +429,9 @@ class ResPartner(models.Model):
     @api.model
     def action_get_patient_data(self, patient_id):
         """Method which returns patient details"""
-        data = self.sudo().search([
-            '|', ('patient_seq', '=', patient_id),
-            ('barcode', 'in', patient_id)
-        ])
-        patient_history = []
-        for rec in self.env['hospital.outpatient'].sudo().search(
-                [('patient_id', '=', data.id)]):
-            patient_history.append(
-                [rec.op_reference, str(rec.op_date),
-                 rec.doctor_id.doctor_id.name])
+        data = self.sudo()._find_patient(patient_id)
+        patient_history = self.get_patient_timeline(data.id) if data else {
+            'events': [], 'next_cursor': False}
         values = {
             'name': data.name,
             'unique': data.patient_seq,
@@ -513,7 +440,8 @@ class ResPartner(models.Model):
             'dob': data.date_of_birth,
             'image_1920': data.image_1920,
             'status': data.marital_status,
-            'history': patient_history,
+            'history': patient_history['events'],
+            'history_cursor': patient_history['next_cursor'],
         }
         if not data.name:
             values['name'] = 'Patient Not Found'
@@ -554,7 +482,11 @@ class ResPartner(models.Model):
     def create_patient(self, post):
         """Method for creating a patient"""
         if post and not post['patient_id']:
-            patient = self.sudo().search([('name', '=', post['op_name'])])
+            patient, duplicates = self.sudo()._find_registered_patient({
+                'name': post['op_name'],
+                'phone': post.get('op_phone'),
+                'date_of_birth': post.get('op_dob'),
+            })
             if not patient:
 
                 patient = self.sudo().create({
@@ -564,6 +496,9 @@ class ResPartner(models.Model):
                 })
                 if 'op_dob' in post.keys():
                     patient.sudo().write({'date_of_birth': post['op_dob']})
+                self.env['hospital.patient.duplicate'].sudo()._queue([
+                    (duplicate.id, patient.id, score, [])
+                    for duplicate, score in duplicates])
         else:
             patient = self.sudo().search([('id', '=', post['patient_id'])])
             out_patient = self.env['hospital.outpatient'].sudo().search([('patient_id','=', patient.id)])
@@ -578,7 +513,70 @@ class ResPartner(models.Model):
                 })
 
     @api.model
-    def fetch_patient_data(self):
-        """Method for returning patient data"""
-        return self.sudo().search_read(
-            [('patient_seq', 'not in', ['New', 'Employee', 'User'])])
+    @profiled()
+    def search_patients(self, field_names=None, search=None, limit=50,
+                        cursor=None):
+        """
+        Get one page of patients, ordered by patient number
+        Pages are chained with a keyset cursor instead of an offset, so
+        every page costs the same index range scan whatever its position.
+        Args:
+            field_names: fields to return, among PATIENT_LIST_FIELDS. The id
+                is always returned
+            search: text searched in the name, patient number and phone
+            limit: maximum number of patients, at most
+                PATIENT_LIST_MAX_LIMIT
+            cursor: next_cursor of the previous page, None for the first one
+        Returns: Dict with the records and the cursor of the next page,
+            False on the last page
+        """
+        # patient_seq is always read, the cursor is built from it
+        field_names = ['patient_seq'] + [
+            field for field in field_names or PATIENT_LIST_DEFAULT_FIELDS
+            if field in PATIENT_LIST_FIELDS and field != 'patient_seq']
+        limit = max(1, min(int(limit or 1), PATIENT_LIST_MAX_LIMIT))
+        domain = [('patient_seq', '!=', False),
+                  ('patient_seq', 'not in', NON_PATIENT_SEQ)]
+        search = (search or '').strip()
+        if search:
+            search_domain = [('name', 'ilike', search),
+                             ('patient_seq', '=ilike', f'{search}%')]
+            digits = re.sub(r'\D', '', search)
+            if len(digits) >= PHONE_MIN_DIGITS:
+                search_domain.append(('phone_normalized', '=like', '%s%%' % (
+                    normalize_phone(search, self.env.company.country_id))))
+            domain += ['|'] * (len(search_domain) - 1) + search_domain
+        if cursor:
+            seq, last_id = self._decode_cursor(cursor, str, int)
+            domain += ['|', ('patient_seq', '>', seq),
+                       '&', ('patient_seq', '=', seq), ('id', '>', last_id)]
+        records = self.sudo().search_read(
+            domain, field_names, limit=limit + 1, order='patient_seq, id')
+        next_cursor = False
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = self._encode_cursor(
+                [records[-1]['patient_seq'], records[-1]['id']])
+        return {'records': records, 'next_cursor': next_cursor}
+
+    @api.model
+    def _encode_cursor(self, values):
+        """Returns an opaque keyset pagination cursor holding the values of
+        the last row of a page"""
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    @api.model
+    def _decode_cursor(self, cursor, *types):
+        """Returns the values of a cursor, converted by the given types"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor))
+            if len(values) != len(types):
+                raise ValueError(cursor)
+            return [convert(value) for convert, value in zip(types, values)]
+        except (TypeError, ValueError):
+            raise UserError(_("Invalid pagination cursor."))
+
+    def init(self):
+        """Creates the index of the keyset pagination of search_patients"""
+        tools.create_index(self.env.cr, 'res_partner_patient_seq_id_index',
+                           self._table, ['patient_seq', 'id'])
@@ -0,0 +1,44 @@
+/** @odoo-module */
+import { useService } from "@web/core/utils/hooks";
+import { onMounted, onWillUnmount } from "@odoo/owl";
+import { user } from "@web/core/user";
+
+/**
+ * Listen to the update notifications pushed on the channel of a dashboard
+ * @param {string} dashboard - doctor, reception, lab or pharmacy
+ * @param {Function} callback - called with the notification payload
+ */
+export function useDashboardBus(dashboard, callback) {
+    const busService = useService("bus_service");
+    const channel = `base_hospital_management.${dashboard}_dashboard`;
+    const onUpdate = (payload) => {
+        // Only keep the updates of this dashboard and of the active company
+        if (payload.dashboard === dashboard &&
+                payload.company_id === user.activeCompany?.id) {
+            callback(payload);
+        }
+    };
+
+    onMounted(() => {
+        busService.addChannel(channel);
+        busService.subscribe("hospital_dashboard/update", onUpdate);
+    });
+
+    onWillUnmount(() => {
+        busService.unsubscribe("hospital_dashboard/update", onUpdate);
+        busService.deleteChannel(channel);
+    });
+}
+
+/**
+ * Add the counter deltas of a notification to the displayed statistics
+ * @param {Object} stats - statistics of the dashboard state
+ * @param {Object} deltas - counter deltas of the notification
+ */
+export function applyDashboardDeltas(stats, deltas) {
+    for (const [key, delta] of Object.entries(deltas)) {
+        if (key in stats) {
+            stats[key] = Number(stats[key] || 0) + delta;
+        }
+    }
+}
@@ -5,6 +5,9 @@ import { useRef, onMounted, onWillUnmount } from "@odoo/owl";
 import { Component, useState } from "@odoo/owl";
 import { _t } from "@web/core/l10n/translation";
 import { user } from "@web/core/user";
+import { useDashboardBus, applyDashboardDeltas } from "./dashboard_bus";
+import { PatientPicker } from "./patient_picker";
+import { PatientTimeline } from "./patient_timeline";
 
 // Doctor dashboard component initialization
 export class DoctorDashboard extends Component {
@@ -44,6 +47,7 @@ export class DoctorDashboard extends Component {
                 workload: [],
             },
             recent_activities: [],
+            timeline_patient_id: false,
         });
 
         // Charts instances
@@ -62,6 +66,19 @@ export class DoctorDashboard extends Component {
         onWillUnmount(() => {
             this.destroyCharts();
         });
+
+        // Patch the dashboard from the pushed updates
+        useDashboardBus('doctor', (payload) => this.onDashboardUpdate(payload));
+    }
+
+    /**
+     * Apply an update pushed on the doctor dashboard channel
+     */
+    onDashboardUpdate({ deltas, records }) {
+        applyDashboardDeltas(this.state.stats, deltas);
+        if (records.some(record => ['op', 'admit', 'dis'].includes(record.state))) {
+            this.loadRecentActivities();
+        }
     }
 
     /**
@@ -72,6 +89,32 @@ export class DoctorDashboard extends Component {
             // Get user name
             this.state.user_name = this.user.name || 'Doctor';
 
+            // Load every section in one round-trip
+            const bundle = await this.orm.call(
+                'hospital.outpatient',
+                'get_doctor_dashboard_bundle',
+                []
+            );
+            this.state.stats = {
+                ...this.state.stats,
+                ...bundle.stats
+            };
+            this.state.chart_data = {
+                ...this.state.chart_data,
+                ...bundle.charts
+            };
+            this.setRecentActivities(bundle.recent_activities);
+        } catch (error) {
+            console.error('Error loading dashboard bundle:', error);
+            await this.loadDashboardSections();
+        }
+    }
+
+    /**
+     * Fallback method to load the dashboard sections one by one
+     */
+    async loadDashboardSections() {
+        try {
             // Load statistics
             await this.loadStatistics();
             
@@ -248,74 +291,56 @@ export class DoctorDashboard extends Component {
      * Load recent activities
      */
     async loadRecentActivities() {
-        const activities = [];
-        
         try {
-            // Recent consultations
-            const recentOPs = await this.orm.call(
+            const recentActivities = await this.orm.call(
                 'hospital.outpatient',
-                'search_read',
-                [
-                    [['state', '=', 'op']],
-                    ['op_reference', 'patient_id', 'create_date'],
-                    0, 3, 'create_date desc'
-                ]
+                'get_recent_activities',
+                []
             );
-            
-            recentOPs.forEach(op => {
-                activities.push({
-                    id: `op_${op.id}`,
-                    type: 'consultation',
-                    title: `Consultation - ${op.patient_id[1]} (${op.op_reference})`,
-                    time: this.formatRelativeTime(op.create_date)
-                });
+            this.setRecentActivities(recentActivities);
+        } catch (error) {
+            console.error('Error loading recent activities:', error);
+        }
+    }
+
+    /**
+     * Build the recent activities list from the latest records
+     */
+    setRecentActivities({ consultations = [], admissions = [], discharges = [] } = {}) {
+        const activities = [];
+
+        // Recent consultations
+        consultations.forEach(op => {
+            activities.push({
+                id: `op_${op.id}`,
+                type: 'consultation',
+                title: `Consultation - ${op.patient_id[1]} (${op.op_reference})`,
+                time: this.formatRelativeTime(op.create_date)
             });
+        });
 
-            // Recent admissions
-            const recentAdmissions = await this.orm.call(
-                'hospital.inpatient',
-                'search_read',
-                [
-                    [['state', '=', 'admit']],
-                    ['name', 'patient_id', 'hosp_date'],
-                    0, 3, 'hosp_date desc'
-                ]
-            );
-            
-            recentAdmissions.forEach(ip => {
-                activities.push({
-                    id: `ip_${ip.id}`,
-                    type: 'admission',
-                    title: `Admission - ${ip.patient_id[1]} (${ip.name})`,
-                    time: this.formatRelativeTime(ip.hosp_date)
-                });
+        // Recent admissions
+        admissions.forEach(ip => {
+            activities.push({
+                id: `ip_${ip.id}`,
+                type: 'admission',
+                title: `Admission - ${ip.patient_id[1]} (${ip.name})`,
+                time: this.formatRelativeTime(ip.hosp_date)
             });
+        });
 
-            // Recent discharges
-            const recentDischarges = await this.orm.call(
-                'hospital.inpatient',
-                'search_read',
-                [
-                    [['state', '=', 'dis']],
-                    ['name', 'patient_id', 'discharge_date'],
-                    0, 2, 'discharge_date desc'
-                ]
-            );
-            
-            recentDischarges.forEach(ip => {
-                activities.push({
-                    id: `dis_${ip.id}`,
-                    type: 'discharge',
-                    title: `Sortie - ${ip.patient_id[1]} (${ip.name})`,
-                    time: this.formatRelativeTime(ip.discharge_date)
-                });
+        // Recent discharges
+        discharges.forEach(ip => {
+            activities.push({
+                id: `dis_${ip.id}`,
+                type: 'discharge',
+                title: `Sortie - ${ip.patient_id[1]} (${ip.name})`,
+                time: this.formatRelativeTime(ip.discharge_date)
             });
+        });
 
-            // Sort by most recent
-            this.state.recent_activities = activities.slice(0, 5);
-        } catch (error) {
-            console.error('Error loading recent activities:', error);
-        }
+        // Sort by most recent
+        this.state.recent_activities = activities.slice(0, 5);
     }
 
     /**
@@ -639,7 +664,13 @@ export class DoctorDashboard extends Component {
         });
         this.state.activeSection = 'shift';
     }
+
+    // Show the history of the patient chosen in the picker
+    onTimelinePatient(patient) {
+        this.state.timeline_patient_id = patient.id;
+    }
 }
 
 DoctorDashboard.template = "DoctorDashboard";
+DoctorDashboard.components = { PatientPicker, PatientTimeline };
 registry.category("actions").add('doctor_dashboard_tags', DoctorDashboard);
\ No newline at end of file
@@ -5,6 +5,7 @@ import { useRef, onMounted, onWillUnmount } from "@odoo/owl";
 import { Component, useState } from "@odoo/owl";
 import { _t } from "@web/core/l10n/translation";
 import { user } from "@web/core/user";
+import { useDashboardBus, applyDashboardDeltas } from "./dashboard_bus";
 
 export class LabDashBoard extends Component {
     setup() {
@@ -71,6 +72,11 @@ export class LabDashBoard extends Component {
         onWillUnmount(() => {
             this.destroyCharts();
         });
+
+        // Patch the statistics from the pushed updates
+        useDashboardBus('lab', ({ deltas }) => {
+            applyDashboardDeltas(this.state.stats, deltas);
+        });
     }
 
     /**
@@ -188,26 +194,13 @@ export class LabDashBoard extends Component {
      * Fallback method to load chart data
      */
     async loadChartDataFallback() {
-        // Tests by type
-        const labTests = await this.orm.call(
-            'lab.test',
-            'search_read',
-            [[], ['name']]
+        // Tests by type, counted in one grouped query
+        this.state.chart_data.tests_by_type = await this.orm.call(
+            'patient.lab.test',
+            'get_tests_by_type',
+            []
         );
         
-        const testsByType = {};
-        for (const test of labTests) {
-            const count = await this.orm.call(
-                'patient.lab.test',
-                'search_count',
-                [[['test_ids', 'in', test.id]]]
-            );
-            if (count > 0) {
-                testsByType[test.name] = count;
-            }
-        }
-        this.state.chart_data.tests_by_type = testsByType;
-        
         // Results status
         const processing = await this.orm.call(
             'lab.test.result',
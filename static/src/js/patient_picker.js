@@ -0,0 +1,104 @@
+/** @odoo-module */
+import { Component, onWillStart, useRef, useState } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+import { useDebounced } from "@web/core/utils/timing";
+
+const ROW_HEIGHT = 32;
+const VISIBLE_ROWS = 8;
+// Rows rendered above and below the visible ones
+const OVERSCAN_ROWS = 4;
+const PAGE_SIZE = 50;
+
+/**
+ * Searchable patient list loading the pages of res.partner.search_patients
+ * while scrolling and only rendering the visible rows. The id of the chosen
+ * patient is kept in a hidden input of id props.inputId.
+ */
+export class PatientPicker extends Component {
+    static template = "PatientPicker";
+    static props = {
+        inputId: String,
+        placeholder: { type: String, optional: true },
+        onSelect: { type: Function, optional: true },
+    };
+
+    setup() {
+        this.orm = useService("orm");
+        this.valueRef = useRef("value");
+        this.listRef = useRef("list");
+        this.rowHeight = ROW_HEIGHT;
+        this.listHeight = ROW_HEIGHT * VISIBLE_ROWS;
+        this.requestId = 0;
+        this.state = useState({
+            search: "",
+            records: [],
+            nextCursor: false,
+            loading: false,
+            scrollTop: 0,
+            open: false,
+        });
+        this.onSearch = useDebounced(() => this.load(true), 300);
+        onWillStart(() => this.load(true));
+    }
+
+    /**
+     * Rows to render, with their offset in the scrolled list
+     */
+    get visibleRows() {
+        const first = Math.max(
+            0, Math.floor(this.state.scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+        const last = Math.min(
+            this.state.records.length, first + VISIBLE_ROWS + 2 * OVERSCAN_ROWS);
+        return this.state.records.slice(first, last).map((patient, index) => ({
+            patient,
+            top: (first + index) * ROW_HEIGHT,
+        }));
+    }
+
+    /**
+     * Load the first page of the search, or the next page of the list
+     * @param {boolean} reset - restart from the first page
+     */
+    async load(reset = false) {
+        if (!reset && (this.state.loading || !this.state.nextCursor)) {
+            return;
+        }
+        const requestId = ++this.requestId;
+        this.state.loading = true;
+        const result = await this.orm.call("res.partner", "search_patients", [], {
+            field_names: ["patient_seq", "name"],
+            search: this.state.search,
+            limit: PAGE_SIZE,
+            cursor: reset ? null : this.state.nextCursor,
+        });
+        // Drop the pages of a previous search
+        if (requestId !== this.requestId) {
+            return;
+        }
+        this.state.records = reset ? result.records : [...this.state.records, ...result.records];
+        this.state.nextCursor = result.next_cursor;
+        this.state.loading = false;
+        if (reset) {
+            this.state.scrollTop = 0;
+            if (this.listRef.el) this.listRef.el.scrollTop = 0;
+        }
+    }
+
+    onScroll(ev) {
+        this.state.scrollTop = ev.target.scrollTop;
+        // Fetch the next page before reaching the end of the list
+        const remaining = ev.target.scrollHeight - ev.target.scrollTop - this.listHeight;
+        if (remaining < OVERSCAN_ROWS * ROW_HEIGHT) {
+            this.load();
+        }
+    }
+
+    select(patient) {
+        this.valueRef.el.value = patient.id;
+        this.state.search = `${patient.patient_seq} - ${patient.name}`;
+        this.state.open = false;
+        if (this.props.onSelect) {
+            this.props.onSelect(patient);
+        }
+    }
+}
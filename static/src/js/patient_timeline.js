@@ -0,0 +1,84 @@
+/** @odoo-module */
+import { Component, onWillStart, onWillUpdateProps, useState } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+
+const PAGE_SIZE = 30;
+// Distance to the bottom of the list, in pixels, loading the older events
+const LOAD_THRESHOLD = 150;
+
+export const TIMELINE_KINDS = {
+    outpatient: { label: "Consultation", icon: "💉" },
+    inpatient: { label: "Hospitalisation", icon: "🏥" },
+    lab_test: { label: "Analyse", icon: "🧪" },
+    vaccination: { label: "Vaccination", icon: "💊" },
+    prescription: { label: "Prescription", icon: "📋" },
+};
+
+/**
+ * Medical history of a patient, most recent first. The first page is shown
+ * as soon as it is loaded and the older pages are fetched while scrolling.
+ */
+export class PatientTimeline extends Component {
+    static template = "PatientTimeline";
+    static props = {
+        patientId: Number,
+    };
+
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        this.kinds = TIMELINE_KINDS;
+        this.requestId = 0;
+        this.state = useState({
+            events: [],
+            nextCursor: false,
+            loading: false,
+        });
+        onWillStart(() => this.load(this.props.patientId, true));
+        onWillUpdateProps((nextProps) => {
+            if (nextProps.patientId !== this.props.patientId) {
+                return this.load(nextProps.patientId, true);
+            }
+        });
+    }
+
+    /**
+     * Load the first page of a patient, or the next page of the timeline
+     * @param {number} patientId - id of the patient
+     * @param {boolean} reset - restart from the most recent events
+     */
+    async load(patientId, reset = false) {
+        if (!reset && (this.state.loading || !this.state.nextCursor)) {
+            return;
+        }
+        const requestId = ++this.requestId;
+        this.state.loading = true;
+        const result = await this.orm.call("res.partner", "get_patient_timeline", [patientId], {
+            limit: PAGE_SIZE,
+            cursor: reset ? null : this.state.nextCursor,
+        });
+        // Drop the pages of a previous patient
+        if (requestId !== this.requestId) {
+            return;
+        }
+        this.state.events = reset ? result.events : [...this.state.events, ...result.events];
+        this.state.nextCursor = result.next_cursor;
+        this.state.loading = false;
+    }
+
+    onScroll(ev) {
+        const { scrollHeight, scrollTop, clientHeight } = ev.target;
+        if (scrollHeight - scrollTop - clientHeight < LOAD_THRESHOLD) {
+            this.load(this.props.patientId);
+        }
+    }
+
+    openEvent(event) {
+        this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: event.res_model,
+            res_id: event.res_id,
+            views: [[false, "form"]],
+        });
+    }
+}
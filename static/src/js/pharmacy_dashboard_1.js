@@ -6,6 +6,7 @@ import { useService } from "@web/core/utils/hooks";
 import { user } from "@web/core/user";
 import { PharmacyOrderLines } from "./pharmacy_orderlines";
 import { reactive } from "@odoo/owl";
+import { useDashboardBus, applyDashboardDeltas } from "./dashboard_bus";
 
 export class PharmacyDashboard extends Component {
 
@@ -77,6 +78,15 @@ export class PharmacyDashboard extends Component {
         onMounted(async () => {
             await this.loadInitialData();
         });
+
+        // Patch the statistics from the pushed updates
+        useDashboardBus('pharmacy', ({ deltas }) => {
+            const { revenue_today = 0, ...counters } = deltas;
+            this.state.stats.revenue_today = (
+                parseFloat(this.state.stats.revenue_today || 0) + revenue_today
+            ).toFixed(2);
+            applyDashboardDeltas(this.state.stats, counters);
+        });
     }
 
     async loadInitialData() {
@@ -1,5 +1,10 @@
 /** @odoo-module **/
 import publicWidget from "@web/legacy/js/public/public_widget";
+import { rpc } from "@web/core/network/rpc";
+
+// The file is rendered in the background, its state is polled until ready
+const POLL_DELAY = 1500;
+const POLL_MAX_TRIES = 40;
 
 publicWidget.registry.prescriptionWidget = publicWidget.Widget.extend({
     //Extends the publicWidget.Widget class to create prescriptionWidget
@@ -7,15 +12,27 @@ publicWidget.registry.prescriptionWidget = publicWidget.Widget.extend({
     events: {
         'click .pr_download': 'onDownloadClick',
     },
-    onDownloadClick: function (ev) {
-        var rec_id = $(ev.currentTarget).data('id');
-        rpc.query({
-            model: 'hospital.outpatient',
-            method: 'create_file',
-            args: [rec_id],
-        }).then(function (result) {
-            window.open(result['url']);
-        });
+    async onDownloadClick (ev) {
+        var button = ev.currentTarget;
+        var rec_id = $(button).data('id');
+        if (button.classList.contains('disabled')) {
+            return;
+        }
+        button.classList.add('disabled');
+        try {
+            var result = await rpc(`/my/op/${rec_id}/prescription`, {});
+            for (var tries = 0; result.state === 'queued' && tries < POLL_MAX_TRIES; tries++) {
+                await new Promise((resolve) => setTimeout(resolve, POLL_DELAY));
+                result = await rpc(`/my/op/${rec_id}/prescription`, { queue: false });
+            }
+            if (result.state === 'done') {
+                window.location = result.url;
+            } else {
+                alert("La prescription n'a pas pu être générée, veuillez réessayer.");
+            }
+        } finally {
+            button.classList.remove('disabled');
+        }
     },
 });
 export default publicWidget.registry.prescriptionWidget;
@@ -3,6 +3,9 @@ import { registry} from '@web/core/registry';
 import { useService } from "@web/core/utils/hooks";
 import { Component, onMounted, useState, useRef } from "@odoo/owl";
 import { _t } from "@web/core/l10n/translation";
+import { useDashboardBus } from "./dashboard_bus";
+import { PatientPicker } from "./patient_picker";
+import { PatientTimeline } from "./patient_timeline";
 
 class ReceptionDashBoard extends Component{
     setup() {
@@ -13,10 +16,10 @@ class ReceptionDashBoard extends Component{
         this.action = useService('action');
         this.orm = useService("orm");
         this.state = useState({
-            patient_lst : [],
             ward_data : [],
             room_data : [],
             dr_lst: [],
+            timeline_patient_id: false,
             currentDate: new Date().toISOString().split('T')[0],
             current_appointment_type: 'outpatient', // 'outpatient' or 'inpatient'
             current_room_ward_type: 'ward', // 'ward' or 'room'
@@ -24,6 +27,14 @@ class ReceptionDashBoard extends Component{
         onMounted(async () => {
             await this.createPatient();
         });
+        // Patch the displayed rooms from the pushed updates
+        useDashboardBus('reception', ({ model, records }) => {
+            if (model !== 'patient.room') return;
+            for (const { id, state } of records) {
+                const room = this.state.room_data.find(room => room.id === id);
+                if (room) room.state = state;
+            }
+        });
     }
 
     // Method for creating patient
@@ -52,8 +63,8 @@ class ReceptionDashBoard extends Component{
             alert("Veuillez remplir le nom et le téléphone")
             return;
         }
-        await this.orm.call('res.partner','create',[[data]]).then(function (){
-           alert("Le dossier patient a été créé avec succès")
+        await this.orm.call('res.partner','register_patient',[data]).then(function (result){
+           alert(result.existing ? "Ce patient est déjà enregistré" : "Le dossier patient a été créé avec succès")
            window.location.reload()
         })
     }
@@ -133,9 +144,6 @@ class ReceptionDashBoard extends Component{
             }
         });
         
-        const result = await this.orm.call('res.partner','fetch_patient_data',[]);
-        this.state.patient_lst = result;
-
         const doctorResult = await this.orm.call('doctor.allocation', 'search_read', []);
         this.state.dr_lst = doctorResult;
         
@@ -180,18 +188,6 @@ class ReceptionDashBoard extends Component{
 
         var domain = [['job_id.name', '=', 'Doctor']];
         
-        const patientResult = await this.orm.call('res.partner','fetch_patient_data',[]);
-        const patientSelect = this.ref.el.querySelector('.select_patient_id');
-        if (patientSelect) {
-            patientSelect.innerHTML = '';
-            patientResult.forEach(element => {
-                const option = document.createElement('option');
-                option.value = element.id;
-                option.textContent = `${element.patient_seq}-${element.name}`;
-                patientSelect.appendChild(option);
-            });
-        }
-
         const doctorResult = await this.orm.call('hr.employee','search_read',[domain]);
         const doctorSelect = this.ref.el.querySelector('.attending_doctor_id');
         if (doctorSelect) {
@@ -221,6 +217,7 @@ class ReceptionDashBoard extends Component{
             
             clearField('o_patient-name');
             clearField('sl_patient');
+            clearField('sl_patient_search');
             clearField('o_patient-phone');
             clearField('o_patient-dob');
         }
@@ -231,7 +228,7 @@ class ReceptionDashBoard extends Component{
         if (!this.ref.el) return;
         
         const selectType = this.ref.el.querySelector('#select_type');
-        const slPatient = this.ref.el.querySelector('#sl_patient');
+        const slPatient = this.ref.el.querySelector('#sl_patient_picker');
         const patientLabel = this.ref.el.querySelector('#patient_label');
         
         if (!selectType) return;
@@ -253,7 +250,7 @@ class ReceptionDashBoard extends Component{
         const phone = this.ref.el.querySelector('#o_patient-phone')?.value || '';
         
         return {
-            'patient_data': patientId,
+            'patient_id': Number(patientId) || false,
             'patient-phone': phone
         };
     }
@@ -263,6 +260,8 @@ class ReceptionDashBoard extends Component{
         if (!this.ref.el) return;
         
         var data = await this.fetch_op_details();
+        // Show the history of the selected patient
+        this.state.timeline_patient_id = data.patient_id;
         await this.orm.call('res.partner', 'reception_op_barcode',[data]).then((result) => {
             if (!this.ref.el) return;
             
@@ -375,6 +374,7 @@ class ReceptionDashBoard extends Component{
                 };
                 
                 clearField('sl_patient_id');
+                clearField('sl_patient_id_search');
                 clearField('reason_of_admission');
                 clearField('admission_type');
                 clearField('attending_doctor_id');
@@ -447,4 +447,5 @@ class ReceptionDashBoard extends Component{
 }
 
 ReceptionDashBoard.template = "ReceptionDashboard"
+ReceptionDashBoard.components = { PatientPicker, PatientTimeline };
 registry.category('actions').add('reception_dashboard_tags', ReceptionDashBoard);
\ No newline at end of file
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2025-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#
+#    Dashboard Query Budgets
+#    Fails when a dashboard RPC exceeds its SQL query budget
+#
+################################################################################
+
+from odoo.tests import TransactionCase, tagged
+
+from ..models.hospital_benchmark import BENCHMARKS
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardBudgets(TransactionCase):
+    """Runs every benchmarked dashboard method on data seeded inside the
+    test transaction and checks it stays within its query budget. The
+    budgets do not depend on the volume, so the seeded data only has to be
+    large enough to reveal the N+1 loops."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.counts = cls.env['hospital.data.generator'].generate(
+            seed=42, patients=40, doctors=4, days=7, outpatients=200,
+            inpatients=20, rooms=10, beds=20, lab_tests=40, vaccinations=20,
+            medicines=20, sale_orders=40, batch_size=100, prefix='TEST')
+
+    def test_seeded_data(self):
+        """Every benchmarked model has records to work on"""
+        for model in ('res.partner', 'hospital.outpatient',
+                      'hospital.inpatient', 'lab.test.result',
+                      'pharmacy.medicine', 'sale.order'):
+            self.assertTrue(self.counts.get(model), model)
+        self.assertTrue(self.env['lab.test.result'].search_count(
+            [('attachment', '!=', False)]))
+
+    def test_query_budgets(self):
+        """Cold calls of the dashboard methods stay within their budget"""
+        for name, model, method, args, budget in BENCHMARKS:
+            with self.subTest(benchmark=name):
+                records = self.env[model].with_context(
+                    hospital_dashboard_cache=False)
+                self.env.flush_all()
+                self.env.invalidate_all()
+                with self.assertQueryCount(budget):
+                    result = getattr(records, method)(*args)
+                self.assertTrue(result, name)